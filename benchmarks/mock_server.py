@@ -0,0 +1,263 @@
+"""A local stand-in for the Accela v4 API, for benchmarks.
+
+Serves ``/records``, ``/search/records``, the record sub-resources and
+``/documents/{id}/download`` from deterministic generated data, with configurable
+latency and Accela's rate-limit headers. By default it runs in a separate process so
+that serving requests does not compete with the SDK for the GIL.
+"""
+import json
+import multiprocessing
+import random
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from accela import AccelaClient
+
+from . import payloads
+
+SUB_RESOURCES = ("addresses", "parcels", "workflowTasks", "workflowTasks/histories", "documents")
+
+
+@dataclass
+class ServerConfig:
+    """Data set and behaviour of the mock server.
+
+    Attributes:
+        records: Number of records served by /records and /search/records
+        custom_form_fields: Fields per custom form of each record
+        custom_table_rows: Rows per custom table of each record
+        sub_resources: Number of items per record for each sub-resource
+        document_size: Size in bytes of every document download
+        latency: Seconds added to every response
+        latency_jitter: Up to this many extra seconds, uniformly distributed
+        rate_limit: Value of x-ratelimit-limit per rate_limit_window
+        rate_limit_window: Length of a rate-limit window in seconds
+        enforce_rate_limit: Answer 429 once a window's limit is used up
+    """
+
+    records: int = 5000
+    custom_form_fields: int = 40
+    custom_table_rows: int = 10
+    sub_resources: Dict[str, int] = field(default_factory=lambda: {
+        "addresses": 2,
+        "parcels": 1,
+        "workflowTasks": 8,
+        "workflowTasks/histories": 20,
+        "documents": 3,
+    })
+    document_size: int = 256 * 1024
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    rate_limit: int = 1_000_000
+    rate_limit_window: float = 3600.0
+    enforce_rate_limit: bool = False
+
+
+class _RateWindow:
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._start = time.time()
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def take(self) -> Tuple[int, int]:
+        """Count a request; return (remaining, reset epoch seconds)."""
+        with self._lock:
+            now = time.time()
+            if now - self._start >= self.window:
+                self._start, self._used = now, 0
+            self._used += 1
+            return max(self.limit - self._used, 0), int(self._start + self.window)
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, config: ServerConfig):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.config = config
+        self.rate_window = _RateWindow(config.rate_limit, config.rate_limit_window)
+        # Records are encoded once up front so serving a page is a cheap join
+        self.encoded_records: List[bytes] = [
+            json.dumps(payloads.record_json(i, config.custom_form_fields, config.custom_table_rows)).encode()
+            for i in range(config.records)
+        ]
+
+    @lru_cache(maxsize=4096)
+    def sub_resource_page(self, kind: str, index: int, offset: int, limit: int) -> bytes:
+        items = payloads.sub_resource_list(kind, index, self.config.sub_resources.get(kind, 0),
+                                           self.config.document_size)
+        return _page_body([json.dumps(item).encode() for item in items[offset:offset + limit]],
+                          offset, limit, len(items))
+
+    @lru_cache(maxsize=256)
+    def document_body(self, document_id: int) -> bytes:
+        return payloads.document_body(document_id, self.config.document_size)
+
+
+def _page_body(encoded_items: List[bytes], offset: int, limit: int, total: int) -> bytes:
+    page = json.dumps({"offset": offset, "limit": limit, "total": total, "hasmore": offset + limit < total})
+    return b'{"status": 200, "result": [' + b",".join(encoded_items) + b'], "page": ' + page.encode() + b"}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _MockHTTPServer
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        config = self.server.config
+        if config.latency or config.latency_jitter:
+            time.sleep(config.latency + random.uniform(0, config.latency_jitter))
+
+        remaining, reset = self.server.rate_window.take()
+        headers = {
+            "x-accela-traceId": uuid.uuid4().hex,
+            "x-ratelimit-limit": str(config.rate_limit),
+            "x-ratelimit-remaining": str(remaining),
+            "x-ratelimit-reset": str(reset),
+        }
+        if config.enforce_rate_limit and remaining == 0:
+            return self._error(429, "Rate limit exceeded", headers)
+
+        parts = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        segments = [segment for segment in parts.path.split("/") if segment]
+        if segments[:1] == ["v4"]:
+            segments = segments[1:]
+        offset = int(query.get("offset", 0))
+        limit = int(query.get("limit", 100))
+
+        try:
+            if method == "GET" and segments == ["records"]:
+                if "customId" in query:
+                    index = payloads.record_index(query["customId"])
+                    return self._json(_page_body([self.server.encoded_records[index]], 0, 1, 1), headers)
+                return self._json(self._records_page(offset, limit), headers)
+            if method == "POST" and segments == ["search", "records"]:
+                return self._json(self._records_page(offset, limit), headers)
+            if method == "GET" and len(segments) >= 3 and segments[0] == "records":
+                kind = "/".join(segments[2:])
+                if kind in SUB_RESOURCES:
+                    index = payloads.record_index(segments[1])
+                    return self._json(self.server.sub_resource_page(kind, index, offset, limit), headers)
+            if method == "GET" and len(segments) == 3 and segments[0] == "documents" and segments[2] == "download":
+                return self._send(200, self.server.document_body(int(segments[1])), "application/octet-stream",
+                                  headers)
+        except (ValueError, IndexError):
+            return self._error(404, f"No such resource: {parts.path}", headers)
+        return self._error(404, f"No such endpoint: {method} {parts.path}", headers)
+
+    def _records_page(self, offset: int, limit: int) -> bytes:
+        records = self.server.encoded_records
+        return _page_body(records[offset:offset + limit], offset, limit, len(records))
+
+    def _json(self, body: bytes, headers: Dict[str, str]) -> None:
+        self._send(200, body, "application/json", headers)
+
+    def _error(self, status: int, message: str, headers: Dict[str, str]) -> None:
+        body = json.dumps({"status": status, "code": "mock_error", "message": message}).encode()
+        self._send(status, body, "application/json", {**headers, "x-accela-resp-message": message})
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Dict[str, str]) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _serve(config: ServerConfig, ready) -> None:
+    server = _MockHTTPServer(config)
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+class MockAccelaServer:
+    """Runs the mock Accela API on a free local port.
+
+    Example:
+        with MockAccelaServer(ServerConfig(records=2000, latency=0.02)) as server:
+            client = server.client()
+            for record in client.records.list().auto_paging_iter():
+                ...
+    """
+
+    def __init__(self, config: Optional[ServerConfig] = None, in_process: bool = False):
+        """
+        Initialize the server; call start() or use it as a context manager.
+
+        Args:
+            config: Data set and behaviour, defaults to ServerConfig()
+            in_process: Serve from a thread of this process instead of a child process
+        """
+        self.config = config or ServerConfig()
+        self.in_process = in_process
+        self.port: Optional[int] = None
+        self._process = None
+        self._server: Optional[_MockHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use in place of AccelaClient.BASE_URL."""
+        return f"http://127.0.0.1:{self.port}/v4"
+
+    def start(self) -> "MockAccelaServer":
+        if self.in_process:
+            self._server = _MockHTTPServer(self.config)
+            self.port = self._server.server_address[1]
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+            return self
+
+        context = multiprocessing.get_context("spawn")
+        ready = context.Queue()
+        self._process = context.Process(target=_serve, args=(self.config, ready), daemon=True)
+        self._process.start()
+        self.port = ready.get(timeout=120)
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def client(self, **kwargs) -> AccelaClient:
+        """An AccelaClient that talks to this server."""
+        client = AccelaClient(access_token="benchmark", agency="BENCH", environment="TEST", **kwargs)
+        client.BASE_URL = self.url
+        return client
+
+    def to_dict(self) -> dict:
+        return asdict(self.config)
+
+    def __enter__(self) -> "MockAccelaServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
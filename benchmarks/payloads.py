@@ -0,0 +1,222 @@
+"""Deterministic generators for realistic Accela API payloads.
+
+Every generator takes an index and returns the same JSON for the same index, so
+benchmark runs are comparable without storing fixtures.
+"""
+import hashlib
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+EPOCH = datetime(2020, 1, 1)
+MODULES = ("Building", "Planning", "Enforcement", "Licenses", "PublicWorks")
+STATUSES = ("Submitted", "In Review", "Issued", "Finaled", "Closed", "Expired")
+STREETS = ("Main St", "Oak Ave", "Tryon St", "Elm Dr", "Park Rd", "College St")
+TASKS = ("Application Intake", "Plan Review", "Permit Issuance", "Inspections", "Certificate of Occupancy")
+
+
+def record_id(index: int) -> str:
+    return f"BENCH-{index:08d}"
+
+
+def record_index(record_id_: str) -> int:
+    return int(record_id_.rsplit("-", 1)[1])
+
+
+def _date(rng: random.Random, days: int = 2000) -> str:
+    moment = EPOCH + timedelta(days=rng.randrange(days), seconds=rng.randrange(86400))
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _value(text: str) -> Dict[str, str]:
+    return {"value": text, "text": text}
+
+
+def record_json(index: int, custom_form_fields: int = 40, custom_table_rows: int = 10) -> Dict[str, Any]:
+    """A record with the shape of ``GET /records?expand=customForms,customTables``.
+
+    Args:
+        index: Record number; determines the ID and all field values
+        custom_form_fields: Number of fields in each of the three custom forms
+        custom_table_rows: Number of rows in each of the two custom tables
+    """
+    rng = random.Random(index)
+    module = MODULES[index % len(MODULES)]
+    opened = _date(rng)
+    return {
+        "id": record_id(index),
+        "customId": f"{module[:3].upper()}{2020 + index % 6}-{index:06d}",
+        "trackingId": 100000000 + index,
+        "serviceProviderCode": "BENCH",
+        "module": module,
+        "name": f"{rng.choice(('New', 'Alteration', 'Repair', 'Demolition'))} - {rng.choice(STREETS)}",
+        "description": " ".join(rng.choice(("scope", "of", "work", "includes", "new", "roof", "hvac", "panel"))
+                                for _ in range(30)),
+        "type": {
+            "module": module,
+            "group": module,
+            "type": "Residential",
+            "subType": "New",
+            "category": "NA",
+            "value": f"{module}/Residential/New/NA",
+            "text": f"{module} Residential New",
+            "id": f"{module}-Residential-New-NA",
+        },
+        "status": _value(STATUSES[index % len(STATUSES)]),
+        "statusDate": _date(rng),
+        "openedDate": opened,
+        "updateDate": _date(rng),
+        "reportedDate": opened,
+        "estimatedDueDate": _date(rng),
+        "recordClass": "COMPLETE",
+        "jobValue": round(rng.uniform(1000, 900000), 2),
+        "totalFee": round(rng.uniform(50, 20000), 2),
+        "totalPay": round(rng.uniform(0, 20000), 2),
+        "balance": round(rng.uniform(0, 500), 2),
+        "housingUnits": rng.randrange(0, 12),
+        "numberOfBuildings": rng.randrange(1, 4),
+        "publicOwned": rng.choice(("Y", "N")),
+        "priority": _value(rng.choice(("Low", "Medium", "High"))),
+        "assignedUser": f"USER{rng.randrange(50)}",
+        "assignedToDepartment": "BENCH/BLD/NA/NA/NA/NA/NA",
+        "addresses": [address_json(index, 0)],
+        "parcel": [parcel_json(index, 0)],
+        "customForms": [
+            {
+                "id": f"{module.upper()}_FORM_{form}",
+                **{f"Field {field} of form {form}": rng.choice(("Yes", "No", "N/A", str(rng.randrange(10000))))
+                   for field in range(custom_form_fields)},
+            }
+            for form in range(3)
+        ],
+        "customTables": [
+            {
+                "id": f"{module.upper()}_TABLE_{table}",
+                "rows": [
+                    {
+                        "id": str(row),
+                        "fields": {
+                            "Contractor": f"Contractor {rng.randrange(500)}",
+                            "License Number": f"L{rng.randrange(10 ** 7):07d}",
+                            "Start Date": _date(rng),
+                            "Amount": str(round(rng.uniform(10, 10000), 2)),
+                        },
+                    }
+                    for row in range(custom_table_rows)
+                ],
+            }
+            for table in range(2)
+        ],
+    }
+
+
+def address_json(index: int, position: int) -> Dict[str, Any]:
+    rng = random.Random(index * 1000 + position)
+    number = rng.randrange(1, 9999)
+    street = rng.choice(STREETS)
+    return {
+        "id": index * 100 + position,
+        "recordId": {"id": record_id(index), "serviceProviderCode": "BENCH", "trackingId": 100000000 + index},
+        "isPrimary": "Y" if position == 0 else "N",
+        "streetStart": number,
+        "streetName": street.split()[0],
+        "streetSuffix": _value(street.split()[1]),
+        "streetAddress": f"{number} {street}",
+        "addressLine1": f"{number} {street}",
+        "city": "Charlotte",
+        "state": _value("NC"),
+        "postalCode": f"282{rng.randrange(100):02d}",
+        "county": "Mecklenburg",
+        "country": _value("US"),
+        "status": _value("A"),
+        "serviceProviderCode": "BENCH",
+    }
+
+
+def parcel_json(index: int, position: int) -> Dict[str, Any]:
+    rng = random.Random(index * 2000 + position)
+    return {
+        "id": f"{index:08d}{position:02d}",
+        "parcelNumber": f"{rng.randrange(10 ** 8):08d}",
+        "recordId": {"id": record_id(index), "serviceProviderCode": "BENCH"},
+        "isPrimary": "Y" if position == 0 else "N",
+        "landValue": round(rng.uniform(10000, 500000), 2),
+        "improvedValue": round(rng.uniform(0, 900000), 2),
+        "parcelArea": round(rng.uniform(0.1, 5), 3),
+        "legalDescription": f"LOT {rng.randrange(200)} BLOCK {rng.randrange(40)} SUBDIVISION {rng.randrange(900)}",
+        "status": _value("A"),
+        "owners": [{"fullName": f"Owner {rng.randrange(10000)}", "isPrimary": "Y"}],
+    }
+
+
+def workflow_task_json(index: int, position: int) -> Dict[str, Any]:
+    rng = random.Random(index * 3000 + position)
+    return {
+        "id": f"{index}-{position}",
+        "processCode": "BLD_GENERAL",
+        "description": TASKS[position % len(TASKS)],
+        "status": _value(rng.choice(("Approved", "Pending", "In Review", "Note"))),
+        "statusDate": _date(rng),
+        "assignedDate": _date(rng),
+        "dueDate": _date(rng),
+        "assignedUser": _value(f"USER{rng.randrange(50)}"),
+        "assignedToDepartment": _value("BENCH/BLD/NA/NA/NA/NA/NA"),
+        "isActive": "Y" if position == 0 else "N",
+        "isCompleted": "N" if position == 0 else "Y",
+        "billable": "N",
+        "hoursSpent": rng.randrange(0, 8),
+        "comment": "Reviewed and approved per code section " + str(rng.randrange(100, 999)),
+        "recordId": {"id": record_id(index), "serviceProviderCode": "BENCH"},
+        "serviceProviderCode": "BENCH",
+    }
+
+
+def workflow_history_json(index: int, position: int) -> Dict[str, Any]:
+    history = workflow_task_json(index, position)
+    history["id"] = f"{index}-{position}-h"
+    history["action"] = "Status Updated"
+    return history
+
+
+def document_json(index: int, position: int, size: int) -> Dict[str, Any]:
+    rng = random.Random(index * 4000 + position)
+    return {
+        "id": document_id(index, position),
+        "entityId": record_id(index),
+        "entityType": "CAP",
+        "fileName": f"plans-{position}.pdf",
+        "size": size,
+        "type": "application/pdf",
+        "category": _value("Plans"),
+        "description": "Site plan",
+        "serviceProviderCode": "BENCH",
+        "uploadedBy": f"USER{rng.randrange(50)}",
+        "uploadedDate": _date(rng),
+        "modifiedDate": _date(rng),
+    }
+
+
+def document_id(index: int, position: int) -> int:
+    return index * 100 + position
+
+
+def document_body(document_id_: int, size: int) -> bytes:
+    """Deterministic, incompressible document content of ``size`` bytes."""
+    seed = hashlib.sha256(str(document_id_).encode()).digest()
+    block = b"".join(hashlib.sha256(seed + bytes([i])).digest() for i in range(128))  # 4 KiB
+    return (block * (size // len(block) + 1))[:size]
+
+
+def sub_resource_list(kind: str, index: int, count: int, document_size: int = 0) -> List[Dict[str, Any]]:
+    """The ``result`` list of a record sub-resource endpoint."""
+    if kind == "addresses":
+        return [address_json(index, i) for i in range(count)]
+    if kind == "parcels":
+        return [parcel_json(index, i) for i in range(count)]
+    if kind == "workflowTasks":
+        return [workflow_task_json(index, i) for i in range(count)]
+    if kind == "workflowTasks/histories":
+        return [workflow_history_json(index, i) for i in range(count)]
+    if kind == "documents":
+        return [document_json(index, i, document_size) for i in range(count)]
+    raise KeyError(kind)
@@ -0,0 +1,240 @@
+"""Run the SDK benchmarks against the local mock Accela server.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --latency 0.02 --concurrency 16 --json results.json
+    python -m benchmarks.run --baseline results.json --max-regression 0.15
+
+Each case is run ``--repeat`` times and the fastest run is reported, which is the
+most stable figure on a busy machine. With ``--baseline`` the run exits with status 1
+if any case's throughput fell by more than ``--max-regression``.
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from accela import AccelaClient, BulkDownloader, Record
+
+from . import payloads
+from .mock_server import MockAccelaServer, ServerConfig
+
+ENRICHMENT_RESOURCES = ("record_addresses", "record_parcels", "record_workflow_tasks",
+                        "record_workflow_task_histories")
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    items: int
+    unit: str
+    seconds: float
+    median_seconds: float
+    requests: int
+    bytes: int = 0
+
+    @property
+    def throughput(self) -> float:
+        return self.items / self.seconds if self.seconds else 0.0
+
+
+class _RequestCounter:
+    """after_response hook counting requests."""
+
+    def __init__(self):
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, **_) -> None:
+        with self._lock:
+            self.requests += 1
+
+
+def bench_parse(make_client: Callable[[], AccelaClient], args: argparse.Namespace) -> Tuple[int, int]:
+    """JSON decoding and Record hydration of whole pages, without any HTTP."""
+    page = json.dumps({
+        "result": [payloads.record_json(i, args.custom_form_fields, args.custom_table_rows)
+                   for i in range(args.page_size)],
+    })
+    pages = max(args.records // args.page_size, 1)
+    for _ in range(pages):
+        Record.from_json_list(json.loads(page)["result"])
+    return pages * args.page_size, 0
+
+
+def bench_list_pagination(make_client: Callable[[], AccelaClient], args: argparse.Namespace) -> Tuple[int, int]:
+    """records.list(...).auto_paging_iter() over every record."""
+    client = make_client()
+    count = sum(1 for _ in client.records.list(limit=args.page_size).auto_paging_iter())
+    return count, 0
+
+
+def bench_search_pagination(make_client: Callable[[], AccelaClient], args: argparse.Namespace) -> Tuple[int, int]:
+    """records.search(...) page by page over every record."""
+    client = make_client()
+    count, offset = 0, 0
+    while True:
+        page = client.records.search({"module": "Building"}, limit=args.page_size, offset=offset)
+        count += len(page.data)
+        if not page.has_more:
+            return count, 0
+        offset += args.page_size
+
+
+def bench_enrichment(make_client: Callable[[], AccelaClient], args: argparse.Namespace) -> Tuple[int, int]:
+    """Addresses, parcels, workflow tasks and histories of many records, fetched concurrently."""
+    client = make_client()
+    record_ids = [payloads.record_id(i) for i in range(min(args.enrich_records, args.records))]
+    jobs = [(name, record_id) for record_id in record_ids for name in ENRICHMENT_RESOURCES]
+
+    def fetch(job: Tuple[str, str]) -> int:
+        name, record_id = job
+        return sum(1 for _ in getattr(client, name).list(record_id).auto_paging_iter())
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        sum(pool.map(fetch, jobs))
+    return len(record_ids), 0
+
+
+def bench_downloads(make_client: Callable[[], AccelaClient], args: argparse.Namespace) -> Tuple[int, int]:
+    """BulkDownloader over all documents of many records."""
+    client = make_client()
+    record_ids = [payloads.record_id(i) for i in range(min(args.download_records, args.records))]
+    with tempfile.TemporaryDirectory() as directory:
+        manifest = BulkDownloader(client, directory, max_workers=args.concurrency).download_records(record_ids)
+    if manifest.failed:
+        raise RuntimeError(f"{len(manifest.failed)} downloads failed, e.g. {manifest.failed[0].error}")
+    return len(manifest.succeeded), manifest.total_bytes
+
+
+Case = Callable[[Callable[[], AccelaClient], argparse.Namespace], Tuple[int, int]]
+
+# name -> (function returning (items, bytes), unit of items)
+CASES: Dict[str, Tuple[Case, str]] = {
+    "parse": (bench_parse, "records"),
+    "list_pagination": (bench_list_pagination, "records"),
+    "search_pagination": (bench_search_pagination, "records"),
+    "enrichment": (bench_enrichment, "records"),
+    "downloads": (bench_downloads, "documents"),
+}
+
+
+def run_case(name: str, server: MockAccelaServer, args: argparse.Namespace) -> BenchmarkResult:
+    fn, unit = CASES[name]
+    counter = _RequestCounter()
+
+    def make_client() -> AccelaClient:
+        client = server.client()
+        client.add_hook("after_response", counter)
+        return client
+
+    fn(make_client, args)  # warm-up: connection pool, server caches, imports
+    counter.requests = 0
+    timings: List[float] = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        items, size = fn(make_client, args)
+        timings.append(time.perf_counter() - start)
+
+    return BenchmarkResult(
+        name=name,
+        items=items,
+        unit=unit,
+        seconds=min(timings),
+        median_seconds=statistics.median(timings),
+        requests=counter.requests // args.repeat,
+        bytes=size,
+    )
+
+
+def compare(results: List[BenchmarkResult], baseline: Dict[str, dict], max_regression: float) -> List[str]:
+    """Return a message for every case that is slower than the baseline by more than max_regression."""
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if not previous or not previous["seconds"]:
+            continue
+        before = previous["items"] / previous["seconds"]
+        change = result.throughput / before - 1
+        if change < -max_regression:
+            regressions.append(f"{result.name}: {result.throughput:,.1f}/s vs {before:,.1f}/s ({change:+.1%})")
+    return regressions
+
+
+def format_table(results: List[BenchmarkResult]) -> str:
+    lines = [f"{'case':<20}{'items':>10}{'best s':>10}{'median s':>10}{'items/s':>12}{'requests':>10}{'MB/s':>9}"]
+    for result in results:
+        mb_per_second = result.bytes / result.seconds / 1e6 if result.bytes and result.seconds else 0.0
+        lines.append(
+            f"{result.name:<20}{result.items:>10,}{result.seconds:>10.3f}{result.median_seconds:>10.3f}"
+            f"{result.throughput:>12,.1f}{result.requests:>10,}{mb_per_second:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Offline accela SDK benchmarks.")
+    parser.add_argument("cases", nargs="*", metavar="case",
+                        help=f"Cases to run, default all: {', '.join(CASES)}")
+    parser.add_argument("--records", type=int, default=2000, help="Records served by the mock server")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--custom-form-fields", type=int, default=40)
+    parser.add_argument("--custom-table-rows", type=int, default=10)
+    parser.add_argument("--enrich-records", type=int, default=200)
+    parser.add_argument("--download-records", type=int, default=100)
+    parser.add_argument("--document-size", type=int, default=256 * 1024)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds per response")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--in-process", action="store_true", help="Serve from a thread instead of a child process")
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON, e.g. to use as a baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against results written with --json")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Allowed throughput drop against the baseline (default 0.2)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+    config = ServerConfig(
+        records=args.records,
+        custom_form_fields=args.custom_form_fields,
+        custom_table_rows=args.custom_table_rows,
+        document_size=args.document_size,
+        latency=args.latency,
+        latency_jitter=args.jitter,
+    )
+
+    results = []
+    with MockAccelaServer(config, in_process=args.in_process) as server:
+        for name in args.cases or list(CASES):
+            results.append(run_case(name, server, args))
+            # Print each row as soon as its case finishes
+            print("\n".join(format_table(results).splitlines()[0 if len(results) == 1 else -1:]), flush=True)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": asdict(config), "results": {r.name: asdict(r) for r in results}}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,93 @@
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
 from .client import AccelaClient
-from .resources.documents import Document
-from .resources.modules import Module
-from .resources.record_addresses import RecordAddress
-from .resources.record_types import RecordType
-from .resources.records import Record
-from .util.access_token import AccelaAccessToken, get_access_token
+
+if TYPE_CHECKING:
+    from .analytics import WorkflowTable
+    from .cassette import RecordingSession, ReplaySession
+    from .circuit_breaker import CircuitBreaker, CircuitOpenError
+    from .downloads import BulkDownloader, DownloadManifest
+    from .errors import (
+        AccelaAPIError,
+        AccelaError,
+        AuthenticationError,
+        BadRequestError,
+        NotFoundError,
+        PermissionDeniedError,
+        RateLimitError,
+        ServerError,
+    )
+    from .mirror import RecordMirror
+    from .pipeline import Pipeline
+    from .pool import ClientPool
+    from .resources.documents import Document
+    from .resources.modules import Module
+    from .resources.record_addresses import RecordAddress
+    from .resources.record_types import RecordType
+    from .resources.records import Record
+    from .sharding import ShardedScan
+    from .store import DocumentStore
+    from .sync import RecordSync
+    from .util.access_token import AccelaAccessToken, TokenProvider, get_access_token, refresh_access_token
+
+# Public name -> module it is imported from on first access, so that importing the
+# package does not load every feature module (and requests) up front
+_LAZY_IMPORTS: Dict[str, str] = {
+    "BulkDownloader": ".downloads",
+    "DownloadManifest": ".downloads",
+    "DocumentStore": ".store",
+    "RecordSync": ".sync",
+    "RecordMirror": ".mirror",
+    "ShardedScan": ".sharding",
+    "ClientPool": ".pool",
+    "Record": ".resources.records",
+    "RecordAddress": ".resources.record_addresses",
+    "Document": ".resources.documents",
+    "Module": ".resources.modules",
+    "RecordType": ".resources.record_types",
+    "AccelaAccessToken": ".util.access_token",
+    "get_access_token": ".util.access_token",
+    "refresh_access_token": ".util.access_token",
+    "TokenProvider": ".util.access_token",
+    "AccelaError": ".errors",
+    "AccelaAPIError": ".errors",
+    "BadRequestError": ".errors",
+    "AuthenticationError": ".errors",
+    "PermissionDeniedError": ".errors",
+    "NotFoundError": ".errors",
+    "RateLimitError": ".errors",
+    "ServerError": ".errors",
+    "RecordingSession": ".cassette",
+    "ReplaySession": ".cassette",
+    "CircuitBreaker": ".circuit_breaker",
+    "CircuitOpenError": ".circuit_breaker",
+    "Pipeline": ".pipeline",
+    "WorkflowTable": ".analytics",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(__all__)
+
 
 __all__ = [
     "AccelaClient",
+    "BulkDownloader",
+    "DownloadManifest",
+    "DocumentStore",
+    "RecordSync",
+    "RecordMirror",
+    "ShardedScan",
+    "ClientPool",
     "Record",
     "RecordAddress",
     "Document",
@@ -15,4 +95,20 @@ __all__ = [
     "RecordType",
     "AccelaAccessToken",
     "get_access_token",
+    "refresh_access_token",
+    "TokenProvider",
+    "AccelaError",
+    "AccelaAPIError",
+    "BadRequestError",
+    "AuthenticationError",
+    "PermissionDeniedError",
+    "NotFoundError",
+    "RateLimitError",
+    "ServerError",
+    "RecordingSession",
+    "ReplaySession",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "Pipeline",
+    "WorkflowTable",
 ]
@@ -0,0 +1,363 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "Workflow analytics requires numpy. Install it with: uv add \"accela[numpy]\""
+    ) from e
+
+from .resources.record_workflow_task_histories import RecordWorkflowTaskHistory
+
+# Table column -> model field, by column type. Category columns hold the label of
+# the field (the text, value or id of Accela's {"text", "value"} objects).
+CATEGORY_COLUMNS = {
+    "task": "description",
+    "department": "assigned_to_department",
+    "user": "assigned_user",
+    "status": "status",
+    "record": "record_id",
+    "process": "process_code",
+    "action": "action",
+}
+DATETIME_COLUMNS = (
+    "assigned_date", "due_date", "end_time", "start_time", "status_date", "estimated_due_date", "track_start_date",
+)
+FLOAT_COLUMNS = ("hours_spent", "in_possession_time", "estimated_hours", "days_due")
+BOOL_COLUMNS = ("is_completed", "is_active")
+
+# Model field -> API field, for building tables straight from JSON
+_API_FIELDS = {python: api for api, python in RecordWorkflowTaskHistory.FIELD_MAPPING.items()}
+
+GroupKey = Union[str, Sequence[str]]
+
+
+def _label(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        return str(value.get("text") or value.get("value") or value.get("id") or "")
+    return str(value)
+
+
+def _wall_time(value: Optional[datetime]) -> Optional[datetime]:
+    # Aware datetimes carry the client timezone; keep the agency's wall time like the raw JSON
+    return value.replace(tzinfo=None) if value is not None and value.tzinfo is not None else value
+
+
+def _to_datetime64(value: Union[datetime, np.datetime64, str]) -> np.datetime64:
+    if isinstance(value, datetime):
+        value = _wall_time(value)
+    return np.datetime64(value, "s")
+
+
+class ColumnTable:
+    """Columns of equal length held as NumPy arrays."""
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.columns)
+
+    def _new(self, columns: Dict[str, np.ndarray]) -> "ColumnTable":
+        return ColumnTable(columns)
+
+    def filter(self, mask: np.ndarray) -> "ColumnTable":
+        """Rows where ``mask`` is true, as a new table."""
+        return self._new({name: column[mask] for name, column in self.columns.items()})
+
+    def sort(self, by: str, descending: bool = False) -> "ColumnTable":
+        """Rows ordered by one column, as a new table."""
+        order = np.argsort(self.columns[by], kind="stable")
+        if descending:
+            order = order[::-1]
+        return self._new({name: column[order] for name, column in self.columns.items()})
+
+    def _value(self, name: str, index: int) -> Any:
+        value = self.columns[name][index]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Yield the rows as dicts of Python values."""
+        for index in range(len(self)):
+            yield {name: self._value(name, index) for name in self.columns}
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return list(self.rows())
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(rows={len(self)}, columns={self.names})"
+
+
+class WorkflowTable(ColumnTable):
+    """Workflow task or task history rows as NumPy columns, with vectorized aggregations.
+
+    Build one from ``RecordWorkflowTaskHistory`` or ``RecordWorkflowTask`` models, or
+    straight from their JSON (skipping model hydration, which is much faster for
+    millions of rows). Columns:
+
+    - Categories, stored as int32 codes into ``categories[column]``: task (the task
+      description), department, user, status, record, process, action
+    - Datetimes as ``datetime64[s]``, NaT when missing: assigned_date, due_date,
+      end_time, start_time, status_date, estimated_due_date, track_start_date
+    - Floats, NaN when missing: hours_spent, in_possession_time, estimated_hours, days_due
+    - Booleans, False when missing: is_completed, is_active
+
+    Datetimes are the agency's wall-clock time, as Accela returns them.
+
+    Example:
+        histories = client.record_workflow_task_histories.list(record_id).auto_paging_iter()
+        table = WorkflowTable.from_models(histories)
+        month = table.filter(table.between("end_time", date(2025, 6, 1), date(2025, 7, 1)))
+        for row in month.summarize(by="department").rows():
+            print(row["department"], row["count"], row["overdue"], row["p90_hours"])
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], categories: Dict[str, List[str]]):
+        super().__init__(columns)
+        self.categories = categories
+
+    def _new(self, columns: Dict[str, np.ndarray]) -> "WorkflowTable":
+        return WorkflowTable(columns, self.categories)
+
+    def _value(self, name: str, index: int) -> Any:
+        if name in self.categories:
+            return self.categories[name][self.columns[name][index]]
+        return super()._value(name, index)
+
+    @classmethod
+    def from_models(cls, items: Iterable[Any], chunk_size: int = 100_000) -> "WorkflowTable":
+        """Build a table from RecordWorkflowTaskHistory or RecordWorkflowTask models.
+
+        Args:
+            items: Models, e.g. from ``auto_paging_iter()``
+            chunk_size: Rows converted to arrays at a time, bounding the intermediate lists
+        """
+        # RecordWorkflowTask has no history-only fields such as ``action``
+        def get(item: Any, field: str) -> Any:
+            return getattr(item, field, None)
+
+        return cls._build(items, get, _wall_time, chunk_size)
+
+    @classmethod
+    def from_json(cls, items: Iterable[Dict[str, Any]], chunk_size: int = 100_000) -> "WorkflowTable":
+        """Build a table from workflow task or history JSON objects, e.g. ``model.raw_json``.
+
+        Args:
+            items: Objects with Accela's camelCase fields
+            chunk_size: Rows converted to arrays at a time, bounding the intermediate lists
+        """
+        def get(item: Dict[str, Any], field: str) -> Any:
+            return item.get(_API_FIELDS[field])
+
+        return cls._build(items, get, lambda value: value, chunk_size)
+
+    @classmethod
+    def _build(
+            cls,
+            items: Iterable[Any],
+            get: Callable[[Any, str], Any],
+            convert_datetime: Callable[[Any], Any],
+            chunk_size: int,
+    ) -> "WorkflowTable":
+        categories: Dict[str, List[str]] = {name: [] for name in CATEGORY_COLUMNS}
+        codes: Dict[str, Dict[str, int]] = {name: {} for name in CATEGORY_COLUMNS}
+        chunks: Dict[str, List[np.ndarray]] = {
+            name: [] for name in ("id", *CATEGORY_COLUMNS, *DATETIME_COLUMNS, *FLOAT_COLUMNS, *BOOL_COLUMNS)
+        }
+        pending: Dict[str, List[Any]] = {name: [] for name in chunks}
+
+        def flush() -> None:
+            chunks["id"].append(np.array(pending["id"], dtype=object))
+            for name in CATEGORY_COLUMNS:
+                chunks[name].append(np.array(pending[name], dtype=np.int32))
+            for name in DATETIME_COLUMNS:
+                # None and Accela's "YYYY-MM-DD HH:MM:SS" strings both parse directly
+                chunks[name].append(np.array(pending[name], dtype="datetime64[s]"))
+            for name in FLOAT_COLUMNS:
+                chunks[name].append(np.array(pending[name], dtype=np.float64))
+            for name in BOOL_COLUMNS:
+                chunks[name].append(np.array(pending[name], dtype=bool))
+            for values in pending.values():
+                values.clear()
+
+        for item in items:
+            pending["id"].append(get(item, "id"))
+            for name, field in CATEGORY_COLUMNS.items():
+                label = _label(get(item, field))
+                code = codes[name].get(label)
+                if code is None:
+                    code = codes[name][label] = len(categories[name])
+                    categories[name].append(label)
+                pending[name].append(code)
+            for name in DATETIME_COLUMNS:
+                pending[name].append(convert_datetime(get(item, name)))
+            for name in FLOAT_COLUMNS:
+                value = get(item, name)
+                pending[name].append(np.nan if value is None else value)
+            for name in BOOL_COLUMNS:
+                value = get(item, name)
+                pending[name].append(value is True or value == "Y")
+            if len(pending["id"]) >= chunk_size:
+                flush()
+        if pending["id"] or not chunks["id"]:
+            flush()
+
+        columns = {name: np.concatenate(parts) for name, parts in chunks.items()}
+        return cls(columns, categories)
+
+    def labels(self, column: str) -> np.ndarray:
+        """A category column's labels, one per row."""
+        return np.array(self.categories[column], dtype=object)[self.columns[column]]
+
+    def between(self, column: str, start: Union[datetime, str], end: Union[datetime, str]) -> np.ndarray:
+        """Mask of the rows whose datetime ``column`` is in [start, end)."""
+        values = self.columns[column]
+        return (values >= _to_datetime64(start)) & (values < _to_datetime64(end))
+
+    def hours(self, start: str, end: str, as_of: Optional[datetime] = None) -> np.ndarray:
+        """Hours between two datetime columns, NaN where either is missing.
+
+        Args:
+            start: Datetime column where the interval starts, e.g. 'assigned_date'
+            end: Datetime column where the interval ends, e.g. 'end_time'
+            as_of: Optional time to use where ``end`` is missing, e.g. now for open tasks
+        """
+        ends = self.columns[end]
+        if as_of is not None:
+            ends = np.where(np.isnat(ends), _to_datetime64(as_of), ends)
+        seconds = (ends - self.columns[start]).astype("timedelta64[s]")
+        result = seconds.astype(np.float64) / 3600
+        result[np.isnat(seconds)] = np.nan
+        return result
+
+    def time_in_task(self, as_of: Optional[datetime] = None) -> np.ndarray:
+        """Hours from assignment to completion of each task, NaN if unknown."""
+        return self.hours("assigned_date", "end_time", as_of)
+
+    def overdue(self, as_of: Optional[datetime] = None) -> np.ndarray:
+        """Mask of the tasks that ended after their due date.
+
+        Args:
+            as_of: Optional time to compare open tasks against; without it they are not overdue
+        """
+        due, ends = self.columns["due_date"], self.columns["end_time"]
+        if as_of is not None:
+            ends = np.where(np.isnat(ends), _to_datetime64(as_of), ends)
+        return ~np.isnat(due) & ~np.isnat(ends) & (ends > due)
+
+    def _groups(self, by: GroupKey) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Group code of every row, and the label columns of the groups."""
+        keys = [by] if isinstance(by, str) else list(by)
+        combined = np.zeros(len(self), dtype=np.int64)
+        for key in keys:
+            combined = combined * len(self.categories[key]) + self.columns[key]
+        unique, group_codes = np.unique(combined, return_inverse=True)
+
+        labels: Dict[str, np.ndarray] = {}
+        remainder = unique
+        for key in reversed(keys):
+            size = len(self.categories[key])
+            labels[key] = np.array(self.categories[key], dtype=object)[remainder % size]
+            remainder = remainder // size
+        return group_codes.ravel(), {key: labels[key] for key in keys}
+
+    def aggregate(
+            self,
+            values: np.ndarray,
+            by: GroupKey,
+            percentiles: Sequence[float] = (50, 90),
+            name: str = "value",
+    ) -> ColumnTable:
+        """Count, sum, mean and percentiles of ``values`` per group; NaN values are ignored.
+
+        Args:
+            values: One float per row, e.g. ``table.time_in_task()`` or ``table["hours_spent"]``
+            by: Category column or columns to group by, e.g. "task" or ("task", "department")
+            percentiles: Percentiles to compute, between 0 and 100
+            name: Prefix of the result columns, e.g. "hours" for hours_mean, hours_p90
+
+        Returns:
+            Table with the group labels, ``count`` (rows) and ``<name>_count``,
+            ``<name>_sum``, ``<name>_mean`` and ``<name>_p<percentile>`` columns
+        """
+        codes, labels = self._groups(by)
+        groups = len(next(iter(labels.values())))
+        values = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnan(values)
+        valid_codes, valid_values = codes[valid], values[valid]
+
+        counts = np.bincount(valid_codes, minlength=groups)
+        sums = np.bincount(valid_codes, weights=valid_values, minlength=groups)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(counts > 0, sums / counts, np.nan)
+
+        columns = dict(labels)
+        columns["count"] = np.bincount(codes, minlength=groups)
+        columns[f"{name}_count"] = counts
+        columns[f"{name}_sum"] = sums
+        columns[f"{name}_mean"] = means
+
+        # Sort values within groups once, then interpolate every percentile of every group
+        ordered = valid_values[np.lexsort((valid_values, valid_codes))]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        for percentile in percentiles:
+            position = starts + (percentile / 100) * np.maximum(counts - 1, 0)
+            lower = np.floor(position).astype(np.int64)
+            upper = np.ceil(position).astype(np.int64)
+            result = np.full(groups, np.nan)
+            present = counts > 0
+            if ordered.size:
+                low, high = ordered[lower[present]], ordered[upper[present]]
+                result[present] = low + (high - low) * (position[present] - lower[present])
+            columns[f"{name}_p{percentile:g}"] = result
+        return ColumnTable(columns)
+
+    def summarize(
+            self,
+            by: GroupKey = "task",
+            as_of: Optional[datetime] = None,
+            percentiles: Sequence[float] = (50, 90, 95),
+    ) -> ColumnTable:
+        """SLA summary per group.
+
+        Args:
+            by: Category column or columns to group by
+            as_of: Optional time that open tasks are measured to and checked for being overdue
+            percentiles: Percentiles of the time in task to report
+
+        Returns:
+            Table with the group labels and count, completed, overdue, overdue_rate,
+            hours_mean, hours_p<percentile> (time in task), hours_spent and
+            in_possession_hours columns
+        """
+        summary = self.aggregate(self.time_in_task(as_of), by, percentiles, name="hours")
+        codes, _ = self._groups(by)
+        groups = len(summary)
+        columns = summary.columns
+        overdue = np.bincount(codes, weights=self.overdue(as_of), minlength=groups).astype(np.int64)
+        columns["completed"] = np.bincount(codes, weights=self.columns["is_completed"], minlength=groups).astype(
+            np.int64)
+        columns["overdue"] = overdue
+        columns["overdue_rate"] = overdue / np.maximum(columns["count"], 1)
+        for column, source in (("hours_spent", "hours_spent"), ("in_possession_hours", "in_possession_time")):
+            values = self.columns[source]
+            valid = ~np.isnan(values)
+            columns[column] = np.bincount(codes[valid], weights=values[valid], minlength=groups)
+        del columns["hours_count"], columns["hours_sum"]
+        return summary
@@ -0,0 +1,257 @@
+import base64
+import gzip
+import io
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .errors import AccelaError
+from .export import _require_zstandard
+
+CASSETTE_VERSION = 1
+
+# Never written to a cassette
+_SECRET_HEADERS = {"authorization", "cookie", "set-cookie"}
+# Describe the wire encoding, not the decoded body that is recorded
+_WIRE_HEADERS = {"content-encoding", "transfer-encoding", "content-length"}
+
+
+class CassetteMissError(AccelaError, LookupError):
+    """A replayed request has no recorded response."""
+
+
+def _open_cassette(path: Path, mode: str) -> TextIO:
+    """Open a cassette for text reading ('r') or writing ('w'), compressed by suffix."""
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    if path.suffix == ".zst":
+        zstandard = _require_zstandard()
+        if mode == "r":
+            raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        else:
+            raw = zstandard.ZstdCompressor().stream_writer(open(path, "wb"), closefd=True)
+        return io.TextIOWrapper(raw, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def request_key(
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_body: Any = None,
+        data: Any = None,
+) -> str:
+    """Identify a request independently of host, parameter order and credentials.
+
+    Args:
+        method: HTTP method
+        url: Request URL, possibly with a query string
+        params: Query parameters added to the URL
+        json_body: JSON request body
+        data: Form or raw request body
+
+    Returns:
+        A string such as ``GET /v4/records?limit=100&offset=0``
+    """
+    prepared = requests.Request(method.upper(), url, params=params).prepare()
+    parts = urlsplit(prepared.url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    key = f"{method.upper()} {parts.path}?{query}"
+    if json_body is not None:
+        key += " " + json.dumps(json_body, sort_keys=True, default=str)
+    elif data is not None:
+        key += " " + (json.dumps(data, sort_keys=True) if isinstance(data, dict) else str(data))
+    return key
+
+
+class RecordingSession:
+    """Session wrapper that records every response to a cassette file.
+
+    Pass it as ``AccelaClient(session=...)``. Requests are sent through the wrapped
+    session and each response is appended to the cassette, with its body and the time
+    it took. The Authorization header is never recorded. A ``.gz`` or ``.zst`` suffix
+    compresses the cassette; ``.zst`` requires ``accela[zstd]``.
+
+    Example:
+        with RecordingSession("charlotte.jsonl.gz") as session:
+            client = AccelaClient(access_token=token, agency="CHARLOTTE", environment="PROD", session=session)
+            list(client.records.list(module="Building").auto_paging_iter())
+    """
+
+    def __init__(self, path: Union[str, Path], session: Optional[requests.Session] = None):
+        """
+        Initialize the recorder, creating or truncating the cassette.
+
+        Args:
+            path: Cassette file to write
+            session: Session used to send the requests, default a new requests.Session
+        """
+        self.path = Path(path)
+        self.session = session if session is not None else requests.Session()
+        self._owns_session = session is None
+        self._lock = threading.Lock()
+        self._file = _open_cassette(self.path, "w")
+        self._write({"version": CASSETTE_VERSION, "recorded_at": datetime.now(tz=timezone.utc).isoformat()})
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        start = time.perf_counter()
+        response = self.session.request(method, url, **kwargs)
+        # Read streamed bodies too; the caller can still iterate over them
+        content = response.content
+        elapsed = time.perf_counter() - start
+
+        interaction: Dict[str, Any] = {
+            "key": request_key(method, url, kwargs.get("params"), kwargs.get("json"), kwargs.get("data")),
+            "request_headers": {
+                name: value for name, value in (kwargs.get("headers") or {}).items()
+                if name.lower() not in _SECRET_HEADERS
+            },
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                name: value for name, value in response.headers.items()
+                if name.lower() not in _SECRET_HEADERS and name.lower() not in _WIRE_HEADERS
+            },
+            "elapsed": round(elapsed, 6),
+        }
+        try:
+            interaction["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            interaction["body_base64"] = base64.b64encode(content).decode("ascii")
+        self._write(interaction)
+        return response
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def close(self) -> None:
+        """Finish the cassette; it is only complete once closed."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self) -> "RecordingSession":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class ReplaySession:
+    """Session replacement that answers requests from a recorded cassette.
+
+    No network is used. Requests are matched by method, path, query parameters and
+    body, ignoring the host, so a cassette can be replayed against any ``BASE_URL``.
+    Identical requests get the recorded responses in order, and the last one again once
+    they run out.
+
+    Example:
+        session = ReplaySession("charlotte.jsonl.gz", realtime=True)
+        client = AccelaClient(access_token="replay", agency="CHARLOTTE", environment="PROD", session=session)
+    """
+
+    def __init__(self, path: Union[str, Path], realtime: bool = False):
+        """
+        Initialize the player by loading the cassette.
+
+        Args:
+            path: Cassette file written by RecordingSession
+            realtime: Wait the recorded time before returning each response, instead of
+                replaying at full speed
+
+        Raises:
+            ValueError: If the file is not a cassette of a supported version
+        """
+        self.path = Path(path)
+        self.realtime = realtime
+        self._interactions: Dict[str, List[Dict[str, Any]]] = {}
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        with _open_cassette(self.path, "r") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"{self.path} is not a version {CASSETTE_VERSION} cassette")
+            for line in f:
+                interaction = json.loads(line)
+                self._interactions.setdefault(interaction["key"], []).append(interaction)
+
+    def __len__(self) -> int:
+        return sum(len(interactions) for interactions in self._interactions.values())
+
+    def request(
+            self,
+            method: str,
+            url: str,
+            params: Optional[Dict[str, Any]] = None,
+            json: Any = None,
+            data: Any = None,
+            headers: Optional[Dict[str, str]] = None,
+            **_: Any,
+    ) -> requests.Response:
+        """Return the recorded response for a request.
+
+        Raises:
+            CassetteMissError: If the cassette has no response for this request
+        """
+        key = request_key(method, url, params, json, data)
+        with self._lock:
+            recorded = self._interactions.get(key)
+            if not recorded:
+                raise CassetteMissError(f"No recorded response for {key} in {self.path}")
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+        interaction = recorded[min(position, len(recorded) - 1)]
+
+        if self.realtime:
+            time.sleep(interaction["elapsed"])
+        return self._build_response(method, url, params, headers, interaction)
+
+    @staticmethod
+    def _build_response(
+            method: str,
+            url: str,
+            params: Optional[Dict[str, Any]],
+            headers: Optional[Dict[str, str]],
+            interaction: Dict[str, Any],
+    ) -> requests.Response:
+        if "body_base64" in interaction:
+            content = base64.b64decode(interaction["body_base64"])
+        else:
+            content = interaction["body"].encode("utf-8")
+
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.reason = interaction["reason"]
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        response.headers["Content-Length"] = str(len(content))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = content
+        response._content_consumed = True
+        response.request = requests.Request(
+            method, url, params=params, headers=headers or interaction["request_headers"]
+        ).prepare()
+        response.url = response.request.url
+        response.elapsed = timedelta(seconds=interaction["elapsed"])
+        return response
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "ReplaySession":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,182 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional, Tuple
+
+from .errors import AccelaError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+CircuitKey = Tuple[str, str, str]  # (agency, environment, endpoint template)
+
+
+class CircuitOpenError(AccelaError):
+    """A request was refused without being sent because its circuit is open.
+
+    Attributes:
+        agency: Agency of the circuit
+        environment: Environment of the circuit
+        endpoint: Endpoint template of the circuit, e.g. '/records/{id}/documents'
+        retry_after: Seconds until the circuit lets a probe request through
+    """
+
+    def __init__(self, key: CircuitKey, retry_after: float):
+        self.agency, self.environment, self.endpoint = key
+        self.retry_after = retry_after
+        super().__init__(
+            f"Circuit open for {self.endpoint} on {self.agency}/{self.environment}; "
+            f"retry in {retry_after:.1f}s"
+        )
+
+
+@dataclass
+class _Circuit:
+    state: str = CLOSED
+    # (completed at, failed, slow) of recent calls
+    calls: Deque[Tuple[float, bool, bool]] = field(default_factory=deque)
+    opened_at: float = 0.0
+    probes: int = 0
+
+
+class CircuitBreaker:
+    """Stops sending requests to an agency endpoint that keeps failing or is too slow.
+
+    Circuits are kept per (agency, environment, endpoint template). A circuit opens
+    when, over the last ``window`` seconds and at least ``min_calls`` calls, the share
+    of failed calls (transport errors and 5xx responses) reaches ``failure_rate`` or
+    the share of calls slower than ``slow_call_seconds`` reaches ``slow_call_rate``.
+    While open, requests fail immediately with CircuitOpenError. After
+    ``open_seconds`` the circuit is half-open: up to ``half_open_probes`` requests are
+    let through, and it closes again if they succeed or reopens if one fails.
+
+    Pass a breaker as ``AccelaClient(circuit_breaker=...)``; several clients may share
+    one. State changes are reported to the client's ``on_circuit`` hooks.
+
+    Example:
+        breaker = CircuitBreaker(failure_rate=0.5, slow_call_seconds=20)
+        client = AccelaClient(access_token=token, agency="AGENCY", environment="PROD", circuit_breaker=breaker)
+        try:
+            client.records.retrieve("REC-1")
+        except CircuitOpenError as e:
+            print("Accela is degraded, retry in", e.retry_after)
+    """
+
+    def __init__(
+            self,
+            failure_rate: float = 0.5,
+            slow_call_seconds: Optional[float] = 30.0,
+            slow_call_rate: float = 0.8,
+            min_calls: int = 20,
+            window: float = 60.0,
+            open_seconds: float = 30.0,
+            half_open_probes: int = 1,
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_rate: Share of failed calls that opens a circuit
+            slow_call_seconds: Calls taking longer than this count as slow; None disables
+            slow_call_rate: Share of slow calls that opens a circuit
+            min_calls: Calls needed in the window before a circuit can open
+            window: Seconds of recent calls considered
+            open_seconds: How long a circuit stays open before probing
+            half_open_probes: Concurrent probe requests allowed while half-open
+        """
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._circuits: Dict[CircuitKey, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def before_call(self, key: CircuitKey) -> Optional[str]:
+        """Admit a call or refuse it.
+
+        Returns:
+            The new state if admitting the call changed it (to half-open), else None
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with all probes in flight
+        """
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit.state == CLOSED:
+                return None
+
+            transition = None
+            now = time.monotonic()
+            if circuit.state == OPEN:
+                remaining = circuit.opened_at + self.open_seconds - now
+                if remaining > 0:
+                    raise CircuitOpenError(key, remaining)
+                circuit.state, circuit.probes = HALF_OPEN, 0
+                transition = HALF_OPEN
+            if circuit.probes >= self.half_open_probes:
+                raise CircuitOpenError(key, 0.0)
+            circuit.probes += 1
+            return transition
+
+    def record(self, key: CircuitKey, failed: bool, elapsed: float) -> Optional[str]:
+        """Record the outcome of an admitted call.
+
+        Returns:
+            The new state if this outcome changed it, else None
+        """
+        slow = self.slow_call_seconds is not None and elapsed >= self.slow_call_seconds
+        now = time.monotonic()
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                circuit = self._circuits[key] = _Circuit()
+
+            if circuit.state == HALF_OPEN:
+                circuit.probes -= 1
+                if failed or slow:
+                    circuit.state, circuit.opened_at = OPEN, now
+                    return OPEN
+                circuit.state = CLOSED
+                circuit.calls.clear()
+                return CLOSED
+            if circuit.state == OPEN:
+                # Admitted before the circuit opened; does not change it
+                return None
+
+            calls = circuit.calls
+            calls.append((now, failed, slow))
+            while calls and calls[0][0] < now - self.window:
+                calls.popleft()
+            if len(calls) < self.min_calls:
+                return None
+            failures = sum(1 for _, call_failed, _ in calls if call_failed)
+            slow_calls = sum(1 for _, _, call_slow in calls if call_slow)
+            if failures >= self.failure_rate * len(calls) or slow_calls >= self.slow_call_rate * len(calls):
+                circuit.state, circuit.opened_at = OPEN, now
+                calls.clear()
+                return OPEN
+            return None
+
+    def state(self, agency: str, environment: str, endpoint: str) -> str:
+        """State of one circuit: 'closed', 'open' or 'half_open'."""
+        with self._lock:
+            circuit = self._circuits.get((agency, environment, endpoint))
+            return circuit.state if circuit is not None else CLOSED
+
+    def states(self) -> Dict[CircuitKey, str]:
+        """State of every circuit that has seen a call."""
+        with self._lock:
+            return {key: circuit.state for key, circuit in self._circuits.items()}
+
+    def reset(self, key: Optional[CircuitKey] = None) -> None:
+        """Close one circuit, or all of them, and forget their history."""
+        with self._lock:
+            if key is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(key, None)
@@ -0,0 +1,350 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import requests
+
+from .circuit_breaker import CircuitOpenError
+from .client import AccelaClient
+from .downloads import BulkDownloader
+from .metrics import MetricsRegistry
+from .resources.base import ResourceModel
+from .sharding import ShardedScan
+from .store import DocumentStore
+from .sync import RecordSync
+from .util.access_token import TokenProvider, get_access_token
+from .util.concurrency import bounded_map
+
+# CLI name -> client resource attribute for per-record sub-resources
+RELATED_RESOURCES = {
+    "addresses": "record_addresses",
+    "parcels": "record_parcels",
+    "activities": "record_activities",
+    "documents": "record_documents",
+    "workflow-tasks": "record_workflow_tasks",
+    "workflow-task-histories": "record_workflow_task_histories",
+}
+
+FORMATS = ("ndjson", "csv", "parquet", "arrow")
+
+
+class CrawlStats:
+    """Thread-safe request latency and item counters for a CLI run."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.items = 0
+        self.errors = 0
+        self.latencies: List[float] = []
+        self.metrics: Optional[MetricsRegistry] = None
+        self._lock = threading.Lock()
+
+    def record_request(self, elapsed: float, **_: Any) -> None:
+        """after_response hook."""
+        with self._lock:
+            self.latencies.append(elapsed)
+
+    def record_items(self, count: int = 1) -> None:
+        with self._lock:
+            self.items += count
+
+    def record_errors(self, count: int = 1) -> None:
+        with self._lock:
+            self.errors += count
+
+    def report(self) -> str:
+        elapsed = time.monotonic() - self.started
+        latencies = sorted(self.latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+        return (
+            f"{self.items} items, {len(latencies)} requests, {self.errors} errors in {elapsed:.1f}s "
+            f"({self.items / elapsed if elapsed else 0:.1f} items/s, "
+            f"{len(latencies) / elapsed if elapsed else 0:.1f} requests/s); "
+            f"latency p50={percentile(0.5):.0f}ms p95={percentile(0.95):.0f}ms p99={percentile(0.99):.0f}ms"
+        )
+
+
+def _parse_date(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {value!r}, expected YYYY-MM-DD[THH:MM:SS]")
+
+
+def _read_ids(source: str) -> Iterator[str]:
+    """Yield record IDs, one per line, from a file or '-' for stdin."""
+    lines = sys.stdin if source == "-" else open(source)
+    try:
+        for line in lines:
+            line = line.strip()
+            if line:
+                yield line
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+
+
+def _load_checkpoint(path: Optional[str]) -> Set[str]:
+    if not path or not os.path.exists(path):
+        return set()
+    return set(_read_ids(path))
+
+
+def _write_items(items: Iterable[ResourceModel], args: argparse.Namespace) -> int:
+    """Write items in the requested output format."""
+    from . import export
+
+    if args.format in ("parquet", "arrow") and args.output == "-":
+        raise SystemExit(f"--format {args.format} needs an --output file")
+    if args.format == "ndjson":
+        return export.write_ndjson(items, args.output, raw=args.raw)
+    if args.format == "csv":
+        return export.write_csv(items, args.output)
+    if args.format == "parquet":
+        return export.write_parquet(items, args.output)
+    return export.write_arrow(items, args.output)
+
+
+def _counted(items: Iterable[ResourceModel], stats: CrawlStats) -> Iterator[ResourceModel]:
+    for item in items:
+        stats.record_items()
+        yield item
+
+
+def _build_client(args: argparse.Namespace, stats: CrawlStats) -> AccelaClient:
+    token = args.token or os.environ.get("ACCELA_ACCESS_TOKEN")
+    if not token:
+        required = ["ACCELA_CLIENT_ID", "ACCELA_CLIENT_SECRET", "ACCELA_USERNAME", "ACCELA_PASSWORD"]
+        missing = [name for name in required if not os.environ.get(name)]
+        if missing:
+            raise SystemExit(
+                "Provide --token, ACCELA_ACCESS_TOKEN, or credentials in " + ", ".join(required)
+            )
+        # A provider renews the token when it expires or is rejected during a long crawl
+        token = TokenProvider(
+            client_id=os.environ["ACCELA_CLIENT_ID"],
+            client_secret=os.environ["ACCELA_CLIENT_SECRET"],
+            login=partial(
+                get_access_token,
+                client_id=os.environ["ACCELA_CLIENT_ID"],
+                client_secret=os.environ["ACCELA_CLIENT_SECRET"],
+                username=os.environ["ACCELA_USERNAME"],
+                password=os.environ["ACCELA_PASSWORD"],
+                agency_name=args.agency,
+                environment=args.environment,
+                grant_type=args.grant_type,
+                scope=args.scope,
+                id_provider=args.id_provider,
+            ),
+        )
+    client = AccelaClient(
+        access_token=token,
+        agency=args.agency,
+        environment=args.environment,
+        rate_limit=args.rate_limit,
+        adaptive_page_size=args.adaptive_page_size,
+    )
+    client.add_hook("after_response", stats.record_request)
+    if args.metrics:
+        metrics = MetricsRegistry()
+        metrics.attach(client)
+        stats.metrics = metrics
+    return client
+
+
+def crawl_records(client: AccelaClient, args: argparse.Namespace, stats: CrawlStats) -> int:
+    filters: Dict[str, Any] = {
+        name: getattr(args, name)
+        for name in ("module", "status", "type", "record_class")
+        if getattr(args, name) is not None
+    }
+
+    date_field = args.date_field or ("update_date" if args.checkpoint else "opened_date")
+
+    if args.checkpoint:
+        if args.shard:
+            raise SystemExit("--checkpoint and --shard cannot be combined")
+        if date_field not in RecordSync.FIELDS:
+            raise SystemExit(f"--checkpoint needs --date-field {' or '.join(RecordSync.FIELDS)}")
+        sync = RecordSync(client, args.checkpoint, field=date_field, since=args.date_from,
+                          limit=args.limit, **filters)
+        items: Iterable[ResourceModel] = sync.run()
+    elif args.shard:
+        if args.date_from is None:
+            raise SystemExit("--shard needs --from")
+        items = ShardedScan(
+            client, args.date_from, args.date_to, field=date_field, limit=args.limit,
+            max_workers=args.concurrency, max_per_shard=args.max_per_shard, **filters,
+        ).run()
+    else:
+        if args.date_from is not None:
+            filters[f"{date_field}_from"] = args.date_from
+        if args.date_to is not None:
+            filters[f"{date_field}_to"] = args.date_to
+        items = client.records.list(limit=args.limit, **filters).auto_paging_iter()
+
+    return _write_items(_counted(items, stats), args)
+
+
+def crawl_related(client: AccelaClient, args: argparse.Namespace, stats: CrawlStats) -> int:
+    resource = getattr(client, RELATED_RESOURCES[args.resource])
+    if args.checkpoint and args.format != "ndjson":
+        raise SystemExit("--checkpoint needs --format ndjson, which can be appended to on restart")
+    done = _load_checkpoint(args.checkpoint)
+
+    def fetch(record_id: str) -> Optional[List[ResourceModel]]:
+        try:
+            return list(resource.list(record_id, limit=args.limit).auto_paging_iter())
+        except (requests.RequestException, CircuitOpenError) as e:
+            stats.record_errors()
+            print(f"{record_id}: {e}", file=sys.stderr)
+            return None
+
+    def listings() -> Iterator[Tuple[str, List[ResourceModel]]]:
+        record_ids = (record_id for record_id in _read_ids(args.record_ids) if record_id not in done)
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            for record_id, listed in bounded_map(pool, fetch, record_ids, args.concurrency * 2):
+                if listed is not None:
+                    yield record_id, listed
+
+    if not args.checkpoint:
+        return _write_items(_counted((item for _, listed in listings() for item in listed), stats), args)
+
+    from . import export
+
+    # A record is checkpointed only once its items are on disk, and a restart appends to
+    # the output, so nothing is lost; a record interrupted mid-write is written again
+    with export.open_ndjson(args.output, raw=args.raw, append=bool(done)) as writer, \
+            open(args.checkpoint, "a") as checkpoint:
+        for record_id, listed in listings():
+            for item in _counted(listed, stats):
+                writer.write(item)
+            writer.sync()
+            checkpoint.write(record_id + "\n")
+            checkpoint.flush()
+    return writer.rows
+
+
+def download_documents(client: AccelaClient, args: argparse.Namespace, stats: CrawlStats) -> int:
+    done = _load_checkpoint(args.checkpoint)
+    record_ids = [record_id for record_id in _read_ids(args.record_ids) if record_id not in done]
+    store = DocumentStore(args.store) if args.store else None
+
+    try:
+        downloader = BulkDownloader(
+            client, args.directory, max_workers=args.concurrency,
+            max_bytes_per_second=args.max_bytes_per_second, store=store,
+        )
+        manifest = downloader.download_records(record_ids)
+    finally:
+        if store:
+            store.close()
+
+    stats.record_items(len(manifest.succeeded))
+    stats.record_errors(len(manifest.failed))
+    if args.manifest:
+        manifest.write(args.manifest)
+    if args.checkpoint:
+        failed = {result.record_id for result in manifest.failed}
+        with open(args.checkpoint, "a") as f:
+            for record_id in record_ids:
+                if record_id not in failed:
+                    f.write(record_id + "\n")
+    print(manifest, file=sys.stderr)
+    return len(manifest.succeeded)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="accela", description="Bulk extraction from the Accela API.")
+    parser.add_argument("--token", help="Access token (default: $ACCELA_ACCESS_TOKEN)")
+    parser.add_argument("--agency", default=os.environ.get("ACCELA_AGENCY"),
+                        help="Agency name (default: $ACCELA_AGENCY)")
+    parser.add_argument("--environment", default=os.environ.get("ACCELA_ENVIRONMENT"),
+                        help="Environment name (default: $ACCELA_ENVIRONMENT)")
+    parser.add_argument("--grant-type", default=os.environ.get("ACCELA_GRANT_TYPE", "password"),
+                        help="OAuth grant type used with credentials (default: $ACCELA_GRANT_TYPE or password)")
+    parser.add_argument("--scope", default=os.environ.get("ACCELA_SCOPE", "records"),
+                        help="OAuth scope requested with credentials (default: $ACCELA_SCOPE or records)")
+    parser.add_argument("--id-provider", default=os.environ.get("ACCELA_ID_PROVIDER", "citizen"),
+                        help="Identity provider used with credentials (default: $ACCELA_ID_PROVIDER or citizen)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent requests (default: 8)")
+    parser.add_argument("--rate-limit", type=float, help="Maximum requests per second")
+    parser.add_argument("--limit", type=int, default=100, help="Page size (default: 100)")
+    parser.add_argument("--adaptive-page-size", action="store_true",
+                        help="Tune the page size per endpoint after the first page, starting from --limit")
+    parser.add_argument("--metrics", help="Write Prometheus-format metrics to this file when the run ends")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_output(subparser: argparse.ArgumentParser) -> None:
+        subparser.add_argument("--format", choices=FORMATS, default="ndjson")
+        subparser.add_argument("--output", "-o", default="-",
+                               help="Output file; '.gz'/'.zst' compresses ndjson/csv (default: stdout)")
+        subparser.add_argument("--raw", action="store_true", help="Write the original API JSON (ndjson only)")
+
+    records = subparsers.add_parser("records", help="Crawl records")
+    add_output(records)
+    records.add_argument("--module")
+    records.add_argument("--status")
+    records.add_argument("--type")
+    records.add_argument("--record-class")
+    records.add_argument("--date-field", choices=ShardedScan.FIELDS,
+                         help="Date filter used by --from/--to, --shard and --checkpoint "
+                              "(default: update_date with --checkpoint, otherwise opened_date)")
+    records.add_argument("--from", dest="date_from", type=_parse_date)
+    records.add_argument("--to", dest="date_to", type=_parse_date)
+    records.add_argument("--shard", action="store_true",
+                         help="Split --from/--to into date windows fetched concurrently")
+    records.add_argument("--max-per-shard", type=int, default=1000)
+    records.add_argument("--checkpoint", help="Sync state file; only records changed since the last run are crawled")
+    records.set_defaults(handler=crawl_records)
+
+    related = subparsers.add_parser("related", help="Crawl a sub-resource of many records")
+    add_output(related)
+    related.add_argument("resource", choices=sorted(RELATED_RESOURCES))
+    related.add_argument("--record-ids", required=True, help="File with one record ID per line, or '-' for stdin")
+    related.add_argument("--checkpoint",
+                         help="File of completed record IDs, skipped on restart; the output is appended to")
+    related.set_defaults(handler=crawl_related)
+
+    documents = subparsers.add_parser("documents", help="Download all documents of many records")
+    documents.add_argument("--record-ids", required=True, help="File with one record ID per line, or '-' for stdin")
+    documents.add_argument("--directory", "-d", required=True)
+    documents.add_argument("--store", help="DocumentStore directory used to skip unchanged documents")
+    documents.add_argument("--max-bytes-per-second", type=float)
+    documents.add_argument("--manifest", help="Write the download manifest to this file")
+    documents.add_argument("--checkpoint", help="File of completed record IDs, skipped on restart")
+    documents.set_defaults(handler=download_documents)
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    stats = CrawlStats()
+    client = _build_client(args, stats)
+    try:
+        args.handler(client, args, stats)
+    except KeyboardInterrupt:
+        print("Interrupted", file=sys.stderr)
+        return 130
+    finally:
+        print(stats.report(), file=sys.stderr)
+        if stats.metrics is not None:
+            with open(args.metrics, "w") as f:
+                f.write(stats.metrics.to_prometheus())
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
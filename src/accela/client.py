@@ -1,20 +1,40 @@
-from typing import ClassVar, Dict, Optional, Type
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+import importlib
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Dict, List, Optional, Tuple, Type, Union
 from zoneinfo import ZoneInfo
 
-from .resources.agencies import Agencies
-from .resources.agency_environments import AgencyEnvironments
-from .resources.base import BaseResource
-from .resources.documents import Documents
-from .resources.modules import Modules
-from .resources.record_addresses import RecordAddresses
-from .resources.record_activities import RecordActivities
-from .resources.record_documents import RecordDocuments
-from .resources.record_mine import MyRecords
-from .resources.record_parcels import RecordParcels
-from .resources.record_types import RecordTypes
-from .resources.record_workflows import RecordWorkflowTasks
-from .resources.record_workflow_task_histories import RecordWorkflowTaskHistories
-from .resources.records import Records
+from .util.access_token import TokenProvider
+from .util.endpoints import endpoint_template
+from .util.hedging import HedgingPolicy
+from .util.page_size import PageSizeTuner
+from .util.rate_limit import TokenBucket
+from .util.scheduler import INTERACTIVE, PriorityScheduler, current_traffic_class
+
+if TYPE_CHECKING:
+    import requests
+
+    from .circuit_breaker import CircuitBreaker
+    from .parsing import ProcessParser
+
+    from .resources.agencies import Agencies
+    from .resources.agency_environments import AgencyEnvironments
+    from .resources.base import BaseResource
+    from .resources.documents import Documents
+    from .resources.modules import Modules
+    from .resources.record_addresses import RecordAddresses
+    from .resources.record_activities import RecordActivities
+    from .resources.record_documents import RecordDocuments
+    from .resources.record_mine import MyRecords
+    from .resources.record_parcels import RecordParcels
+    from .resources.record_types import RecordTypes
+    from .resources.record_workflows import RecordWorkflowTasks
+    from .resources.record_workflow_task_histories import RecordWorkflowTaskHistories
+    from .resources.records import Records
+
+logger = logging.getLogger("accela")
 
 
 class AccelaClient:
@@ -22,88 +42,362 @@ class AccelaClient:
 
     BASE_URL = "https://apis.accela.com/v4"
 
-    # Define resource classes to be automatically initialized
-    RESOURCE_CLASSES: ClassVar[Dict[str, Type[BaseResource]]] = {
-        "agencies": Agencies,
-        "agency_environments": AgencyEnvironments,
-        "records": Records,
-        "record_addresses": RecordAddresses,
-        "record_activities": RecordActivities,
-        "record_documents": RecordDocuments,
-        "my_records": MyRecords,
-        "record_parcels": RecordParcels,
-        "documents": Documents,
-        "modules": Modules,
-        "record_types": RecordTypes,
-        "record_workflow_tasks": RecordWorkflowTasks,
-        "record_workflow_task_histories": RecordWorkflowTaskHistories,
+    # Instrumentation events; see add_hook
+    HOOK_EVENTS = ("before_request", "after_response", "on_retry", "on_page", "on_parse", "on_circuit")
+
+    # Resource attribute -> class, or "module:Class" path imported on first access.
+    # Resource modules (and requests) are only loaded once a resource is used.
+    RESOURCE_CLASSES: ClassVar[Dict[str, Union[str, Type["BaseResource"]]]] = {
+        "agencies": "accela.resources.agencies:Agencies",
+        "agency_environments": "accela.resources.agency_environments:AgencyEnvironments",
+        "records": "accela.resources.records:Records",
+        "record_addresses": "accela.resources.record_addresses:RecordAddresses",
+        "record_activities": "accela.resources.record_activities:RecordActivities",
+        "record_documents": "accela.resources.record_documents:RecordDocuments",
+        "my_records": "accela.resources.record_mine:MyRecords",
+        "record_parcels": "accela.resources.record_parcels:RecordParcels",
+        "documents": "accela.resources.documents:Documents",
+        "modules": "accela.resources.modules:Modules",
+        "record_types": "accela.resources.record_types:RecordTypes",
+        "record_workflow_tasks": "accela.resources.record_workflows:RecordWorkflowTasks",
+        "record_workflow_task_histories": "accela.resources.record_workflow_task_histories:RecordWorkflowTaskHistories",
     }
 
     # Hinting
-    agencies: Agencies
-    agency_environments: AgencyEnvironments
-    records: Records
-    record_addresses: RecordAddresses
-    record_activities: RecordActivities
-    record_documents: RecordDocuments
-    my_records: MyRecords
-    record_parcels: RecordParcels
-    documents: Documents
-    modules: Modules
-    record_types: RecordTypes
-    record_workflow_tasks: RecordWorkflowTasks
-    record_workflow_task_histories: RecordWorkflowTaskHistories
+    agencies: "Agencies"
+    agency_environments: "AgencyEnvironments"
+    records: "Records"
+    record_addresses: "RecordAddresses"
+    record_activities: "RecordActivities"
+    record_documents: "RecordDocuments"
+    my_records: "MyRecords"
+    record_parcels: "RecordParcels"
+    documents: "Documents"
+    modules: "Modules"
+    record_types: "RecordTypes"
+    record_workflow_tasks: "RecordWorkflowTasks"
+    record_workflow_task_histories: "RecordWorkflowTaskHistories"
 
     def __init__(
             self,
-            access_token: str,
+            access_token: Union[str, TokenProvider],
             agency: Optional[str] = None,
             environment: Optional[str] = None,
             timezone: Optional[ZoneInfo] = None,
+            rate_limit: Optional[float] = None,
+            session: Optional["requests.Session"] = None,
+            adaptive_page_size: Union[bool, PageSizeTuner] = False,
+            stream_pages: bool = False,
+            parse_executor: Optional["ProcessParser"] = None,
+            hedging: Optional[HedgingPolicy] = None,
+            circuit_breaker: Optional["CircuitBreaker"] = None,
+            scheduler: Optional[PriorityScheduler] = None,
+            traffic_class: str = INTERACTIVE,
     ):
         """
         Initialize the Accela client.
 
         Args:
-            access_token: Accela API access token
+            access_token: Accela API access token, or a TokenProvider that keeps it refreshed
             agency: Optional agency name; e.g. 'CHARLOTTE'. Required for agency-specific resources.
             environment: Optional environment name; e.g. 'PROD'. Required for agency-specific resources.
             timezone: Optional timezone for converting naive datetime strings from API to timezone-aware datetimes
+            rate_limit: Optional maximum number of requests per second, shared by all threads using this client
+            session: Optional requests.Session whose connection pool is used; clients may share one.
+                A RecordingSession or ReplaySession from accela.cassette records or replays traffic.
+            adaptive_page_size: Tune the page size of auto_paging_iter per endpoint toward a
+                target latency; pass a PageSizeTuner to configure the target and bounds
+            stream_pages: Parse list pages incrementally while they download instead of
+                buffering each body; auto_paging_iter then yields models as they arrive
+            parse_executor: Optional accela.parsing.ProcessParser that decodes list pages and
+                hydrates their models in worker processes; takes precedence over stream_pages
+            hedging: Optional HedgingPolicy; slow GETs are then duplicated and the first
+                response is used
+            circuit_breaker: Optional accela.CircuitBreaker; requests to an endpoint whose
+                circuit is open then fail fast with CircuitOpenError
+            scheduler: Optional PriorityScheduler shared by the clients of one quota; requests
+                wait their turn by traffic class. Takes precedence over rate_limit.
+            traffic_class: Traffic class of this client's requests, 'interactive' or 'batch',
+                unless overridden with a ``traffic_class`` block or per request
         """
         self.access_token = access_token
         self.agency = agency
         self.environment = environment
         self.timezone = timezone
+        self.rate_limiter = TokenBucket(rate_limit) if rate_limit else None
+        if isinstance(adaptive_page_size, PageSizeTuner):
+            self.page_size_tuner: Optional[PageSizeTuner] = adaptive_page_size
+        else:
+            self.page_size_tuner = PageSizeTuner() if adaptive_page_size else None
+        self.stream_pages = stream_pages
+        self.parse_executor = parse_executor
+        self.hedging = hedging
+        self.circuit_breaker = circuit_breaker
+        self.scheduler = scheduler
+        self.traffic_class = traffic_class
+        self._session = session
+        self.hooks: Dict[str, List[Callable[..., None]]] = {event: [] for event in self.HOOK_EVENTS}
 
         # Store resource classes for lazy initialization
         self._resource_instances = {}
 
+    @property
+    def session(self) -> "requests.Session":
+        """The session requests are sent with, created on first use unless one was given."""
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+        return self._session
+
+    @session.setter
+    def session(self, session: "requests.Session") -> None:
+        self._session = session
+
     def __getattr__(self, name: str):
         """Lazy initialization of resources when accessed."""
         if name in self.RESOURCE_CLASSES:
             if name not in self._resource_instances:
-                resource_class = self.RESOURCE_CLASSES[name]
+                resource_class = self._resource_class(name)
                 self._resource_instances[name] = resource_class(self)
             return self._resource_instances[name]
         raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
 
-    def register_resource(self, name: str, resource_class: Type[BaseResource]) -> None:
+    @classmethod
+    def _resource_class(cls, name: str) -> Type["BaseResource"]:
+        """Resolve a RESOURCE_CLASSES entry, importing its module if it is given as a path."""
+        resource_class = cls.RESOURCE_CLASSES[name]
+        if isinstance(resource_class, str):
+            module_name, _, class_name = resource_class.partition(":")
+            resource_class = getattr(importlib.import_module(module_name), class_name)
+            cls.RESOURCE_CLASSES[name] = resource_class
+        return resource_class
+
+    def register_resource(self, name: str, resource_class: Union[str, Type["BaseResource"]]) -> None:
         """Register a new resource class with the client.
 
         Args:
             name: Attribute name to use for the resource
-            resource_class: Resource class to instantiate
+            resource_class: Resource class to instantiate, or its "module:Class" path to
+                import on first access
         """
         self.RESOURCE_CLASSES[name] = resource_class
         # Clear cached instance if it exists
         if name in self._resource_instances:
             del self._resource_instances[name]
 
+    def add_hook(self, event: str, hook: Callable[..., None]) -> None:
+        """Register a callback for an instrumentation event.
+
+        Hooks are called synchronously with keyword arguments, from whichever thread
+        made the request, so they should be fast and thread-safe. Events and their
+        arguments:
+
+        - before_request: method, url
+        - after_response: method, url, status, elapsed (seconds), response
+        - on_retry: method, url, attempt, reason
+        - on_page: url, offset, limit, count, total
+        - on_parse: stage ('json' or 'model'), model (class name or None), count, elapsed
+        - on_circuit: agency, environment, endpoint, state ('closed', 'open' or 'half_open')
+
+        Args:
+            event: One of HOOK_EVENTS
+            hook: Callback accepting the event's keyword arguments
+        """
+        if event not in self.hooks:
+            raise ValueError(f"Unknown hook event {event!r}, expected one of {', '.join(self.HOOK_EVENTS)}")
+        self.hooks[event].append(hook)
+
+    def remove_hook(self, event: str, hook: Callable[..., None]) -> None:
+        """Unregister a callback added with add_hook."""
+        self.hooks[event].remove(hook)
+
+    def emit(self, event: str, **data: Any) -> None:
+        """Call the hooks registered for ``event``."""
+        for hook in self.hooks[event]:
+            hook(**data)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> "requests.Response":
+        """Send a request to the Accela API with the client's headers.
+
+        All resource requests go through this method. It does not raise for HTTP
+        error statuses; callers check the response with ``errors.raise_for_response``.
+        Each request is logged at DEBUG level on the 'accela' logger. When the access token is a
+        TokenProvider, a 401 response makes it fetch a new token and retry once.
+
+        Args:
+            method: HTTP method, e.g. 'GET'
+            url: The API endpoint URL
+            **kwargs: Passed through to ``requests.Session.request``, e.g. params, json, stream.
+                ``traffic_class`` sets the request's class for the client's scheduler.
+
+        Returns:
+            The Response object
+
+        Raises:
+            CircuitOpenError: If the client has a circuit breaker and the endpoint's circuit is open
+        """
+        traffic = kwargs.pop("traffic_class", None) or current_traffic_class() or self.traffic_class
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return self._request(method, url, traffic, kwargs)
+
+        circuit = (self.agency or "", self.environment or "", endpoint_template(url))
+        self._circuit_changed(circuit, breaker.before_call(circuit))
+        # Only time on the wire counts toward slow calls, not waiting for the rate limit
+        timing: Dict[str, float] = {}
+        try:
+            response = self._request(method, url, traffic, kwargs, timing)
+        except Exception:
+            self._circuit_changed(circuit, breaker.record(circuit, True, timing.get("elapsed", 0.0)))
+            raise
+        failed = response.status_code >= 500
+        self._circuit_changed(circuit, breaker.record(circuit, failed, timing.get("elapsed", 0.0)))
+        return response
+
+    def _circuit_changed(self, circuit, state: Optional[str]) -> None:
+        if state is None:
+            return
+        agency, environment, endpoint = circuit
+        log = logger.warning if state == "open" else logger.info
+        log("Circuit for %s on %s/%s is now %s", endpoint, agency, environment, state,
+            extra={"accela": {"agency": agency, "environment": environment, "endpoint": endpoint, "state": state}})
+        if self.hooks["on_circuit"]:
+            self.emit("on_circuit", agency=agency, environment=environment, endpoint=endpoint, state=state)
+
+    def _request(
+            self, method: str, url: str, traffic: str, kwargs: Dict[str, Any],
+            timing: Optional[Dict[str, float]] = None,
+    ) -> "requests.Response":
+        self._acquire_slot(traffic)
+        headers = self.headers
+        if self.hedging is not None and self.hedging.applies_to(method, url, kwargs.get("stream", False)):
+            response = self._send_hedged(method, url, headers, traffic, kwargs, timing)
+        else:
+            response = self._send(method, url, headers, kwargs, timing)
+
+        # A token can be revoked or expire early; get a new one and retry once
+        if response.status_code == 401 and isinstance(self.access_token, TokenProvider):
+            response.close()
+            if self.hooks["on_retry"]:
+                self.emit("on_retry", method=method, url=url, attempt=1, reason="401")
+            logger.info("Access token rejected for %s %s; retrying with a new token", method, endpoint_template(url))
+            self.access_token.invalidate(headers["Authorization"])
+            # The retry is a second request against the same budget
+            self._acquire_slot(traffic)
+            response = self._send(method, url, self.headers, kwargs, timing)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "%s %s -> %s",
+                method,
+                endpoint_template(url),
+                response.status_code,
+                extra={"accela": {"method": method, "url": url, "status_code": response.status_code,
+                                  "trace_id": response.headers.get("x-accela-traceId")}},
+            )
+        return response
+
+    def _acquire_slot(self, traffic: str) -> None:
+        """Wait for the scheduler or rate limiter, if any, to allow one more request."""
+        if self.scheduler is not None:
+            self.scheduler.acquire(traffic)
+        elif self.rate_limiter:
+            self.rate_limiter.acquire()
+
+    def _send(
+            self, method: str, url: str, headers: Dict[str, str], kwargs: Dict[str, Any],
+            timing: Optional[Dict[str, float]] = None,
+    ) -> "requests.Response":
+        """Send one HTTP request, emitting before_request/after_response if hooked.
+
+        If ``timing`` is given, the seconds spent in the session are stored in it as "elapsed".
+        """
+        hooked = self.hooks["before_request"] or self.hooks["after_response"]
+        if hooked:
+            self.emit("before_request", method=method, url=url)
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, headers=headers, **kwargs)
+        finally:
+            if timing is not None:
+                timing["elapsed"] = time.perf_counter() - start
+        if not hooked:
+            return response
+
+        self.emit(
+            "after_response",
+            method=method,
+            url=url,
+            status=response.status_code,
+            elapsed=time.perf_counter() - start,
+            response=response,
+        )
+        return response
+
+    def _send_hedged(
+            self, method: str, url: str, headers: Dict[str, str], traffic: str, kwargs: Dict[str, Any],
+            timing: Optional[Dict[str, float]] = None,
+    ) -> "requests.Response":
+        """Send a request and, if it is slower than the hedging policy allows, a duplicate.
+
+        The first successful response is returned; the other is closed when it arrives.
+        ``timing`` receives the elapsed time of the attempt whose response is returned.
+        """
+        policy = self.hedging
+        policy.count_request()
+
+        def attempt() -> Tuple["requests.Response", float]:
+            attempt_timing: Dict[str, float] = {}
+            response = self._send(method, url, headers, kwargs, attempt_timing)
+            policy.observe(url, attempt_timing["elapsed"])
+            return response, attempt_timing["elapsed"]
+
+        def result(future: "Future[Tuple[requests.Response, float]]") -> "requests.Response":
+            response, elapsed = future.result()
+            if timing is not None:
+                timing["elapsed"] = elapsed
+            return response
+
+        delay = policy.delay(url)
+        if delay is None:
+            response, elapsed = attempt()
+            if timing is not None:
+                timing["elapsed"] = elapsed
+            return response
+
+        primary = policy.executor.submit(attempt)
+        done, _ = wait([primary], timeout=delay)
+        # A hedge must also fit in the rate budget without waiting
+        if self.scheduler is not None:
+            acquire = partial(self.scheduler.try_acquire, traffic)
+        else:
+            acquire = self.rate_limiter.try_acquire if self.rate_limiter else None
+        if done or not policy.try_hedge(acquire):
+            return result(primary)
+
+        if self.hooks["on_retry"]:
+            self.emit("on_retry", method=method, url=url, attempt=1, reason="hedge")
+        hedge = policy.executor.submit(attempt)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.add_done_callback(_close_response)
+                    if future is hedge:
+                        policy.record_win()
+                    return result(future)
+        # Both attempts failed; report the original's error
+        return result(primary)
+
     @property
     def headers(self) -> Dict[str, str]:
         """Default headers for Accela API requests."""
+        token = self.access_token
         headers = {
-            "Authorization": self.access_token,
+            "Authorization": token.get() if isinstance(token, TokenProvider) else token,
         }
         
         # Only include agency and environment headers if they are provided
@@ -113,3 +407,10 @@ class AccelaClient:
             headers["x-accela-environment"] = self.environment
             
         return headers
+
+
+def _close_response(future: Future) -> None:
+    """Release the connection of a hedged attempt whose response is not used."""
+    if future.exception() is None:
+        response, _ = future.result()
+        response.close()
@@ -0,0 +1,303 @@
+import contextlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+import requests
+
+from .circuit_breaker import CircuitOpenError
+from .resources.documents import Document
+from .store import DocumentStore
+from .util.concurrency import bounded_map
+from .util.rate_limit import TokenBucket
+
+
+@dataclass
+class DownloadProgress:
+    """Progress event for a single file, passed to the ``on_progress`` callback."""
+
+    document_id: int
+    file_name: Optional[str]
+    bytes_downloaded: int
+    total_bytes: Optional[int]
+    done: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of downloading a single document, or of listing a record's documents.
+
+    ``cached`` is True when the document was served from a DocumentStore without a transfer.
+    """
+
+    document_id: Optional[int]
+    record_id: Optional[str]
+    file_name: Optional[str] = None
+    path: Optional[str] = None
+    size: int = 0
+    elapsed: float = 0.0
+    cached: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class DownloadManifest:
+    """Results and failures of a bulk download run."""
+
+    results: List[DownloadResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> List[DownloadResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> List[DownloadResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def cached(self) -> List[DownloadResult]:
+        return [result for result in self.results if result.cached]
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes actually transferred; documents served from a DocumentStore are not counted."""
+        return sum(result.size for result in self.results if not result.cached)
+
+    def to_dict(self) -> dict:
+        return {
+            "succeeded": len(self.succeeded),
+            "failed": len(self.failed),
+            "cached": len(self.cached),
+            "total_bytes": self.total_bytes,
+            "results": [asdict(result) for result in self.results],
+        }
+
+    def to_json(self, pretty: bool = False) -> str:
+        indent = 2 if pretty else None
+        return json.dumps(self.to_dict(), indent=indent, default=str)
+
+    def write(self, path: Union[str, Path]) -> None:
+        """Write the manifest as JSON to ``path``."""
+        Path(path).write_text(self.to_json(pretty=True))
+
+    def __str__(self) -> str:
+        return (
+            f"DownloadManifest(succeeded={len(self.succeeded)}, failed={len(self.failed)}, "
+            f"cached={len(self.cached)}, total_bytes={self.total_bytes})"
+        )
+
+
+class BulkDownloader:
+    """Download many documents concurrently under a shared concurrency and bandwidth cap.
+
+    Files are written to ``<directory>/<record id>/<document id>-<file name>``. A failed
+    document is recorded in the manifest and does not stop the run.
+
+    Example:
+        downloader = BulkDownloader(client, "archive", max_workers=16, max_bytes_per_second=50_000_000)
+        manifest = downloader.download_records(["REC-1", "REC-2"])
+        manifest.write("archive/manifest.json")
+    """
+
+    def __init__(
+            self,
+            client,
+            directory: Union[str, Path],
+            max_workers: int = 8,
+            max_bytes_per_second: Optional[float] = None,
+            chunk_size: int = 64 * 1024,
+            on_progress: Optional[Callable[[DownloadProgress], None]] = None,
+            store: Optional[DocumentStore] = None,
+    ):
+        """
+        Initialize the downloader.
+
+        Args:
+            client: AccelaClient instance
+            directory: Root directory to write files into
+            max_workers: Maximum number of concurrent downloads
+            max_bytes_per_second: Optional global bandwidth cap shared by all workers
+            chunk_size: Size of the chunks read from each response
+            on_progress: Optional callback receiving a DownloadProgress after every chunk.
+                Called from worker threads, so it must be thread-safe.
+            store: Optional DocumentStore; documents whose metadata matches a stored blob
+                are copied from the store instead of downloaded, and new downloads are added to it
+        """
+        self.client = client
+        self.directory = Path(directory)
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.store = store
+        self._bandwidth = TokenBucket(max_bytes_per_second) if max_bytes_per_second else None
+        self._locks_guard = threading.Lock()
+        # document id -> [lock, number of downloads using it]; dropped when unused
+        self._document_locks: Dict[int, list] = {}
+
+    def download_records(self, record_ids: Iterable[str]) -> DownloadManifest:
+        """Download every document attached to each of the given records.
+
+        Args:
+            record_ids: IDs of the records whose documents should be downloaded
+
+        Returns:
+            DownloadManifest with one entry per document, plus one per record whose
+            documents could not be listed
+        """
+        manifest = DownloadManifest()
+        self._run(self._iter_record_documents(record_ids, manifest), manifest)
+        return manifest
+
+    def download_documents(
+            self, documents: Iterable[Document], record_id: Optional[str] = None
+    ) -> DownloadManifest:
+        """Download the given documents.
+
+        Args:
+            documents: Document objects, e.g. from ``record_documents.list(...).auto_paging_iter()``
+            record_id: Optional record ID used as the target folder; defaults to each
+                document's ``entity_id``
+
+        Returns:
+            DownloadManifest with one entry per document
+        """
+        manifest = DownloadManifest()
+        self._run(((record_id, document) for document in documents), manifest)
+        return manifest
+
+    def _iter_record_documents(
+            self, record_ids: Iterable[str], manifest: DownloadManifest
+    ) -> Iterator[Tuple[Optional[str], Document]]:
+        """List the documents of many records concurrently, yielding (record_id, document)."""
+
+        def list_documents(record_id: str) -> Union[DownloadResult, List[Document]]:
+            try:
+                return list(self.client.record_documents.list(record_id).auto_paging_iter())
+            except (requests.RequestException, CircuitOpenError) as e:
+                return DownloadResult(document_id=None, record_id=record_id, error=_describe(e))
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers // 2)) as pool:
+            for record_id, listed in bounded_map(pool, list_documents, record_ids, self.max_workers):
+                if isinstance(listed, DownloadResult):
+                    manifest.results.append(listed)
+                    continue
+                for document in listed:
+                    yield record_id, document
+
+    def _run(
+            self, items: Iterable[Tuple[Optional[str], Document]], manifest: DownloadManifest
+    ) -> None:
+        """Download items with at most ``max_workers`` in flight, appending results to the manifest."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending: Set[Future] = set()
+            for record_id, document in items:
+                if len(pending) >= self.max_workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    manifest.results.extend(future.result() for future in done)
+                pending.add(pool.submit(self._download_one, record_id, document))
+
+            done, _ = wait(pending)
+            manifest.results.extend(future.result() for future in done)
+
+    def _path_for(self, record_id: Optional[str], document: Document) -> Path:
+        folder = _safe_name(record_id or document.entity_id or "documents")
+        file_name = _safe_name(document.file_name or "document")
+        return self.directory / folder / f"{document.id}-{file_name}"
+
+    def _report(self, result: DownloadResult, total_bytes: Optional[int], done: bool = False) -> None:
+        if self.on_progress:
+            self.on_progress(
+                DownloadProgress(
+                    document_id=result.document_id,
+                    file_name=result.file_name,
+                    bytes_downloaded=result.size,
+                    total_bytes=total_bytes,
+                    done=done,
+                    error=result.error,
+                )
+            )
+
+    def _stream(self, response, result: DownloadResult, total_bytes: Optional[int]) -> Iterator[bytes]:
+        """Yield a response's chunks, applying the bandwidth cap and reporting progress."""
+        for chunk in response.iter_content(chunk_size=self.chunk_size):
+            if self._bandwidth:
+                self._bandwidth.acquire(len(chunk))
+            result.size += len(chunk)
+            self._report(result, total_bytes)
+            yield chunk
+
+    @contextlib.contextmanager
+    def _document_lock(self, document_id: int) -> Iterator[None]:
+        """Hold a per-document lock, kept only while downloads of the document are running."""
+        with self._locks_guard:
+            entry = self._document_locks.get(document_id)
+            if entry is None:
+                entry = self._document_locks[document_id] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._locks_guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._document_locks[document_id]
+
+    def _download_one(self, record_id: Optional[str], document: Document) -> DownloadResult:
+        """Stream a single document to disk, writing to a temporary file first."""
+        start = time.monotonic()
+        result = DownloadResult(
+            document_id=document.id, record_id=record_id, file_name=document.file_name
+        )
+        path = self._path_for(record_id, document)
+        partial = path.with_name(path.name + ".part")
+
+        try:
+            if self.store is not None:
+                # Serialize per document so a document linked to several records is
+                # transferred once and then served from the store
+                with self._document_lock(document.id):
+                    digest = self.store.lookup(document)
+                    if digest is None:
+                        with self.client.documents.download(document.id, stream=True) as response:
+                            digest = self.store.put(document, self._stream(response, result, document.size))
+                    else:
+                        result.cached = True
+                self.store.materialize(digest, path)
+                if result.cached:
+                    result.size = path.stat().st_size
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                response = self.client.documents.download(document.id, stream=True)
+                with response, open(partial, "wb") as f:
+                    for chunk in self._stream(response, result, document.size):
+                        f.write(chunk)
+                os.replace(partial, path)
+            result.path = str(path)
+        except (requests.RequestException, CircuitOpenError, OSError) as e:
+            partial.unlink(missing_ok=True)
+            result.error = _describe(e)
+
+        result.elapsed = time.monotonic() - start
+        self._report(result, document.size, done=True)
+        return result
+
+
+def _safe_name(name: str) -> str:
+    """Make a string safe to use as a single path component."""
+    return re.sub(r"[^\w.\- ]", "_", str(name)).strip(". ") or "_"
+
+
+def _describe(error: Exception) -> str:
+    return f"{type(error).__name__}: {error}"
@@ -0,0 +1,196 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Type
+
+import requests
+
+from .util.endpoints import endpoint_template
+
+logger = logging.getLogger("accela")
+
+
+@dataclass
+class RateLimitInfo:
+    """Rate-limit headers reported by Accela on a response."""
+
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset: Optional[int] = None
+
+    @classmethod
+    def from_headers(cls, headers) -> "RateLimitInfo":
+        def to_int(value: Optional[str]) -> Optional[int]:
+            try:
+                return int(value) if value is not None else None
+            except ValueError:
+                return None
+
+        return cls(
+            limit=to_int(headers.get("x-ratelimit-limit")),
+            remaining=to_int(headers.get("x-ratelimit-remaining")),
+            reset=to_int(headers.get("x-ratelimit-reset")),
+        )
+
+
+class AccelaError(Exception):
+    """Base class for errors raised by this SDK."""
+
+
+class AccelaAPIError(AccelaError, requests.HTTPError):
+    """The Accela API returned an error status.
+
+    Subclasses ``requests.HTTPError``, so existing ``except requests.HTTPError``
+    handlers keep working.
+
+    Attributes:
+        status_code: HTTP status code
+        method: HTTP method of the request
+        url: Request URL
+        trace_id: The ``x-accela-traceId`` header, for Accela support
+        message: The ``x-accela-resp-message`` header, or the body's message
+        body: Decoded JSON body, or the text body if it is not JSON
+        rate_limit: Rate-limit headers of the response
+    """
+
+    def __init__(self, response: requests.Response):
+        self.status_code = response.status_code
+        self.method = response.request.method if response.request is not None else None
+        self.url = response.url
+        self.trace_id = response.headers.get("x-accela-traceId")
+        self.rate_limit = RateLimitInfo.from_headers(response.headers)
+        try:
+            self.body: Any = response.json()
+        except ValueError:
+            self.body = response.text[:2000]
+        body_message = self.body.get("message") if isinstance(self.body, dict) else None
+        self.message = response.headers.get("x-accela-resp-message") or body_message
+
+        description = f"{self.status_code} {response.reason or ''} for {self.method} {self.url}".replace("  ", " ")
+        if self.trace_id:
+            description += f" (trace id {self.trace_id})"
+        if self.message:
+            description += f": {self.message}"
+        super().__init__(description, response=response)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Structured fields describing the error, as attached to log records."""
+        return {
+            "status_code": self.status_code,
+            "method": self.method,
+            "url": self.url,
+            "endpoint": endpoint_template(self.url) if self.url else None,
+            "trace_id": self.trace_id,
+            "message": self.message,
+            "ratelimit_limit": self.rate_limit.limit,
+            "ratelimit_remaining": self.rate_limit.remaining,
+            "ratelimit_reset": self.rate_limit.reset,
+        }
+
+
+class BadRequestError(AccelaAPIError):
+    """400 Bad Request."""
+
+
+class AuthenticationError(AccelaAPIError):
+    """401 Unauthorized: the access token is missing, invalid or expired."""
+
+
+class PermissionDeniedError(AccelaAPIError):
+    """403 Forbidden."""
+
+
+class NotFoundError(AccelaAPIError):
+    """404 Not Found."""
+
+
+class RateLimitError(AccelaAPIError):
+    """429 Too Many Requests."""
+
+
+class ServerError(AccelaAPIError):
+    """5xx error on the Accela side."""
+
+
+_STATUS_ERRORS: Dict[int, Type[AccelaAPIError]] = {
+    400: BadRequestError,
+    401: AuthenticationError,
+    403: PermissionDeniedError,
+    404: NotFoundError,
+    429: RateLimitError,
+}
+
+
+def error_for_response(response: requests.Response) -> AccelaAPIError:
+    """Build the AccelaAPIError subclass matching a failed response's status."""
+    if response.status_code >= 500:
+        return ServerError(response)
+    return _STATUS_ERRORS.get(response.status_code, AccelaAPIError)(response)
+
+
+class LogSampler:
+    """Limits how often the same kind of failure is logged.
+
+    Allows ``burst`` log records per key in each ``interval`` seconds and counts the
+    rest, so a failure storm produces a bounded number of records instead of one per
+    request. The suppressed count is reported on the next record that is let through.
+    """
+
+    def __init__(self, burst: int = 10, interval: float = 60.0):
+        self.burst = burst
+        self.interval = interval
+        self._windows: Dict[Tuple, list] = {}  # key -> [window start, logged, suppressed]
+        self._lock = threading.Lock()
+
+    def allow(self, key: Tuple) -> Tuple[bool, int]:
+        """Decide whether to log a record for ``key``.
+
+        Returns:
+            (allowed, number of records suppressed since the last allowed one)
+        """
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+                return True, suppressed
+            if window[1] < self.burst:
+                window[1] += 1
+                suppressed, window[2] = window[2], 0
+                return True, suppressed
+            window[2] += 1
+            return False, 0
+
+
+# Shared by all clients; replace or adjust to change how failures are sampled
+error_log_sampler = LogSampler()
+
+
+def raise_for_response(response: requests.Response) -> None:
+    """Raise an AccelaAPIError for a 4xx/5xx response, logging it with sampling.
+
+    The error is logged as a WARNING on the 'accela' logger, with its fields in the
+    record's ``accela`` attribute for structured log formatters.
+
+    Raises:
+        AccelaAPIError: If the response has an error status
+    """
+    if response.status_code < 400:
+        return
+
+    error = error_for_response(response)
+    fields = error.to_dict()
+    allowed, suppressed = error_log_sampler.allow((fields["method"], fields["endpoint"], error.status_code))
+    if allowed and logger.isEnabledFor(logging.WARNING):
+        fields["suppressed"] = suppressed
+        logger.warning(
+            "Accela API request failed: %s %s -> %s%s",
+            fields["method"],
+            fields["endpoint"],
+            error.status_code,
+            f" ({suppressed} similar failures suppressed)" if suppressed else "",
+            extra={"accela": fields},
+        )
+    raise error
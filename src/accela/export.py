@@ -0,0 +1,462 @@
+import contextlib
+import csv
+import dataclasses
+import gzip
+import io
+import itertools
+import json
+import os
+import sys
+import typing
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+from zoneinfo import ZoneInfo
+
+from .resources.base import ResourceModel
+
+# Column kinds derived from model fields
+_STRING, _INT, _FLOAT, _BOOL, _DATETIME, _JSON = "string", "int", "float", "bool", "datetime", "json"
+
+
+def _require_pyarrow():
+    """Import pyarrow, which is only needed for Arrow/Parquet output."""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "Arrow/Parquet export requires pyarrow. Install it with: uv add \"accela[arrow]\""
+        ) from e
+    return pyarrow
+
+
+def _require_zstandard():
+    """Import zstandard, which is only needed for zstd-compressed text output."""
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "zstd compression requires zstandard. Install it with: uv add \"accela[zstd]\""
+        ) from e
+    return zstandard
+
+
+def model_columns(model_class: Type[ResourceModel]) -> List[Tuple[str, str]]:
+    """Describe a model's exportable columns as (python field name, kind) pairs.
+
+    Kinds come from the model's DATETIME_FIELDS and BOOL_FIELDS, then from the dataclass
+    field types. Dict and list fields become JSON strings. ``raw_json`` is excluded.
+
+    Args:
+        model_class: A ResourceModel dataclass, e.g. Record
+
+    Returns:
+        List of (field name, kind) pairs in dataclass field order
+    """
+    api_names = {python_field: api_field for api_field, python_field in model_class.FIELD_MAPPING.items()}
+    hints = typing.get_type_hints(model_class)
+    columns = []
+    for f in dataclasses.fields(model_class):
+        if f.name == "raw_json":
+            continue
+        api_name = api_names.get(f.name)
+        if api_name in model_class.DATETIME_FIELDS:
+            kind = _DATETIME
+        elif api_name in model_class.BOOL_FIELDS:
+            kind = _BOOL
+        else:
+            kind = _kind_of(hints.get(f.name, Any))
+        columns.append((f.name, kind))
+    return columns
+
+
+def _kind_of(hint: Any) -> str:
+    """Map a field type hint such as Optional[int] to a column kind."""
+    args = [arg for arg in typing.get_args(hint) if arg is not type(None)]
+    if typing.get_origin(hint) is Union and len(args) == 1:
+        hint = args[0]
+    if hint is bool:
+        return _BOOL
+    if hint is int:
+        return _INT
+    if hint is float:
+        return _FLOAT
+    if hint is datetime:
+        return _DATETIME
+    if hint is str:
+        return _STRING
+    return _JSON
+
+
+def _converter(kind: str) -> Callable[[Any], Any]:
+    """Return a function normalizing a model value for a column of the given kind.
+
+    Values that cannot be coerced to a numeric column's type are exported as null.
+    """
+
+    def to_number(cast):
+        def convert(value):
+            if value is None:
+                return None
+            try:
+                return cast(value)
+            except (TypeError, ValueError):
+                return None
+
+        return convert
+
+    if kind == _INT:
+        return to_number(int)
+    if kind == _FLOAT:
+        return to_number(float)
+    if kind == _STRING:
+        return lambda value: value if value is None or isinstance(value, str) else str(value)
+    if kind == _JSON:
+        return lambda value: None if value is None else json.dumps(value, default=str)
+    return lambda value: value
+
+
+def _text_columns(model_class: Type[ResourceModel], nested_json: bool) -> List[Tuple[str, Callable[[Any], Any]]]:
+    """(field name, converter) pairs shared by the text formats; datetimes become ISO strings.
+
+    With ``nested_json`` dict and list fields are kept as they are, for NDJSON, instead
+    of being serialized to JSON strings.
+    """
+    columns = []
+    for name, kind in model_columns(model_class):
+        if kind == _DATETIME:
+            convert = lambda value: value.isoformat() if value else None
+        elif kind == _JSON and nested_json:
+            convert = lambda value: value
+        else:
+            convert = _converter(kind)
+        columns.append((name, convert))
+    return columns
+
+
+def arrow_schema(model_class: Type[ResourceModel], timezone: Optional[ZoneInfo] = None):
+    """Build a pyarrow schema for a model.
+
+    Args:
+        model_class: A ResourceModel dataclass, e.g. Record
+        timezone: Timezone of datetime columns; pass the client's timezone when it is set
+
+    Returns:
+        pyarrow.Schema
+    """
+    pa = _require_pyarrow()
+    types = {
+        _STRING: pa.string(),
+        _INT: pa.int64(),
+        _FLOAT: pa.float64(),
+        _BOOL: pa.bool_(),
+        _DATETIME: pa.timestamp("us", tz=str(timezone) if timezone else None),
+        _JSON: pa.string(),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in model_columns(model_class)])
+
+
+def iter_record_batches(
+        items: Iterable[ResourceModel],
+        model_class: Optional[Type[ResourceModel]] = None,
+        batch_size: int = 10_000,
+        timezone: Optional[ZoneInfo] = None,
+) -> Iterator[Any]:
+    """Convert a stream of models into pyarrow RecordBatches of at most ``batch_size`` rows.
+
+    Only one batch is held in memory at a time, so ``items`` can be an
+    ``auto_paging_iter()`` over any number of pages.
+
+    Args:
+        items: Models to convert
+        model_class: Model class of the items, inferred from the first item if omitted
+        batch_size: Maximum rows per batch
+        timezone: Timezone of datetime columns
+
+    Yields:
+        pyarrow.RecordBatch
+    """
+    pa = _require_pyarrow()
+    items = iter(items)
+    if model_class is None:
+        first = next(items, None)
+        if first is None:
+            return
+        model_class = type(first)
+        items = itertools.chain([first], items)
+
+    schema = arrow_schema(model_class, timezone)
+    columns = [(name, _converter(kind)) for name, kind in model_columns(model_class)]
+
+    while True:
+        batch = list(itertools.islice(items, batch_size))
+        if not batch:
+            return
+        data: Dict[str, list] = {
+            name: [convert(getattr(item, name)) for item in batch] for name, convert in columns
+        }
+        yield pa.RecordBatch.from_pydict(data, schema=schema)
+
+
+def write_parquet(
+        items: Iterable[ResourceModel],
+        path: Union[str, Path],
+        model_class: Optional[Type[ResourceModel]] = None,
+        batch_size: int = 10_000,
+        timezone: Optional[ZoneInfo] = None,
+        compression: str = "zstd",
+) -> int:
+    """Stream models into a Parquet file, one row group per batch.
+
+    Args:
+        items: Models to write, e.g. ``client.records.list().auto_paging_iter()``
+        path: Output file
+        model_class: Model class of the items, inferred from the first item if omitted
+        batch_size: Rows per row group
+        timezone: Timezone of datetime columns
+        compression: Parquet compression codec
+
+    Returns:
+        Number of rows written
+    """
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    rows = 0
+    writer = None
+    try:
+        for batch in iter_record_batches(items, model_class, batch_size, timezone):
+            if writer is None:
+                writer = pq.ParquetWriter(str(path), batch.schema, compression=compression)
+            writer.write_batch(batch)
+            rows += batch.num_rows
+        if writer is None and model_class is not None:
+            writer = pq.ParquetWriter(str(path), arrow_schema(model_class, timezone), compression=compression)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def write_arrow(
+        items: Iterable[ResourceModel],
+        path: Union[str, Path],
+        model_class: Optional[Type[ResourceModel]] = None,
+        batch_size: int = 10_000,
+        timezone: Optional[ZoneInfo] = None,
+) -> int:
+    """Stream models into an Arrow IPC file, one record batch per batch.
+
+    Args:
+        items: Models to write, e.g. ``client.records.list().auto_paging_iter()``
+        path: Output file
+        model_class: Model class of the items, inferred from the first item if omitted
+        batch_size: Rows per record batch
+        timezone: Timezone of datetime columns
+
+    Returns:
+        Number of rows written
+    """
+    pa = _require_pyarrow()
+
+    rows = 0
+    writer = None
+    try:
+        for batch in iter_record_batches(items, model_class, batch_size, timezone):
+            if writer is None:
+                writer = pa.ipc.new_file(str(path), batch.schema)
+            writer.write_batch(batch)
+            rows += batch.num_rows
+        if writer is None and model_class is not None:
+            writer = pa.ipc.new_file(str(path), arrow_schema(model_class, timezone))
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+Destination = Union[str, Path, IO[bytes]]
+
+
+@contextlib.contextmanager
+def _open_text(
+        destination: Destination, compression: Optional[str], buffer_size: int, append: bool = False
+) -> Iterator[Tuple[io.TextIOWrapper, Callable[[], None]]]:
+    """Open a buffered, optionally compressed text stream.
+
+    ``destination`` is a path, '-' for stdout, or a binary file object (left open).
+    The compression defaults to the path suffix: '.gz' for gzip, '.zst' for zstd.
+    With ``append`` an existing file is added to rather than replaced.
+
+    Yields the stream and a function that pushes what was written so far through the
+    compressor to the file and, for a path, fsyncs it.
+    """
+    owned = []
+    opened = None
+    if destination == "-":
+        raw = sys.stdout.buffer
+    elif isinstance(destination, (str, Path)):
+        path = Path(destination)
+        if compression is None:
+            compression = {".gz": "gzip", ".zst": "zstd"}.get(path.suffix)
+        raw = opened = open(path, "ab" if append else "wb", buffering=buffer_size)
+        owned.append(raw)
+    else:
+        raw = destination
+
+    if compression == "gzip":
+        raw = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6)
+        owned.append(raw)
+    elif compression == "zstd":
+        raw = _require_zstandard().ZstdCompressor().stream_writer(raw, closefd=False)
+        owned.append(raw)
+    elif compression is not None:
+        raise ValueError(f"Unsupported compression {compression!r}, expected 'gzip' or 'zstd'")
+
+    text = io.TextIOWrapper(io.BufferedWriter(raw, buffer_size) if owned else raw, encoding="utf-8", newline="")
+
+    def sync() -> None:
+        text.flush()
+        for stream in reversed(owned):
+            stream.flush()
+        if opened is not None:
+            os.fsync(opened.fileno())
+
+    try:
+        yield text, sync
+        text.flush()
+    finally:
+        text.detach().flush()
+        for stream in reversed(owned):
+            stream.close()
+
+
+class NdjsonWriter:
+    """Writes models as newline-delimited JSON to a stream opened by ``open_ndjson``."""
+
+    def __init__(self, out: io.TextIOWrapper, sync: Callable[[], None], raw: bool = False):
+        self.rows = 0
+        self.raw = raw
+        self._out = out
+        self._sync = sync
+        self._columns: Optional[List[Tuple[str, Callable[[Any], Any]]]] = None
+
+    def write(self, item: ResourceModel) -> None:
+        if self.raw:
+            row = item.raw_json
+        else:
+            if self._columns is None:
+                self._columns = _text_columns(type(item), nested_json=True)
+            row = {name: convert(getattr(item, name)) for name, convert in self._columns}
+        self._out.write(json.dumps(row, default=str))
+        self._out.write("\n")
+        self.rows += 1
+
+    def sync(self) -> None:
+        """Make sure every row written so far is in the file, e.g. before recording progress."""
+        self._sync()
+
+
+@contextlib.contextmanager
+def open_ndjson(
+        destination: Destination = "-",
+        compression: Optional[str] = None,
+        raw: bool = False,
+        buffer_size: int = 1024 * 1024,
+        append: bool = False,
+) -> Iterator[NdjsonWriter]:
+    """Open an NDJSON output for writing models one at a time.
+
+    Use this instead of ``write_ndjson`` when rows come from several sources or
+    progress must be recorded only once rows are on disk (see ``NdjsonWriter.sync``).
+
+    Example:
+        with open_ndjson("histories.ndjson.gz", append=True) as writer:
+            for record_id in record_ids:
+                for history in client.record_workflow_task_histories.list(record_id).auto_paging_iter():
+                    writer.write(history)
+                writer.sync()
+                mark_done(record_id)
+
+    Args:
+        destination: Output path, '-' for stdout, or a binary file object
+        compression: 'gzip' or 'zstd'; inferred from a '.gz'/'.zst' path suffix if omitted
+        raw: Write each item's original API JSON instead of its model fields
+        buffer_size: Output buffer size in bytes
+        append: Add to an existing output file instead of replacing it; compressed
+            output is added as a new gzip member or zstd frame, which readers join
+
+    Yields:
+        NdjsonWriter
+    """
+    with _open_text(destination, compression, buffer_size, append) as (out, sync):
+        yield NdjsonWriter(out, sync, raw)
+
+
+def write_ndjson(
+        items: Iterable[ResourceModel],
+        destination: Destination = "-",
+        compression: Optional[str] = None,
+        raw: bool = False,
+        buffer_size: int = 1024 * 1024,
+) -> int:
+    """Stream models to newline-delimited JSON, one object per line.
+
+    Each item is written as soon as it is produced, so ``items`` can be an
+    ``auto_paging_iter()`` over any number of pages.
+
+    Args:
+        items: Models to write, e.g. ``client.records.search(query).auto_paging_iter()``
+        destination: Output path, '-' for stdout, or a binary file object
+        compression: 'gzip' or 'zstd'; inferred from a '.gz'/'.zst' path suffix if omitted
+        raw: Write each item's original API JSON instead of its model fields
+        buffer_size: Output buffer size in bytes
+
+    Returns:
+        Number of rows written
+    """
+    with open_ndjson(destination, compression, raw, buffer_size) as writer:
+        for item in items:
+            writer.write(item)
+    return writer.rows
+
+
+def write_csv(
+        items: Iterable[ResourceModel],
+        destination: Destination = "-",
+        model_class: Optional[Type[ResourceModel]] = None,
+        compression: Optional[str] = None,
+        buffer_size: int = 1024 * 1024,
+) -> int:
+    """Stream models to CSV with a header row of the model's field names.
+
+    Datetimes are written in ISO format, and dict and list fields as JSON strings.
+
+    Args:
+        items: Models to write, e.g. ``client.records.list().auto_paging_iter()``
+        destination: Output path, '-' for stdout, or a binary file object
+        model_class: Model class of the items, inferred from the first item if omitted
+        compression: 'gzip' or 'zstd'; inferred from a '.gz'/'.zst' path suffix if omitted
+        buffer_size: Output buffer size in bytes
+
+    Returns:
+        Number of rows written
+    """
+    items = iter(items)
+    if model_class is None:
+        first = next(items, None)
+        if first is None:
+            return 0
+        model_class = type(first)
+        items = itertools.chain([first], items)
+
+    columns = _text_columns(model_class, nested_json=False)
+
+    rows = 0
+    with _open_text(destination, compression, buffer_size) as (out, _):
+        writer = csv.writer(out)
+        writer.writerow([name for name, _ in columns])
+        for item in items:
+            writer.writerow([convert(getattr(item, name)) for name, convert in columns])
+            rows += 1
+    return rows
@@ -0,0 +1,221 @@
+import bisect
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .errors import RateLimitInfo
+from .util.endpoints import endpoint_template
+
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DEFAULT_PARSE_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+CIRCUIT_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket containing it."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class MetricsRegistry:
+    """In-process metrics collected from AccelaClient instrumentation hooks.
+
+    Tracks:
+
+    - request latency per endpoint template and status
+    - bytes received and retries
+    - items parsed and parse time per model class
+    - the rate-limit headroom reported by Accela
+    - the state of circuit-breaker circuits
+
+    Nothing is collected for clients the registry is not attached to.
+
+    Example:
+        metrics = MetricsRegistry()
+        metrics.attach(client)
+        ...
+        print(metrics.to_prometheus())
+    """
+
+    def __init__(
+            self,
+            latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+            parse_buckets: Sequence[float] = DEFAULT_PARSE_BUCKETS,
+    ):
+        self.latency_buckets = latency_buckets
+        self.parse_buckets = parse_buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard everything collected so far."""
+        with self._lock:
+            self.request_latency: Dict[Labels, Histogram] = {}
+            self.response_bytes: Dict[Labels, int] = {}
+            self.retries: Dict[Labels, int] = {}
+            self.pages: Dict[Labels, int] = {}
+            self.items_parsed: Dict[Labels, int] = {}
+            self.parse_seconds: Dict[Labels, Histogram] = {}
+            self.rate_limit_remaining: Dict[Labels, float] = {}
+            self.rate_limit_limit: Dict[Labels, float] = {}
+            self.circuit_state: Dict[Labels, float] = {}
+
+    def attach(self, client) -> None:
+        """Register this registry's hooks on a client."""
+        client.add_hook("after_response", self._on_response)
+        client.add_hook("on_retry", self._on_retry)
+        client.add_hook("on_page", self._on_page)
+        client.add_hook("on_parse", self._on_parse)
+        client.add_hook("on_circuit", self._on_circuit)
+
+    def detach(self, client) -> None:
+        """Remove this registry's hooks from a client."""
+        client.remove_hook("after_response", self._on_response)
+        client.remove_hook("on_retry", self._on_retry)
+        client.remove_hook("on_page", self._on_page)
+        client.remove_hook("on_parse", self._on_parse)
+        client.remove_hook("on_circuit", self._on_circuit)
+
+    def _on_response(self, method: str, url: str, status: int, elapsed: float, response, **_: Any) -> None:
+        endpoint = endpoint_template(url)
+        labels = (("method", method), ("endpoint", endpoint), ("status", str(status)))
+        # Streamed bodies are not read here; rely on Content-Length for those
+        length = _to_int(response.headers.get("Content-Length"))
+        if length is None and getattr(response, "_content_consumed", False):
+            length = len(response.content)
+        agency = response.request.headers.get("x-accela-agency", "") if response.request is not None else ""
+        # Malformed headers must not fail the request this hook runs in; their gauges are skipped
+        rate_limit = RateLimitInfo.from_headers(response.headers)
+
+        with self._lock:
+            histogram = self.request_latency.get(labels)
+            if histogram is None:
+                histogram = self.request_latency[labels] = Histogram(self.latency_buckets)
+            histogram.observe(elapsed)
+            if length is not None:
+                key = (("endpoint", endpoint),)
+                self.response_bytes[key] = self.response_bytes.get(key, 0) + length
+
+            if rate_limit.remaining is not None:
+                self.rate_limit_remaining[(("agency", agency),)] = float(rate_limit.remaining)
+            if rate_limit.limit is not None:
+                self.rate_limit_limit[(("agency", agency),)] = float(rate_limit.limit)
+
+    def _on_retry(self, url: str, reason: str, **_: Any) -> None:
+        key = (("endpoint", endpoint_template(url)), ("reason", reason))
+        with self._lock:
+            self.retries[key] = self.retries.get(key, 0) + 1
+
+    def _on_page(self, url: str, **_: Any) -> None:
+        key = (("endpoint", endpoint_template(url)),)
+        with self._lock:
+            self.pages[key] = self.pages.get(key, 0) + 1
+
+    def _on_parse(self, stage: str, model: Optional[str], count: int, elapsed: float, **_: Any) -> None:
+        key = (("stage", stage), ("model", model or ""))
+        with self._lock:
+            histogram = self.parse_seconds.get(key)
+            if histogram is None:
+                histogram = self.parse_seconds[key] = Histogram(self.parse_buckets)
+            histogram.observe(elapsed)
+            if stage == "model":
+                self.items_parsed[key] = self.items_parsed.get(key, 0) + count
+
+    def _on_circuit(self, agency: str, environment: str, endpoint: str, state: str, **_: Any) -> None:
+        key = (("agency", agency), ("environment", environment), ("endpoint", endpoint))
+        with self._lock:
+            self.circuit_state[key] = CIRCUIT_STATE_VALUES[state]
+
+    def rate_limit_headroom(self) -> Dict[str, float]:
+        """Fraction of the rate limit still available per agency, from the latest response."""
+        with self._lock:
+            return {
+                dict(key)["agency"]: remaining / self.rate_limit_limit[key]
+                for key, remaining in self.rate_limit_remaining.items()
+                if self.rate_limit_limit.get(key)
+            }
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            _histograms(lines, "accela_request_duration_seconds", "Request latency by endpoint and status.",
+                        self.request_latency)
+            _counters(lines, "accela_response_bytes_total", "Response bytes received.", self.response_bytes)
+            _counters(lines, "accela_retries_total", "Retried requests.", self.retries)
+            _counters(lines, "accela_pages_total", "List pages fetched.", self.pages)
+            _counters(lines, "accela_items_parsed_total", "Items hydrated into models.", self.items_parsed)
+            _histograms(lines, "accela_parse_duration_seconds", "JSON decode and model hydration time.",
+                        self.parse_seconds)
+            _gauges(lines, "accela_ratelimit_remaining", "Latest x-ratelimit-remaining.", self.rate_limit_remaining)
+            _gauges(lines, "accela_ratelimit_limit", "Latest x-ratelimit-limit.", self.rate_limit_limit)
+            _gauges(lines, "accela_circuit_state", "Circuit state: 0 closed, 1 half-open, 2 open.",
+                    self.circuit_state)
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _counters(lines: List[str], name: str, help_text: str, values: Dict[Labels, int]) -> None:
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+    lines += [f"{name}{_format_labels(labels)} {value}" for labels, value in values.items()]
+
+
+def _gauges(lines: List[str], name: str, help_text: str, values: Dict[Labels, float]) -> None:
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    lines += [f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in values.items()]
+
+
+def _histograms(lines: List[str], name: str, help_text: str, values: Dict[Labels, Histogram]) -> None:
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, histogram in values.items():
+        cumulative = 0
+        for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels(labels, (('le', _format_value(bound)),))} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+
+def _to_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
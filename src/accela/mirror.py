@@ -0,0 +1,266 @@
+import json
+import sqlite3
+import threading
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+from .resources.base import ResourceModel
+from .resources.record_addresses import RecordAddress
+from .resources.record_parcels import RecordParcel
+from .resources.record_workflow_task_histories import RecordWorkflowTaskHistory
+from .resources.record_workflows import RecordWorkflowTask
+from .resources.records import Record
+
+
+class RecordMirror:
+    """Local SQLite mirror of records and their sub-resources.
+
+    Records are stored with their raw JSON plus indexed columns for the filters
+    supported by ``Records.list``, so the same queries can be answered locally.
+    Query methods rebuild the usual model objects with ``from_json``.
+
+    Example:
+        mirror = RecordMirror("records.sqlite3", client)
+        mirror.add_records(client.records.list(module="Building").auto_paging_iter())
+        mirror.refresh_sub_resources("REC-1")
+        pending = mirror.records(status="Pending", opened_date_from=date(2024, 1, 1))
+    """
+
+    # Indexed columns: column name -> function extracting the value from a Record.
+    # Dates are stored as UTC ISO strings so that they compare correctly as text.
+    RECORD_COLUMNS = {
+        "custom_id": lambda r: r.custom_id,
+        "type": lambda r: _value(r.type),
+        "module": lambda r: r.module,
+        "status": lambda r: _value(r.status),
+        "record_class": lambda r: r.record_class,
+        "assigned_to_department": lambda r: r.assigned_to_department,
+        "assigned_user": lambda r: r.assigned_user,
+        "completed_by_department": lambda r: r.completed_by_department,
+        "completed_by_user": lambda r: r.completed_by_user,
+        "closed_by_department": lambda r: r.closed_by_department,
+        "closed_by_user": lambda r: r.closed_by_user,
+        "opened_date": lambda r: r.opened_date,
+        "assigned_date": lambda r: r.assigned_date,
+        "completed_date": lambda r: r.complete_date,
+        "status_date": lambda r: r.status_date,
+        "closed_date": lambda r: r.closed_date,
+        "update_date": lambda r: r.update_date,
+    }
+
+    # Sub-resource model -> (table name, client resource attribute)
+    SUB_RESOURCES: Dict[Type[ResourceModel], Tuple[str, str]] = {
+        RecordAddress: ("record_addresses", "record_addresses"),
+        RecordParcel: ("record_parcels", "record_parcels"),
+        RecordWorkflowTask: ("record_workflow_tasks", "record_workflow_tasks"),
+        RecordWorkflowTaskHistory: ("record_workflow_task_histories", "record_workflow_task_histories"),
+    }
+
+    def __init__(self, path: Union[str, Path], client=None):
+        """
+        Open (or create) a mirror database.
+
+        Args:
+            path: SQLite database file, or ':memory:'
+            client: Optional AccelaClient, used for its timezone when rebuilding models and
+                comparing dates, and by refresh_sub_resources
+        """
+        self.client = client
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        columns = ", ".join(f"{name} TEXT" for name in self.RECORD_COLUMNS)
+        with self._db:
+            self._db.execute(f"CREATE TABLE IF NOT EXISTS records (id TEXT PRIMARY KEY, {columns}, raw_json TEXT NOT NULL)")
+            for name in self.RECORD_COLUMNS:
+                self._db.execute(f"CREATE INDEX IF NOT EXISTS records_{name} ON records ({name})")
+            for table, _ in self.SUB_RESOURCES.values():
+                # Keyed on position: history entries of one record can share an id
+                self._db.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    f"record_id TEXT NOT NULL, id TEXT NOT NULL, position INTEGER NOT NULL, raw_json TEXT NOT NULL, "
+                    f"PRIMARY KEY (record_id, position))"
+                )
+                self._db.execute(f"CREATE INDEX IF NOT EXISTS {table}_id ON {table} (id)")
+
+    def add_records(self, records: Iterable[Record], batch_size: int = 500) -> int:
+        """Insert or replace records.
+
+        Args:
+            records: Records to store, e.g. ``client.records.list().auto_paging_iter()``
+            batch_size: Number of rows written per transaction
+
+        Returns:
+            Number of records written
+        """
+        placeholders = ", ".join("?" for _ in range(len(self.RECORD_COLUMNS) + 2))
+        sql = f"INSERT OR REPLACE INTO records (id, {', '.join(self.RECORD_COLUMNS)}, raw_json) VALUES ({placeholders})"
+
+        count = 0
+        batch: List[tuple] = []
+        for record in records:
+            values = [self._column_value(extract(record)) for extract in self.RECORD_COLUMNS.values()]
+            batch.append((record.id, *values, json.dumps(record.raw_json)))
+            if len(batch) >= batch_size:
+                count += self._write(sql, batch)
+                batch = []
+        if batch:
+            count += self._write(sql, batch)
+        return count
+
+    def set_sub_resources(self, record_id: str, model_class: Type[ResourceModel], items: Iterable[ResourceModel]) -> int:
+        """Replace all stored items of one sub-resource type for a record.
+
+        Args:
+            record_id: The record the items belong to
+            model_class: One of RecordAddress, RecordParcel, RecordWorkflowTask, RecordWorkflowTaskHistory
+            items: The record's complete list of items of that type
+
+        Returns:
+            Number of items written
+        """
+        table = self._table(model_class)
+        rows = [
+            (record_id, str(item.id), position, json.dumps(item.raw_json))
+            for position, item in enumerate(items)
+        ]
+        with self._lock, self._db:
+            self._db.execute(f"DELETE FROM {table} WHERE record_id = ?", (record_id,))
+            self._db.executemany(f"INSERT INTO {table} VALUES (?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def refresh_sub_resources(self, record_id: str) -> None:
+        """Fetch and store the addresses, parcels, workflow tasks and histories of a record."""
+        if self.client is None:
+            raise ValueError("RecordMirror needs a client to fetch sub-resources")
+        for model_class, (_, resource_name) in self.SUB_RESOURCES.items():
+            resource = getattr(self.client, resource_name)
+            self.set_sub_resources(record_id, model_class, resource.list(record_id).auto_paging_iter())
+
+    def records(
+            self,
+            limit: Optional[int] = None,
+            offset: int = 0,
+            order_by: str = "id",
+            **filters: Any,
+    ) -> List[Record]:
+        """Query mirrored records using the same filter names as ``Records.list``.
+
+        Equality filters: type, custom_id, module, status, record_class, assigned_to_department,
+        assigned_user, completed_by_department, completed_by_user, closed_by_department,
+        closed_by_user. Range filters: <date>_from / <date>_to for opened_date, assigned_date,
+        completed_date, status_date, closed_date and update_date.
+
+        Args:
+            limit: Maximum number of records to return, default all
+            offset: Number of matching records to skip
+            order_by: Column to sort by, 'id' or any indexed column
+            **filters: Filters as accepted by ``Records.list``
+
+        Returns:
+            List of Record objects
+        """
+        if order_by != "id" and order_by not in self.RECORD_COLUMNS:
+            raise ValueError(f"Cannot order by {order_by!r}")
+
+        where, args = self._where(filters)
+        sql = f"SELECT raw_json FROM records{where} ORDER BY {order_by} LIMIT ? OFFSET ?"
+        args += [limit if limit is not None else -1, offset]
+
+        return [Record.from_json(json.loads(row[0]), self.client) for row in self._query(sql, args)]
+
+    def retrieve(self, record_id: str) -> Optional[Record]:
+        """Return a mirrored record by ID, or None if it is not mirrored."""
+        rows = self._query("SELECT raw_json FROM records WHERE id = ?", [record_id])
+        return Record.from_json(json.loads(rows[0][0]), self.client) if rows else None
+
+    def count(self, **filters: Any) -> int:
+        """Number of mirrored records matching the given ``records`` filters."""
+        where, args = self._where(filters)
+        return self._query(f"SELECT COUNT(*) FROM records{where}", args)[0][0]
+
+    def addresses(self, record_id: str) -> List[RecordAddress]:
+        return self._sub_resources(record_id, RecordAddress)
+
+    def parcels(self, record_id: str) -> List[RecordParcel]:
+        return self._sub_resources(record_id, RecordParcel)
+
+    def workflow_tasks(self, record_id: str) -> List[RecordWorkflowTask]:
+        return self._sub_resources(record_id, RecordWorkflowTask)
+
+    def workflow_task_histories(self, record_id: str) -> List[RecordWorkflowTaskHistory]:
+        return self._sub_resources(record_id, RecordWorkflowTaskHistory)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "RecordMirror":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _where(self, filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        """Build a WHERE clause from ``Records.list`` style filters."""
+        clauses: List[str] = []
+        args: List[Any] = []
+        for key, value in filters.items():
+            if value is None:
+                continue
+            if key in self.RECORD_COLUMNS and not key.endswith("_date"):
+                clauses.append(f"{key} = ?")
+                args.append(value)
+            elif key.endswith("_from") and key[:-5] in self.RECORD_COLUMNS:
+                clauses.append(f"{key[:-5]} >= ?")
+                args.append(self._format_date(value))
+            elif key.endswith("_to") and key[:-3] in self.RECORD_COLUMNS:
+                clauses.append(f"{key[:-3]} <= ?")
+                args.append(self._format_date(value))
+            else:
+                raise ValueError(f"Unsupported filter {key!r}")
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    def _column_value(self, value: Any) -> Any:
+        return self._format_date(value) if isinstance(value, date) else value
+
+    def _format_date(self, value: Optional[Union[date, datetime]]) -> Optional[str]:
+        """Format a date as UTC; naive values are in the client's timezone, or UTC without one."""
+        if value is None:
+            return None
+        if isinstance(value, date) and not isinstance(value, datetime):
+            value = datetime.combine(value, datetime.min.time())
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=getattr(self.client, "timezone", None) or timezone.utc)
+        return value.astimezone(timezone.utc).isoformat()
+
+    def _sub_resources(self, record_id: str, model_class: Type[ResourceModel]) -> List[Any]:
+        rows = self._query(
+            f"SELECT raw_json FROM {self._table(model_class)} WHERE record_id = ? ORDER BY position",
+            [record_id],
+        )
+        return [model_class.from_json(json.loads(row[0]), self.client) for row in rows]
+
+    def _table(self, model_class: Type[ResourceModel]) -> str:
+        if model_class not in self.SUB_RESOURCES:
+            raise ValueError(f"{model_class.__name__} is not a mirrored sub-resource")
+        return self.SUB_RESOURCES[model_class][0]
+
+    def _write(self, sql: str, rows: List[tuple]) -> int:
+        with self._lock, self._db:
+            self._db.executemany(sql, rows)
+        return len(rows)
+
+    def _query(self, sql: str, args: List[Any]) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+
+def _value(obj: Optional[Dict[str, Any]]) -> Optional[str]:
+    """The 'value' of a snake_cased Accela {value, text} object."""
+    return obj.get("value") if obj else None
+
@@ -0,0 +1,366 @@
+import asyncio
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+_DONE = object()
+# How often blocked workers check whether the pipeline was stopped
+_POLL_SECONDS = 0.1
+
+
+@dataclass
+class StageStats:
+    """Counters for one pipeline stage."""
+
+    name: str
+    workers: int
+    capacity: int  # size of the queue feeding this stage; 0 for the source
+    items_in: int = 0
+    items_out: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0  # time spent in the stage's function, summed over workers
+    queue_depth: int = 0  # items waiting for this stage
+    max_queue_depth: int = 0
+    elapsed: float = 0.0  # seconds since the pipeline started
+
+    @property
+    def throughput(self) -> float:
+        """Items processed per second."""
+        return self.items_in / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Share of the stage's worker time spent working rather than waiting, between 0 and 1."""
+        return self.busy_seconds / (self.elapsed * self.workers) if self.elapsed else 0.0
+
+
+class _Stage:
+    def __init__(self, name: str, kind: str, fn: Callable[[Any], Any], workers: int, buffer: int):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.kind = kind
+        self.fn = fn
+        self.is_async = asyncio.iscoroutinefunction(fn)
+        self.input: "queue.Queue[Any]" = queue.Queue(maxsize=buffer)
+        self.stats = StageStats(name, workers, buffer)
+        self.running = 0
+        self.lock = threading.Lock()
+
+    def outputs(self, item: Any, result: Any) -> List[Any]:
+        if self.kind == "map":
+            return [result]
+        if self.kind == "filter":
+            return [item] if result else []
+        if self.kind == "flat_map":
+            return list(result)
+        return []  # sink
+
+    def record(self, busy: float, produced: int) -> None:
+        with self.lock:
+            self.stats.items_in += 1
+            self.stats.items_out += produced
+            self.stats.busy_seconds += busy
+
+
+class Pipeline:
+    """Runs items from an iterator through concurrent stages connected by bounded queues.
+
+    Each stage runs its function in ``workers`` threads, or, for an ``async def``
+    function, as up to ``workers`` concurrent tasks on an event loop of its own. Stages
+    are connected by queues holding at most ``buffer`` items, so a slow stage makes the
+    ones before it wait instead of letting items pile up in memory: at most about
+    ``buffer`` items per stage plus one per worker are in flight. With more than one
+    worker a stage may reorder items.
+
+    ``stats()`` and ``report()`` show each stage's throughput, utilization and queue
+    depth while the pipeline runs and after it finishes. The stage in front of which
+    the queue stays full, with utilization near 1, is the bottleneck.
+
+    The first exception raised by a stage stops the pipeline and is re-raised by
+    ``run`` or by the iteration.
+
+    Example:
+        pipeline = (
+            Pipeline(client.records.list(module="Building").auto_paging_iter(), buffer=200)
+            .filter(lambda record: record.status == "Issued")
+            .map(enrich, workers=8)
+            .sink(writer.write)
+        )
+        pipeline.run()
+        print(pipeline.report())
+    """
+
+    def __init__(self, source: Iterable[Any], buffer: int = 100, name: str = "source"):
+        """
+        Initialize the pipeline.
+
+        Args:
+            source: Items to process, e.g. ``auto_paging_iter()``; read by one thread
+            buffer: Default size of the queue in front of each stage
+            name: Name of the source in stats
+        """
+        if buffer < 1:
+            raise ValueError("buffer must be at least 1")
+        self.buffer = buffer
+        self._source = source
+        self._source_stats = StageStats(name, 1, 0)
+        self._stages: List[_Stage] = []
+        self._output: "queue.Queue[Any]" = queue.Queue(maxsize=buffer)
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._error_lock = threading.Lock()
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    def _add(self, kind: str, fn: Callable[[Any], Any], workers: int, buffer: Optional[int],
+             name: Optional[str]) -> "Pipeline":
+        if self._started is not None:
+            raise RuntimeError("Stages cannot be added to a pipeline that has started")
+        if self._stages and self._stages[-1].kind == "sink":
+            raise ValueError("A sink must be the last stage")
+        name = name or getattr(fn, "__name__", kind)
+        self._stages.append(_Stage(name, kind, fn, workers, buffer or self.buffer))
+        return self
+
+    def map(self, fn: Callable[[Any], Any], workers: int = 1, buffer: Optional[int] = None,
+            name: Optional[str] = None) -> "Pipeline":
+        """Replace each item with ``fn(item)``.
+
+        Args:
+            fn: Function or ``async def`` function applied to each item
+            workers: Threads (or concurrent tasks) running ``fn``
+            buffer: Size of the queue in front of this stage, default the pipeline's
+            name: Name of the stage in stats, default the function's name
+        """
+        return self._add("map", fn, workers, buffer, name)
+
+    def filter(self, fn: Callable[[Any], Any], workers: int = 1, buffer: Optional[int] = None,
+               name: Optional[str] = None) -> "Pipeline":
+        """Keep only the items for which ``fn(item)`` is true. Arguments as for ``map``."""
+        return self._add("filter", fn, workers, buffer, name)
+
+    def flat_map(self, fn: Callable[[Any], Any], workers: int = 1, buffer: Optional[int] = None,
+                 name: Optional[str] = None) -> "Pipeline":
+        """Replace each item with the items of the iterable ``fn(item)``. Arguments as for ``map``."""
+        return self._add("flat_map", fn, workers, buffer, name)
+
+    def sink(self, fn: Callable[[Any], Any], workers: int = 1, buffer: Optional[int] = None,
+             name: Optional[str] = None) -> "Pipeline":
+        """Consume each item with ``fn(item)``; must be the last stage. Arguments as for ``map``."""
+        return self._add("sink", fn, workers, buffer, name)
+
+    def run(self) -> List[StageStats]:
+        """Run the pipeline to completion, discarding the items of the last stage unless it is a sink.
+
+        Returns:
+            Stats of the source and every stage
+        """
+        for _ in self:
+            pass
+        return self.stats()
+
+    def __iter__(self) -> Iterator[Any]:
+        """Run the pipeline and yield the items leaving its last stage.
+
+        Stopping the iteration early stops the pipeline.
+        """
+        self._start()
+        try:
+            while True:
+                item = self._get(self._output)
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            self.cancel()
+        if self._error is not None:
+            raise self._error
+
+    def cancel(self) -> None:
+        """Stop all stages and wait for their threads to finish."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        if self._finished is None:
+            self._finished = time.monotonic()
+
+    def stats(self) -> List[StageStats]:
+        """Current stats of the source and every stage."""
+        now = self._finished or time.monotonic()
+        elapsed = now - self._started if self._started is not None else 0.0
+        self._source_stats.elapsed = elapsed
+        result = [self._source_stats]
+        for stage in self._stages:
+            with stage.lock:
+                stage.stats.elapsed = elapsed
+                stage.stats.queue_depth = stage.input.qsize()
+            result.append(stage.stats)
+        return result
+
+    def report(self) -> str:
+        """Stats as a plain-text table."""
+        rows = [("stage", "workers", "in", "out", "items/s", "busy", "queue", "max queue", "errors")]
+        for stats in self.stats():
+            queue_column = f"{stats.queue_depth}/{stats.capacity}" if stats.capacity else "-"
+            rows.append((
+                stats.name,
+                str(stats.workers),
+                f"{stats.items_in:,}",
+                f"{stats.items_out:,}",
+                f"{stats.throughput:,.1f}",
+                f"{stats.utilization:.0%}",
+                queue_column,
+                str(stats.max_queue_depth) if stats.capacity else "-",
+                str(stats.errors),
+            ))
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        return "\n".join(
+            "  ".join(cell.ljust(width) if i == 0 else cell.rjust(width) for i, (cell, width) in
+                      enumerate(zip(row, widths)))
+            for row in rows
+        )
+
+    def _start(self) -> None:
+        if self._started is not None:
+            raise RuntimeError("A pipeline can only be run once")
+        self._started = time.monotonic()
+        self._threads.append(threading.Thread(target=self._feed, name="accela-pipeline-source", daemon=True))
+        for index, stage in enumerate(self._stages):
+            stage.running = 1 if stage.is_async else stage.stats.workers
+            for number in range(stage.running):
+                target = self._work_async_thread if stage.is_async else self._work
+                self._threads.append(threading.Thread(
+                    target=target, args=(index,), name=f"accela-pipeline-{stage.stats.name}-{number}", daemon=True,
+                ))
+        for thread in self._threads:
+            thread.start()
+
+    def _next_queue(self, index: int) -> "queue.Queue[Any]":
+        """Queue that stage ``index`` (-1 for the source) feeds."""
+        return self._stages[index + 1].input if index + 1 < len(self._stages) else self._output
+
+    def _get(self, source: "queue.Queue[Any]") -> Any:
+        """Take the next item, or _DONE once the pipeline is stopped."""
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _put(self, index: int, item: Any) -> bool:
+        """Pass an item on from stage ``index``, waiting for room; False if the pipeline was stopped."""
+        target = self._next_queue(index)
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=_POLL_SECONDS)
+            except queue.Full:
+                continue
+            if index + 1 < len(self._stages) and item is not _DONE:
+                stats = self._stages[index + 1].stats
+                depth = target.qsize()
+                if depth > stats.max_queue_depth:
+                    stats.max_queue_depth = depth
+            return True
+        return False
+
+    def _finish(self, index: int) -> None:
+        """Tell the next stage that stage ``index`` has no more items, once all its workers are done."""
+        if index >= 0:
+            stage = self._stages[index]
+            with stage.lock:
+                stage.running -= 1
+                if stage.running:
+                    return
+        consumers = self._stages[index + 1] if index + 1 < len(self._stages) else None
+        count = consumers.running if consumers is not None else 1
+        for _ in range(count):
+            self._put(index, _DONE)
+
+    def _fail(self, stats: StageStats, error: BaseException) -> None:
+        with self._error_lock:
+            stats.errors += 1
+            if self._error is None:
+                self._error = error
+        self._stop.set()
+
+    def _feed(self) -> None:
+        stats = self._source_stats
+        try:
+            iterator = iter(self._source)
+            while not self._stop.is_set():
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                stats.busy_seconds += time.perf_counter() - start
+                stats.items_in += 1
+                stats.items_out += 1
+                if not self._put(-1, item):
+                    break
+        except BaseException as error:
+            self._fail(stats, error)
+        finally:
+            self._finish(-1)
+
+    def _work(self, index: int) -> None:
+        stage = self._stages[index]
+        try:
+            while True:
+                item = self._get(stage.input)
+                if item is _DONE:
+                    break
+                start = time.perf_counter()
+                outputs = stage.outputs(item, stage.fn(item))
+                stage.record(time.perf_counter() - start, len(outputs))
+                for output in outputs:
+                    if not self._put(index, output):
+                        return
+        except BaseException as error:
+            self._fail(stage.stats, error)
+        finally:
+            self._finish(index)
+
+    def _work_async_thread(self, index: int) -> None:
+        stage = self._stages[index]
+        try:
+            asyncio.run(self._work_async(index))
+        except BaseException as error:
+            self._fail(stage.stats, error)
+        finally:
+            self._finish(index)
+
+    async def _work_async(self, index: int) -> None:
+        stage = self._stages[index]
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(stage.stats.workers)
+        tasks = set()
+
+        async def handle(item: Any) -> None:
+            try:
+                start = time.perf_counter()
+                outputs = stage.outputs(item, await stage.fn(item))
+                stage.record(time.perf_counter() - start, len(outputs))
+                for output in outputs:
+                    # Waiting for room in the next queue must not block the event loop
+                    if not await loop.run_in_executor(None, self._put, index, output):
+                        return
+            except Exception as error:
+                self._fail(stage.stats, error)
+            finally:
+                slots.release()
+
+        while True:
+            await slots.acquire()
+            item = await loop.run_in_executor(None, self._get, stage.input)
+            if item is _DONE:
+                slots.release()
+                break
+            task = loop.create_task(handle(item))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
@@ -0,0 +1,208 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
+from zoneinfo import ZoneInfo
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .client import AccelaClient
+from .resources.records import Record
+from .util.access_token import TokenProvider
+from .util.rate_limit import TokenBucket
+from .util.scheduler import PriorityScheduler
+
+T = TypeVar("T")
+ClientKey = Tuple[str, str]  # (agency, environment)
+
+
+@dataclass
+class AgencyItem(Generic[T]):
+    """An item returned by a fan-out query, tagged with the agency it came from."""
+
+    agency: str
+    environment: str
+    item: T
+
+
+@dataclass
+class FanOutResult(Generic[T]):
+    """Per-agency results and errors of a fan-out call."""
+
+    results: Dict[ClientKey, T] = field(default_factory=dict)
+    errors: Dict[ClientKey, Exception] = field(default_factory=dict)
+
+    def merged(self) -> List[AgencyItem]:
+        """All items of list-like results, tagged by agency, in pool order."""
+        return [
+            AgencyItem(agency=agency, environment=environment, item=item)
+            for (agency, environment), items in self.results.items()
+            for item in items
+        ]
+
+    def __str__(self) -> str:
+        return f"FanOutResult(results={len(self.results)}, errors={len(self.errors)})"
+
+
+class ClientPool:
+    """AccelaClients for several agencies sharing one connection pool and rate budget.
+
+    Each (agency, environment) gets its own client and token, but all clients send
+    their requests through the same ``requests.Session`` and, if ``rate_limit`` is
+    set, draw from the same requests-per-second budget.
+
+    Example:
+        pool = ClientPool(rate_limit=20)
+        pool.add("CHARLOTTE", "PROD", charlotte_token)
+        pool.add("DURHAM", "PROD", durham_token)
+        result = pool.list_records(module="Building", opened_date_from=date(2025, 1, 1))
+        for tagged in result.merged():
+            print(tagged.agency, tagged.item.id)
+    """
+
+    def __init__(
+            self,
+            rate_limit: Optional[float] = None,
+            max_workers: int = 16,
+            pool_maxsize: int = 32,
+            timezone: Optional[ZoneInfo] = None,
+            scheduler: Optional[PriorityScheduler] = None,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            rate_limit: Optional requests per second shared by all clients in the pool
+            max_workers: Maximum number of agencies queried concurrently by fan-out calls
+            pool_maxsize: Maximum number of kept-alive connections in the shared pool
+            timezone: Default timezone for clients added without one
+            scheduler: Optional PriorityScheduler shared by all clients in the pool, instead
+                of rate_limit
+        """
+        self.max_workers = max_workers
+        self.timezone = timezone
+        self.rate_limiter = TokenBucket(rate_limit) if rate_limit else None
+        self.scheduler = scheduler
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._clients: Dict[ClientKey, AccelaClient] = {}
+        self._lock = threading.Lock()
+
+    def add(
+            self,
+            agency: str,
+            environment: str,
+            access_token: Union[str, TokenProvider],
+            timezone: Optional[ZoneInfo] = None,
+    ) -> AccelaClient:
+        """Add (or replace) the client for an agency and environment.
+
+        Args:
+            agency: Agency name, e.g. 'CHARLOTTE'
+            environment: Environment name, e.g. 'PROD'
+            access_token: Access token or TokenProvider for this agency
+            timezone: Timezone of this agency, defaults to the pool's timezone
+
+        Returns:
+            The new client
+        """
+        client = AccelaClient(
+            access_token=access_token,
+            agency=agency,
+            environment=environment,
+            timezone=timezone or self.timezone,
+            session=self.session,
+        )
+        client.rate_limiter = self.rate_limiter
+        client.scheduler = self.scheduler
+        with self._lock:
+            self._clients[(agency, environment)] = client
+        return client
+
+    def get(self, agency: str, environment: str) -> AccelaClient:
+        """Return the client for an agency and environment.
+
+        Raises:
+            KeyError: If no client was added for them
+        """
+        return self._clients[(agency, environment)]
+
+    def __getitem__(self, key: ClientKey) -> AccelaClient:
+        return self._clients[key]
+
+    def __iter__(self) -> Iterator[AccelaClient]:
+        return iter(list(self._clients.values()))
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def fan_out(
+            self, fn: Callable[[AccelaClient], T], keys: Optional[Iterable[ClientKey]] = None
+    ) -> FanOutResult[T]:
+        """Call ``fn`` with every client concurrently.
+
+        A failing agency is reported in ``errors`` and does not affect the others.
+
+        Args:
+            fn: Function receiving a client, e.g. ``lambda c: c.records.retrieve("REC-1")``
+            keys: Optional subset of (agency, environment) keys, default all
+
+        Returns:
+            FanOutResult with a result or error per agency
+        """
+        clients = {key: self._clients[key] for key in keys} if keys is not None else dict(self._clients)
+        result: FanOutResult[T] = FanOutResult()
+        if not clients:
+            return result
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(clients))) as pool:
+            futures = {key: pool.submit(fn, client) for key, client in clients.items()}
+            for key, future in futures.items():
+                try:
+                    result.results[key] = future.result()
+                except Exception as e:  # noqa: BLE001 - reported per agency
+                    result.errors[key] = e
+        return result
+
+    def list_records(self, all_pages: bool = False, **kwargs: Any) -> FanOutResult[List[Record]]:
+        """Run ``records.list`` with the same arguments against every agency.
+
+        Args:
+            all_pages: Fetch every page instead of only the first
+            **kwargs: Arguments for ``Records.list``
+
+        Returns:
+            FanOutResult of record lists; use ``merged()`` for agency-tagged records
+        """
+        return self.fan_out(lambda client: _collect(client.records.list(**kwargs), all_pages))
+
+    def search_records(
+            self, search_query: Dict[str, Any], all_pages: bool = False, **kwargs: Any
+    ) -> FanOutResult[List[Record]]:
+        """Run ``records.search`` with the same query against every agency.
+
+        Args:
+            search_query: Search body for ``Records.search``
+            all_pages: Fetch every page instead of only the first
+            **kwargs: Other arguments for ``Records.search``
+
+        Returns:
+            FanOutResult of record lists; use ``merged()`` for agency-tagged records
+        """
+        return self.fan_out(lambda client: _collect(client.records.search(search_query, **kwargs), all_pages))
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "ClientPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _collect(response, all_pages: bool) -> List[Any]:
+    return list(response.auto_paging_iter()) if all_pages else list(response.data)
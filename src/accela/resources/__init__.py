@@ -1,16 +1,55 @@
-from .base import ListResponse, ResourceModel
-from .record_addresses import RecordAddress, RecordAddresses
-from .records import Record, Records
-from .record_activities import RecordActivity, RecordActivities
-from .record_mine import MyRecords
-from .record_workflows import RecordWorkflowTask, RecordWorkflowTasks
-from .record_workflow_task_histories import (
-    RecordWorkflowTaskHistory,
-    RecordWorkflowTaskHistories,
-)
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from .base import ConsistentCursor, ListResponse, PageCursor, ResourceModel
+    from .record_addresses import RecordAddress, RecordAddresses
+    from .records import Record, Records
+    from .record_activities import RecordActivity, RecordActivities
+    from .record_mine import MyRecords
+    from .record_workflows import RecordWorkflowTask, RecordWorkflowTasks
+    from .record_workflow_task_histories import (
+        RecordWorkflowTaskHistory,
+        RecordWorkflowTaskHistories,
+    )
+
+# Public name -> module it is imported from on first access; importing one resource
+# module does not load the others
+_LAZY_IMPORTS: Dict[str, str] = {
+    "ListResponse": ".base",
+    "PageCursor": ".base",
+    "ConsistentCursor": ".base",
+    "ResourceModel": ".base",
+    "Record": ".records",
+    "Records": ".records",
+    "RecordAddress": ".record_addresses",
+    "RecordAddresses": ".record_addresses",
+    "RecordActivity": ".record_activities",
+    "RecordActivities": ".record_activities",
+    "MyRecords": ".record_mine",
+    "RecordWorkflowTask": ".record_workflows",
+    "RecordWorkflowTasks": ".record_workflows",
+    "RecordWorkflowTaskHistory": ".record_workflow_task_histories",
+    "RecordWorkflowTaskHistories": ".record_workflow_task_histories",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(__all__)
+
 
 __all__ = [
     "ListResponse",
+    "PageCursor",
+    "ConsistentCursor",
     "ResourceModel",
     "Record",
     "Records",
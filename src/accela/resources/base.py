@@ -1,15 +1,26 @@
 import json
+import logging
 import re
+import time
 from abc import ABC
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
-from typing import Any, Dict, Generic, Iterator, List, Optional, Type, TypeVar, Union
+from typing import Any, Callable, Dict, Generic, Hashable, Iterator, List, Optional, Tuple, Type, TypeVar, Union
 from zoneinfo import ZoneInfo
 
 import requests
 
+from ..errors import raise_for_response
+from ..util.json_stream import StreamingPage
+from ..util.seen import SeenIds
+
 T = TypeVar("T")
 
+logger = logging.getLogger("accela")
+
+# Chunk size for reading streamed page bodies
+STREAM_CHUNK_SIZE = 64 * 1024
+
 
 class ResourceModel(ABC):
     """Abstract base class for Accela API models with common functionality."""
@@ -105,6 +116,19 @@ class ResourceModel(ABC):
         instance.raw_json = data
         return instance
 
+    @classmethod
+    def from_json_list(cls, items: List[Dict[str, Any]], client=None) -> List[Any]:
+        """Create instances from a list of API response items, emitting the client's on_parse hook."""
+        hooks = getattr(client, "hooks", None)
+        if not (hooks and hooks["on_parse"]):
+            return [cls.from_json(item, client) for item in items]
+
+        start = time.perf_counter()
+        parsed = [cls.from_json(item, client) for item in items]
+        client.emit("on_parse", stage="model", model=cls.__name__, count=len(parsed),
+                    elapsed=time.perf_counter() - start)
+        return parsed
+
     def to_dict(self) -> Dict[str, Any]:
         result = {}
         for key, value in asdict(self).items():  # noqa
@@ -120,9 +144,339 @@ class ResourceModel(ABC):
         return self.to_json(pretty=False)
 
 
+def _decode_json(client, response: requests.Response) -> Any:
+    """Decode a JSON response body, emitting the client's on_parse hook."""
+    hooks = getattr(client, "hooks", None)
+    if not (hooks and hooks["on_parse"]):
+        return response.json()
+
+    start = time.perf_counter()
+    result = response.json()
+    client.emit("on_parse", stage="json", model=None, count=1, elapsed=time.perf_counter() - start)
+    return result
+
+
+def _request_page(client, url: str, params: Dict[str, Any], method: str = "GET",
+                  body: Optional[Dict[str, Any]] = None, **kwargs: Any) -> requests.Response:
+    """Send the request for one page; POST endpoints such as search take a JSON body."""
+    if body is not None:
+        kwargs["json"] = body
+    response = client.request(method, url, params=params, **kwargs)
+    try:
+        raise_for_response(response)
+    except Exception:
+        response.close()
+        raise
+    return response
+
+
+def _get_page(
+        client, url: str, params: Dict[str, Any], method: str = "GET", body: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Fetch one page of a list endpoint, reporting its timing to the client's page-size tuner."""
+    tuner = getattr(client, "page_size_tuner", None)
+    if tuner is None:
+        response = _request_page(client, url, params, method, body)
+        return _decode_json(client, response)
+
+    start = time.perf_counter()
+    response = _request_page(client, url, params, method, body)
+    size = len(response.content)
+    elapsed = time.perf_counter() - start
+    result = _decode_json(client, response)
+    count = len(result.get("result") or []) if isinstance(result, dict) else 0
+    tuner.observe(url, params.get("limit", 100), count, elapsed, size)
+    return result
+
+
+def _get_models_page(
+        client, url: str, params: Dict[str, Any], model_class, result_key: str = "result", method: str = "GET",
+        body: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[Any], Dict[str, Any]]:
+    """Fetch one page of a list endpoint and hydrate its items.
+
+    With a parse executor on the client, the raw body is decoded and hydrated there.
+
+    Returns:
+        (models, decoded body; without the items when a parse executor is used)
+    """
+    executor = getattr(client, "parse_executor", None)
+    if executor is None:
+        result = _get_page(client, url, params, method, body)
+        # Handle case where result key is missing (empty response)
+        items = model_class.from_json_list(result[result_key], client) if result_key in result else []
+        return items, result
+
+    start = time.perf_counter()
+    content = _request_page(client, url, params, method, body).content
+    elapsed = time.perf_counter() - start
+    items, result = executor.parse(content, model_class, result_key, client)
+    tuner = getattr(client, "page_size_tuner", None)
+    if tuner is not None:
+        tuner.observe(url, params.get("limit", 100), len(items), elapsed, len(content))
+    return items, result
+
+
+def _streams_pages(client) -> bool:
+    """Whether list pages are parsed from the response stream; a parse executor takes precedence."""
+    return getattr(client, "stream_pages", False) and getattr(client, "parse_executor", None) is None
+
+
+def _iter_streamed_page(
+        client, url: str, params: Dict[str, Any], model_class, metadata: Dict[str, Any], result_key: str = "result",
+        method: str = "GET", body: Optional[Dict[str, Any]] = None,
+) -> Iterator[Any]:
+    """Fetch one page with a streamed body and yield its models as they are parsed.
+
+    The page's other top-level members (page, total, ...) are added to ``metadata``
+    once the generator is exhausted.
+    """
+    start = time.perf_counter()
+    response = _request_page(client, url, params, method, body, stream=True)
+    try:
+        request_elapsed = time.perf_counter() - start
+        page = StreamingPage(response.iter_content(STREAM_CHUNK_SIZE), result_key)
+        count = 0
+        hydration = 0.0
+        for raw in page.items():
+            item_start = time.perf_counter()
+            item = model_class.from_json(raw, client)
+            hydration += time.perf_counter() - item_start
+            count += 1
+            yield item
+    finally:
+        response.close()
+    metadata.update(page.metadata)
+
+    # Timings exclude the time the consumer spent between items
+    hooks = getattr(client, "hooks", None)
+    if hooks and hooks["on_parse"]:
+        client.emit("on_parse", stage="json", model=None, count=1, elapsed=page.elapsed)
+        client.emit("on_parse", stage="model", model=model_class.__name__, count=count, elapsed=hydration)
+    tuner = getattr(client, "page_size_tuner", None)
+    if tuner is not None:
+        tuner.observe(url, params.get("limit", 100), count, request_elapsed + page.elapsed + hydration,
+                      page.bytes_read)
+
+
+def _page_total(result: Dict[str, Any], count: int) -> int:
+    """The total reported with a list page; top-level or in its page member."""
+    return result.get("total", result.get("page", {}).get("total", count))
+
+
+def _reported_total(result: Dict[str, Any]) -> Optional[int]:
+    """The total reported with a list page, or None if the API left it out."""
+    return result.get("total", result.get("page", {}).get("total"))
+
+
+def _page_has_more(result: Dict[str, Any], count: int, limit: int, next_offset: int) -> bool:
+    """Whether more items follow a page.
+
+    The page's ``hasmore`` flag decides if present; otherwise a full page means more
+    may follow, unless a reported total ends at ``next_offset``.
+    """
+    page_info = result.get("page", {})
+    if "hasmore" in page_info:
+        return bool(page_info["hasmore"])
+    total = _reported_total(result)
+    return count == limit and (total is None or next_offset < total)
+
+
+def _emit_page(client, url: str, offset: int, limit: int, count: int, total: int) -> None:
+    hooks = getattr(client, "hooks", None)
+    if hooks and hooks["on_page"]:
+        client.emit("on_page", url=url, offset=offset, limit=limit, count=count, total=total)
+
+
 @dataclass
+class PagingDrift:
+    """What a consistent_paging_iter scan saw change while it ran."""
+
+    total_changes: int = 0  # pages whose total differed from the page before
+    duplicates: int = 0  # items skipped as already yielded, including each page's overlap
+    refetched_pages: int = 0  # pages read again to recover items that shifted back
+    unrecovered: int = 0  # times the scan could not find its place again
+
+
+class PageCursor(Generic[T]):
+    """An independent position in the pages of a ListResponse.
+
+    Iterating a cursor yields items, fetching pages as they are needed. Its
+    ``offset``, ``has_more`` and ``pages`` attributes track its own progress; the
+    ListResponse it came from is never changed. Any number of cursors may page the
+    same response concurrently, e.g. one per thread or task, but a single cursor is
+    an iterator and should be consumed by one of them.
+    """
+
+    def __init__(self, response: "ListResponse[T]", start: Optional[int] = None, stop: Optional[int] = None):
+        """
+        Initialize the cursor.
+
+        Args:
+            response: First page of the listing
+            start: Offset to start at; default the response's own first page, whose items
+                are yielded without fetching them again
+            stop: Offset to stop before; default the end of the listing
+        """
+        self.response = response
+        self.stop = stop
+        self.pages = 0
+        if start is None:
+            self._first_page = response.data
+            self.offset = response.offset + response.limit
+            self.has_more = response.has_more and self._before_end(self.offset)
+        else:
+            self._first_page = []
+            self.offset = start
+            self.has_more = self._before_end(start)
+        self._iterator = self._items()
+
+    def __iter__(self) -> "PageCursor[T]":
+        return self
+
+    def __next__(self) -> T:
+        return next(self._iterator)
+
+    def _end(self) -> Optional[int]:
+        """Offset paging stops at: the reported total or ``stop``, None if neither is known."""
+        total = self.response.total if self.response._total_reported else None
+        if self.stop is None or total is None:
+            return total if self.stop is None else self.stop
+        return min(total, self.stop)
+
+    def _before_end(self, offset: int) -> bool:
+        end = self._end()
+        return end is None or offset < end
+
+    def _fetch(self, offset: int, limit: int) -> Tuple[List[T], Dict[str, Any]]:
+        response = self.response
+        params = dict(response._params, offset=offset, limit=limit)
+        return _get_models_page(response._client, response._url, params, response._model_class,
+                                method=response._method, body=response._body)
+
+    def _items(self) -> Iterator[T]:
+        yield from self._first_page
+
+        response = self.response
+        client, url = response._client, response._url
+        tuner = getattr(client, "page_size_tuner", None)
+        streaming = _streams_pages(client)
+        while self.has_more:
+            # The page size may change between pages; the next page starts where this one ended
+            offset = self.offset
+            limit = tuner.suggest(url, response.limit) if tuner is not None else response.limit
+            if self.stop is not None:
+                limit = min(limit, self.stop - offset)
+
+            if streaming:
+                # Yield models while the body is still arriving
+                items: List[T] = []
+                count = 0
+                result: Dict[str, Any] = {}
+                params = dict(response._params, offset=offset, limit=limit)
+                for item in _iter_streamed_page(client, url, params, response._model_class, result,
+                                                method=response._method, body=response._body):
+                    count += 1
+                    yield item
+            else:
+                items, result = self._fetch(offset, limit)
+                count = len(items)
+
+            self.offset = offset + limit
+            self.pages += 1
+            self.has_more = _page_has_more(result, count, limit, self.offset) and self._before_end(self.offset)
+            _emit_page(client, url, offset, limit, count, response.total)
+            yield from items
+
+
+class ConsistentCursor(PageCursor[T]):
+    """A cursor that yields each item at most once, even if items move between pages.
+
+    See ListResponse.consistent_paging_iter. What changed during the scan is counted
+    in ``drift``.
+    """
+
+    def __init__(
+            self,
+            response: "ListResponse[T]",
+            overlap: int = 5,
+            max_refetch_pages: int = 10,
+            key: Optional[Callable[[T], Hashable]] = None,
+    ):
+        if response.limit < 2:
+            raise ValueError("consistent_paging_iter needs a page size of at least 2")
+        self.overlap = max(min(overlap, response.limit - 1), 1)
+        self.max_refetch_pages = max_refetch_pages
+        self.key = key or (lambda item: item.id)
+        self.drift = PagingDrift()
+        self._seen = SeenIds()
+        super().__init__(response)
+
+    def _unseen(self, items: List[T]) -> Iterator[T]:
+        for item in items:
+            if self._seen.add(self.key(item)):
+                yield item
+            else:
+                self.drift.duplicates += 1
+
+    def _items(self) -> Iterator[T]:
+        response = self.response
+        client, url = response._client, response._url
+        key, overlap, limit, drift = self.key, self.overlap, response.limit, self.drift
+
+        yield from self._unseen(self._first_page)
+        anchors = {key(item) for item in self._first_page[-overlap:]}
+        total = response.total if response._total_reported else None
+        self.offset = response.offset + len(self._first_page)
+        while self.has_more:
+            start = max(self.offset - overlap, 0)
+            items, result = self._fetch(start, limit)
+            page_total = _reported_total(result)
+            ids = [key(item) for item in items]
+            self.pages += 1
+            _emit_page(client, url, start, limit, len(items), _page_total(result, len(items)))
+            if page_total is not None and total is not None and page_total != total:
+                drift.total_changes += 1
+                logger.info("Total of %s changed from %d to %d during paging", url, total, page_total)
+
+            if start > 0 and anchors and not anchors.intersection(ids):
+                # Items not yet seen may have moved back before start; read back until the
+                # scan's previous position turns up
+                shrunk = total - page_total if page_total is not None and total is not None else 0
+                window = min(max(shrunk, limit), 1000)
+                position = start
+                for attempt in range(1, self.max_refetch_pages + 1):
+                    if position == 0:
+                        break
+                    window_start = max(position - window, 0)
+                    if client.hooks["on_retry"]:
+                        client.emit("on_retry", method=response._method, url=url, attempt=attempt, reason="drift")
+                    recovered, _ = self._fetch(window_start, position - window_start)
+                    drift.refetched_pages += 1
+                    yield from self._unseen(recovered)
+                    if anchors.intersection(key(item) for item in recovered):
+                        break
+                    position = window_start
+                else:
+                    drift.unrecovered += 1
+                    logger.warning("Lost position while paging %s; items may have been skipped", url)
+
+            yield from self._unseen(items)
+            anchors = set(ids[-overlap:]) or anchors
+            self.offset = start + len(items)
+            if page_total is not None:
+                total = page_total
+            self.has_more = _page_has_more(result, len(items), limit, self.offset)
+
+
+@dataclass(frozen=True)
 class ListResponse(Generic[T]):
-    """Generic container for a list of items with pagination support."""
+    """Generic container for a list of items with pagination support.
+
+    A ListResponse holds the first page and never changes. Later pages are read
+    through cursors (see ``cursor``, ``shards`` and ``auto_paging_iter``), each with
+    its own position, so a response can be iterated again or by several threads at once.
+    """
 
     data: List[T]
     has_more: bool
@@ -133,37 +487,79 @@ class ListResponse(Generic[T]):
     _params: Dict[str, Any] = field(default_factory=dict)
     _url: str = None
     _model_class: Type[T] = None
+    _method: str = "GET"
+    _body: Optional[Dict[str, Any]] = None  # JSON body of POST list endpoints such as search
+    _total_reported: bool = True  # False if the API sent no total; ``total`` is then the page's length
 
-    def auto_paging_iter(self) -> Iterator[T]:
-        """Automatically handle pagination and yield items one at a time."""
-        yield from self.data
+    def auto_paging_iter(self) -> PageCursor[T]:
+        """Automatically handle pagination and yield items one at a time.
 
-        # Continue fetching more pages as long as there are more items
-        while self.has_more:
-            self._params["offset"] = self.offset + self.limit
+        Each call returns a new cursor starting at the first page.
+        """
+        return PageCursor(self)
 
-            response = requests.get(
-                self._url, headers=self._client.headers, params=self._params
-            )
-            response.raise_for_status()
+    def cursor(self, start: Optional[int] = None, stop: Optional[int] = None) -> PageCursor[T]:
+        """A new cursor over the items from offset ``start`` up to ``stop``.
 
-            result = response.json()
-            # Handle case where result key is missing (empty response)
-            if "result" not in result:
-                items = []
-            else:
-                items = [
-                    self._model_class.from_json(item, self._client)
-                    for item in result["result"]
-                ]
+        Args:
+            start: Offset to start at; default this response's first page, which is not fetched again
+            stop: Offset to stop before; default the end of the listing
 
-            # Update this instance with new page info
-            self.data = items
-            self.offset += self.limit
-            self.has_more = len(items) == self.limit and self.offset < self.total
+        Returns:
+            PageCursor yielding the items in that range
+        """
+        return PageCursor(self, start, stop)
 
-            # Yield items from this page
-            yield from items
+    def shards(self, count: int) -> List[PageCursor[T]]:
+        """Split the listing into up to ``count`` cursors over adjacent ranges of pages.
+
+        The first cursor includes this response's first page. Consume each cursor in its
+        own thread or task to fetch the pages concurrently.
+
+        Example:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                parts = pool.map(list, response.shards(4))
+        """
+        first = self.offset + self.limit
+        # Without a total beyond this page there are no ranges to split
+        if count <= 1 or not self.has_more or not self._total_reported or self.total <= first:
+            return [self.cursor()]
+        pages = -(-(self.total - first) // self.limit)
+        per_shard = max(-(-pages // (count - 1)), 1) * self.limit
+        bounds = list(range(first, self.total, per_shard)) + [self.total]
+        return [self.cursor(stop=first)] + [self.cursor(lower, upper) for lower, upper in zip(bounds, bounds[1:])]
+
+    def consistent_paging_iter(
+            self,
+            overlap: int = 5,
+            max_refetch_pages: int = 10,
+            key: Optional[Callable[[T], Hashable]] = None,
+    ) -> ConsistentCursor[T]:
+        """Like auto_paging_iter, but robust to items being added or removed mid-scan.
+
+        Offset pages shift when the listed items change: additions before the current
+        offset repeat items, removals skip them. This scan yields every item at most
+        once, tracking IDs in a compact seen-set, and starts each page ``overlap`` items
+        before the end of the previous one. If none of the previous page's last IDs
+        reappear on the next page, items have shifted back past it; the scan then reads
+        the preceding window again (sized from the drop in ``total``, at least a page)
+        until it finds its place. Drift is counted in the returned cursor's ``drift``,
+        reported to on_retry hooks with ``reason="drift"`` and logged.
+
+        Items added behind the scan after it passed them are not returned; sort by a
+        stable key where the endpoint allows it (e.g. ``Records.search(sort=...)``).
+        Pages are fetched whole and at a fixed size, even with stream_pages or
+        adaptive_page_size.
+
+        Args:
+            overlap: Items of the previous page requested again with each page, at least 1
+            max_refetch_pages: Maximum pages read again to recover from one shift
+            key: Returns an item's unique ID, default its ``id`` attribute
+
+        Returns:
+            ConsistentCursor over the items of all pages
+        """
+        return ConsistentCursor(self, overlap, max_refetch_pages, key)
 
     def __iter__(self) -> Iterator[T]:
         return iter(self.data)
@@ -227,29 +623,30 @@ class BaseResource:
             The JSON response from the API
 
         Raises:
-            requests.HTTPError: If the request fails
+            AccelaAPIError: If the API returns an error status
         """
-        response = requests.get(url, headers=self.client.headers, params=params)
-        response.raise_for_status()
-        return response.json()
+        response = self.client.request("GET", url, params=params)
+        raise_for_response(response)
+        return _decode_json(self.client, response)
 
     def _get_binary(
-            self, url: str, params: Optional[Dict[str, Any]] = None
+            self, url: str, params: Optional[Dict[str, Any]] = None, stream: bool = False
     ) -> requests.Response:
         """Make a GET request that returns binary content.
 
         Args:
             url: The API endpoint URL
             params: Optional query parameters
+            stream: If True, the body is not read until it is accessed, e.g. via iter_content()
 
         Returns:
             The raw Response object for binary content access
 
         Raises:
-            requests.HTTPError: If the request fails
+            AccelaAPIError: If the API returns an error status
         """
-        response = requests.get(url, headers=self.client.headers, params=params)
-        response.raise_for_status()
+        response = self.client.request("GET", url, params=params, stream=stream)
+        raise_for_response(response)
         return response
 
     def _list_resource(self, url: str, model_class: Type[T], params: Dict[str, Any], result_key: str = "result") -> \
@@ -268,22 +665,18 @@ class BaseResource:
         limit = params.get("limit", 100)
         offset = params.get("offset", 0)
 
-        result = self._get(url, params=params)
-
-        # Parse the results into model instances
-        # Handle case where result key is missing (empty response)
-        if result_key not in result:
-            items = []
+        if _streams_pages(self.client):
+            # Parse the body as it arrives instead of buffering and decoding it whole
+            result: Dict[str, Any] = {}
+            items = list(_iter_streamed_page(self.client, url, params, model_class, result, result_key))
         else:
-            items = [model_class.from_json(item, self.client) for item in result[result_key]]
-        
-        page_info = result.get("page", {})
-        total = result.get("total", page_info.get("total", len(items)))
-        has_more = page_info.get("hasmore", False)
-        
-        # If hasmore is not provided, fallback to standard logic
-        if "hasmore" not in page_info:
-            has_more = len(items) == limit and offset + limit < total
+            # Parse the results into model instances
+            items, result = _get_models_page(self.client, url, params, model_class, result_key)
+
+        total = _page_total(result, len(items))
+        reported_total = _reported_total(result)
+        has_more = _page_has_more(result, len(items), limit, offset + limit)
+        _emit_page(self.client, url, offset, limit, len(items), total)
 
         return ListResponse(
             data=items,
@@ -292,9 +685,10 @@ class BaseResource:
             limit=limit,
             total=total,
             _client=self.client,
-            _params=params,
+            _params=dict(params),
             _url=url,
             _model_class=model_class,
+            _total_reported=reported_total is not None,
         )  # Type will be inferred as ListResponse[model_class]
 
     def _post(
@@ -311,41 +705,11 @@ class BaseResource:
         Returns:
             The JSON response from the API
         Raises:
-            requests.HTTPError: If the request fails
+            AccelaAPIError: If the API returns an error status
         """
-        response = requests.post(
-            url, headers=self.client.headers, json=data, params=params
-        )
-        try:
-            response.raise_for_status()
-        except requests.HTTPError as e:
-            print("--- Accela API POST Request Failed ---")
-            print(f"URL: {url}")
-            print(f"Status Code: {response.status_code}")
-            try:
-                print(f"Response Body: {response.json()}")
-            except json.JSONDecodeError:
-                print(f"Response Body: {response.text}")
-            print("--- Response Headers ---")
-            print(
-                f"x-accela-traceId: {response.headers.get('x-accela-traceId')}"
-            )
-            print(
-                f"x-accela-resp-message: {response.headers.get('x-accela-resp-message')}"
-            )
-            print(
-                f"x-ratelimit-limit: {response.headers.get('x-ratelimit-limit')}"
-            )
-            print(
-                f"x-ratelimit-remaining: {response.headers.get('x-ratelimit-remaining')}"
-            )
-            print(
-                f"x-ratelimit-reset: {response.headers.get('x-ratelimit-reset')}"
-            )
-            print("------------------------")
-            print("------------------------------------")
-            raise e
-        return response.json()
+        response = self.client.request("POST", url, json=data, params=params)
+        raise_for_response(response)
+        return _decode_json(self.client, response)
 
     def _make_request(
         self,
@@ -369,7 +733,7 @@ class BaseResource:
 
         Raises:
             ValueError: If an unsupported HTTP method is specified
-            requests.HTTPError: If the request fails
+            AccelaAPIError: If the API returns an error status
         """
         if method.upper() == "GET":
             return self._get(url, params)
@@ -94,22 +94,23 @@ class Documents(BaseResource):
         result = self._get(url)
         return Document.from_json(result["result"][0], self.client)
 
-    def download(self, document_id: int) -> requests.Response:
+    def download(self, document_id: int, stream: bool = False) -> requests.Response:
         """
         Download a document's binary content.
 
         Args:
             document_id: The ID of the document to download
+            stream: If True, defer reading the body so large files can be written in chunks
 
         Returns:
             requests.Response object with binary content.
             Use response.iter_content() for streaming or response.content for full content.
 
         Example:
-            response = client.documents.download("12345")
+            response = client.documents.download("12345", stream=True)
             with open("document.pdf", "wb") as f:
                 for chunk in response.iter_content(chunk_size=8192):
                     f.write(chunk)
         """
         url = f"{self.client.BASE_URL}/documents/{document_id}/download"
-        return self._get_binary(url)
+        return self._get_binary(url, stream=stream)
@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from datetime import date, datetime
 from typing import Any, Dict, List, Optional, Union
 
-from .base import BaseResource, ListResponse, ResourceModel
+from .base import BaseResource, ListResponse, ResourceModel, _page_has_more, _page_total, _reported_total
 import json
 
 
@@ -237,6 +237,8 @@ class Records(BaseResource):
             completed_date_to: Optional[Union[date, datetime]] = None,
             status_date_from: Optional[Union[date, datetime]] = None,
             status_date_to: Optional[Union[date, datetime]] = None,
+            update_date_from: Optional[Union[date, datetime]] = None,
+            update_date_to: Optional[Union[date, datetime]] = None,
             completed_by_department: Optional[str] = None,
             completed_by_user: Optional[str] = None,
             closed_date_from: Optional[Union[date, datetime]] = None,
@@ -265,6 +267,8 @@ class Records(BaseResource):
             completed_date_to: Filter by the record's completed date range ending with this date/datetime
             status_date_from: Filter by the record's status date range starting with this date/datetime
             status_date_to: Filter by the record's status date range ending with this date/datetime
+            update_date_from: Filter by the record's last update date range starting with this date/datetime
+            update_date_to: Filter by the record's last update date range ending with this date/datetime
             completed_by_department: Filter by the department which completed the application
             completed_by_user: Filter by the user who completed the application
             closed_date_from: Filter by the record's closed date range starting with this date/datetime
@@ -309,6 +313,8 @@ class Records(BaseResource):
             "completedDateTo": format_date_param(completed_date_to),
             "statusDateFrom": format_date_param(status_date_from),
             "statusDateTo": format_date_param(status_date_to),
+            "updateDateFrom": format_date_param(update_date_from),
+            "updateDateTo": format_date_param(update_date_to),
             "completedByDepartment": completed_by_department,
             "completedByUser": completed_by_user,
             "closedDateFrom": format_date_param(closed_date_from),
@@ -361,6 +367,8 @@ class Records(BaseResource):
         expand: Optional[List[str]] = None,
         fields: Optional[List[str]] = None,
         expand_custom_forms: Optional[str] = None,
+        sort: Optional[str] = None,
+        direction: Optional[str] = None,
     ) -> ListResponse[Record]:
         """
         Search for records matching the specified criteria.
@@ -373,6 +381,9 @@ class Records(BaseResource):
             expand: The sub-resources to expand in the response -  "addresses" "parcels" "professionals" "contacts" "owners" "customForms" "customTables"
             fields: The API allow consumer to specify return field with resource. The values are case-sensitive fields name of JSON object and be split by comma..
             expand_custom_forms:
+            sort: Field to sort the results by, e.g. "openedDate"; a stable order keeps
+                pages consistent while paging
+            direction: Sort direction, "ASC" or "DESC"
 
         Returns:
             A ListResponse object containing the search results.
@@ -385,20 +396,17 @@ class Records(BaseResource):
             params["expand"] = ",".join(expand)
         if expand_custom_forms:
             params[" expandCustomForms "] = "addresses"
+        if sort:
+            params["sort"] = sort
+        if direction:
+            params["direction"] = direction
 
         result = self._post(url, data=search_query, params=params)
 
-        items = [
-            Record.from_json(item, self.client) for item in result["result"]
-        ]
-        
-        page_info = result.get("page", {})
-        total = page_info.get("total", len(items))
-        has_more = page_info.get("hasmore", False)
-        
-        # If hasmore is not provided, fallback to standard logic
-        if "hasmore" not in page_info:
-            has_more = len(items) == limit and offset + limit < total
+        items = Record.from_json_list(result["result"], self.client)
+
+        total = _page_total(result, len(items))
+        has_more = _page_has_more(result, len(items), limit, offset + limit)
 
         return ListResponse(
             data=items,
@@ -410,6 +418,9 @@ class Records(BaseResource):
             _params=params,
             _url=url,
             _model_class=Record,
+            _method="POST",
+            _body=search_query,
+            _total_reported=_reported_total(result) is not None,
         )
 
     def g_search(
@@ -442,17 +453,10 @@ class Records(BaseResource):
 
         result = self._get(url, params=params)
 
-        items = [
-            Record.from_json(item, self.client) for item in result["result"]
-        ]
-        
-        page_info = result.get("page", {})
-        total = page_info.get("total", len(items))
-        has_more = page_info.get("hasmore", False)
-        
-        # If hasmore is not provided, fallback to standard logic
-        if "hasmore" not in page_info:
-            has_more = len(items) == limit and offset + limit < total
+        items = Record.from_json_list(result["result"], self.client)
+
+        total = _page_total(result, len(items))
+        has_more = _page_has_more(result, len(items), limit, offset + limit)
 
         return ListResponse(
             data=items,
@@ -0,0 +1,166 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from .resources.base import ListResponse
+from .resources.records import Record
+
+Window = Tuple[datetime, datetime]
+
+
+@dataclass
+class ShardStats:
+    """Counters for a sharded scan."""
+
+    shards: int = 0
+    splits: int = 0
+    pages: int = 0
+    records: int = 0
+    duplicates: int = 0
+
+
+class ShardedScan:
+    """Scan a large date range of records as many shallow, concurrent date windows.
+
+    Instead of paging one ``Records.list`` call to deep offsets, the range is cut into
+    adjacent ``<field>_from``/``<field>_to`` windows. The first page of each window
+    reports its ``total``; a window holding more than ``max_per_shard`` records is split
+    into sub-windows sized from that total, otherwise its remaining pages are fetched
+    in parallel. Records are yielded as they arrive, deduplicated by ID (records on a
+    shared window boundary are returned by both windows). At most ``2 * max_workers``
+    pages are fetched ahead of the consumer, and stopping the iteration cancels the rest.
+
+    Example:
+        scan = ShardedScan(client, date(2024, 1, 1), date(2025, 1, 1), module="Building")
+        for record in scan.run():
+            ...
+        print(scan.stats)
+    """
+
+    FIELDS = ("opened_date", "status_date", "assigned_date", "completed_date", "closed_date", "update_date")
+
+    def __init__(
+            self,
+            client,
+            start: Union[date, datetime],
+            end: Optional[Union[date, datetime]] = None,
+            field: str = "opened_date",
+            max_per_shard: int = 1000,
+            limit: int = 100,
+            max_workers: int = 8,
+            min_window: timedelta = timedelta(minutes=1),
+            **filters: Any,
+    ):
+        """
+        Initialize the scan.
+
+        Args:
+            client: AccelaClient instance
+            start: Beginning of the date range
+            end: End of the date range, defaults to now in the client's timezone
+            field: Record date filter to shard on, e.g. 'opened_date' or 'status_date'
+            max_per_shard: Largest total a window may have before it is split
+            limit: Page size
+            max_workers: Number of concurrent requests
+            min_window: Windows are never split below this length; they are paged instead
+            **filters: Extra filters passed to ``client.records.list``, e.g. module='Building'
+        """
+        if field not in self.FIELDS:
+            raise ValueError(f"field must be one of {', '.join(self.FIELDS)}")
+        self.client = client
+        self.start = _to_datetime(start)
+        self.end = _to_datetime(end) if end is not None else _now(self.start, getattr(client, "timezone", None))
+        self.field = field
+        self.max_per_shard = max_per_shard
+        self.limit = limit
+        self.max_workers = max_workers
+        self.min_window = min_window
+        self.filters = filters
+        self.stats = ShardStats()
+
+    def run(self) -> Iterator[Record]:
+        """Yield every record in the date range once, in no particular order."""
+        self.stats = ShardStats()
+        seen: Set[str] = set()
+        # Pages waiting to be requested; only a bounded number are in flight at once
+        backlog: Deque[Tuple[Window, int]] = deque()
+        pending: Dict[Future, Tuple[Window, int]] = {}
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        for window in _split(self.start, self.end, self.max_workers):
+            self.stats.shards += 1
+            backlog.append((window, 0))
+
+        try:
+            while backlog or pending:
+                while backlog and len(pending) < self.max_workers * 2:
+                    window, offset = backlog.popleft()
+                    pending[pool.submit(self._fetch, window, offset)] = (window, offset)
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    window, offset = pending.pop(future)
+                    page = future.result()
+                    self.stats.pages += 1
+
+                    if not page._total_reported:
+                        # Without a total the window can only be paged one page at a time
+                        if page.has_more:
+                            backlog.append((window, offset + self.limit))
+                    elif offset == 0:
+                        if page.total > self.max_per_shard and window[1] - window[0] > self.min_window:
+                            # Size sub-windows so each is expected to hold about max_per_shard
+                            parts = -(-page.total // self.max_per_shard)
+                            self.stats.splits += 1
+                            for sub_window in _split(*window, parts, self.min_window):
+                                self.stats.shards += 1
+                                backlog.append((sub_window, 0))
+                            continue
+                        backlog.extend(
+                            (window, next_offset) for next_offset in range(self.limit, page.total, self.limit)
+                        )
+
+                    for record in page.data:
+                        if record.id in seen:
+                            self.stats.duplicates += 1
+                            continue
+                        seen.add(record.id)
+                        self.stats.records += 1
+                        yield record
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    def _fetch(self, window: Window, offset: int) -> ListResponse[Record]:
+        params = dict(self.filters)
+        params[f"{self.field}_from"] = window[0]
+        params[f"{self.field}_to"] = window[1]
+        return self.client.records.list(limit=self.limit, offset=offset, **params)
+
+
+def _split(start: datetime, end: datetime, parts: int, min_window: timedelta = timedelta(0)) -> List[Window]:
+    """Cut [start, end] into ``parts`` adjacent windows no shorter than ``min_window``."""
+    step = max((end - start) / max(parts, 1), min_window)
+    windows = []
+    lower = start
+    while lower < end:
+        upper = min(lower + step, end)
+        windows.append((lower, upper))
+        lower = upper
+    return windows or [(start, end)]
+
+
+def _now(start: datetime, timezone) -> datetime:
+    """The current time, naive like ``start`` if it is; naive dates are in the client's timezone."""
+    if start.tzinfo is not None:
+        return datetime.now(tz=start.tzinfo)
+    if timezone is not None:
+        return datetime.now(tz=timezone).replace(tzinfo=None)
+    return datetime.now()
+
+
+def _to_datetime(value: Union[date, datetime]) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.combine(value, datetime.min.time())
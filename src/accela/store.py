@@ -0,0 +1,184 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from .resources.documents import Document
+
+# Linux ioctl that makes a file share another's data copy-on-write (Btrfs, XFS, ...)
+_FICLONE = 0x40049409
+
+
+class DocumentStore:
+    """Local content-addressed store for downloaded documents.
+
+    Blobs are named by the SHA-256 of their content and stored once, however many
+    documents share them. A SQLite index maps each document ID to its blob together
+    with the size and modified date it had when it was stored, so a document whose
+    metadata is unchanged can be served locally instead of downloaded again.
+
+    Layout:
+        <directory>/blobs/ab/abcdef...   blob content
+        <directory>/index.sqlite3        document metadata index
+
+    Example:
+        store = DocumentStore("doc-store")
+        downloader = BulkDownloader(client, "archive", store=store)
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        """
+        Open (or create) a store.
+
+        Args:
+            directory: Directory holding the blobs and index
+        """
+        self.directory = Path(directory)
+        self._blobs = self.directory / "blobs"
+        self._tmp = self.directory / "tmp"
+        self._blobs.mkdir(parents=True, exist_ok=True)
+        self._tmp.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.directory / "index.sqlite3", check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                document_id INTEGER PRIMARY KEY,
+                size INTEGER,
+                modified_date TEXT,
+                digest TEXT NOT NULL,
+                file_name TEXT,
+                stored_at TEXT NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS documents_digest ON documents (digest)")
+        self._db.commit()
+
+    def blob_path(self, digest: str) -> Path:
+        """Path of the blob with the given SHA-256 hex digest."""
+        return self._blobs / digest[:2] / digest
+
+    def lookup(self, document: Document) -> Optional[str]:
+        """Find the blob stored for a document if its metadata is unchanged.
+
+        Args:
+            document: Document whose ``id``, ``size`` and ``modified_date`` are matched
+                against the index
+
+        Returns:
+            The blob digest, or None if the document must be downloaded
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest FROM documents WHERE document_id = ? AND size IS ? AND modified_date IS ?",
+                (document.id, document.size, _format_date(document.modified_date)),
+            ).fetchone()
+        if row is None or not self.blob_path(row[0]).exists():
+            return None
+        return row[0]
+
+    def put(self, document: Document, chunks: Iterable[bytes]) -> str:
+        """Store a document's content and index it.
+
+        The content is hashed while it is written, so ``chunks`` can be a download
+        stream. Content that is already present is not stored a second time.
+
+        Args:
+            document: Document the content belongs to
+            chunks: The document's content
+
+        Returns:
+            The blob digest
+        """
+        hasher = hashlib.sha256()
+        fd, tmp_name = tempfile.mkstemp(dir=self._tmp)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    hasher.update(chunk)
+                    f.write(chunk)
+            digest = hasher.hexdigest()
+            blob = self.blob_path(digest)
+            if blob.exists():
+                os.unlink(tmp_name)
+            else:
+                blob.parent.mkdir(exist_ok=True)
+                os.replace(tmp_name, blob)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    document.id,
+                    document.size,
+                    _format_date(document.modified_date),
+                    digest,
+                    document.file_name,
+                    datetime.now(tz=timezone.utc).isoformat(),
+                ),
+            )
+            self._db.commit()
+        return digest
+
+    def materialize(self, digest: str, target: Union[str, Path]) -> Path:
+        """Place a copy of a blob at ``target``.
+
+        The copy is a copy-on-write clone where the filesystem supports it, so it takes
+        no extra space; either way, changing it leaves the blob intact.
+
+        Args:
+            digest: Blob digest
+            target: Destination file path
+
+        Returns:
+            The destination path
+        """
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Copy next to the target and rename, so an interrupted copy never has the real name
+        partial = target.with_name(target.name + ".part")
+        try:
+            _clone_or_copy(self.blob_path(digest), partial)
+            os.replace(partial, target)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        return target
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "DocumentStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _clone_or_copy(source: Path, target: Path) -> None:
+    if sys.platform.startswith("linux"):
+        import fcntl
+
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+                return
+            except OSError:
+                pass
+    shutil.copyfile(source, target)
+
+
+def _format_date(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
@@ -1,6 +1,15 @@
-from .access_token import AccelaAccessToken, get_access_token
+from .access_token import AccelaAccessToken, TokenProvider, get_access_token, refresh_access_token
+from .hedging import HedgingPolicy
+from .page_size import PageSizeTuner
+from .scheduler import PriorityScheduler, traffic_class
 
 __all__ = [
     "AccelaAccessToken",
+    "TokenProvider",
     "get_access_token",
+    "refresh_access_token",
+    "PageSizeTuner",
+    "HedgingPolicy",
+    "PriorityScheduler",
+    "traffic_class",
 ]
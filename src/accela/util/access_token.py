@@ -1,7 +1,13 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Union
 
-import requests
+TOKEN_URL = "https://apis.accela.com/oauth2/token"
 
 
 @dataclass(kw_only=True)
@@ -11,6 +17,44 @@ class AccelaAccessToken:
     expires_at: datetime
     scopes: list[str]
 
+    def expires_within(self, margin: timedelta) -> bool:
+        """Whether the token expires less than ``margin`` from now."""
+        return self.expires_at - margin <= datetime.now(tz=timezone.utc)
+
+    def to_dict(self) -> dict:
+        return {
+            "access_token": self.access_token,
+            "refresh_token": self.refresh_token,
+            "expires_at": self.expires_at.isoformat(),
+            "scopes": self.scopes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AccelaAccessToken":
+        return cls(
+            access_token=data["access_token"],
+            refresh_token=data["refresh_token"],
+            expires_at=datetime.fromisoformat(data["expires_at"]),
+            scopes=data["scopes"],
+        )
+
+
+def _request_token(data: dict) -> AccelaAccessToken:
+    # Imported here so that importing the package does not load requests
+    import requests
+
+    before_req_time = datetime.now(tz=timezone.utc)
+    r = requests.post(TOKEN_URL, data=data)
+    r.raise_for_status()
+
+    data = r.json()
+    return AccelaAccessToken(
+        access_token=data["access_token"],
+        refresh_token=data["refresh_token"],
+        expires_at=before_req_time + timedelta(seconds=int(data["expires_in"])),
+        scopes=data["scope"].split(" "),
+    )
+
 
 def get_access_token(
     *,
@@ -24,7 +68,6 @@ def get_access_token(
     scope: str,
     id_provider: str | None = None,
 ) -> AccelaAccessToken:
-    before_req_time = datetime.now(tz=timezone.utc)
     data = {
         "client_id": client_id,
         "client_secret": client_secret,
@@ -38,16 +81,188 @@ def get_access_token(
     if id_provider:
         data["id_provider"] = id_provider
 
-    r = requests.post(
-        "https://apis.accela.com/oauth2/token",
-        data=data,
-    )
-    r.raise_for_status()
+    return _request_token(data)
 
-    data = r.json()
-    return AccelaAccessToken(
-        access_token=data["access_token"],
-        refresh_token=data["refresh_token"],
-        expires_at=before_req_time + timedelta(seconds=data["expires_in"]),
-        scopes=data["scope"].split(" "),
+
+def refresh_access_token(
+    *,
+    client_id: str,
+    client_secret: str,
+    refresh_token: str,
+) -> AccelaAccessToken:
+    """Exchange a refresh token for a new access token."""
+    return _request_token(
+        {
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token,
+        }
     )
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on ``path`` across processes."""
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class TokenProvider:
+    """Supplies a valid access token, refreshing it before it expires.
+
+    Pass a provider as ``AccelaClient(access_token=provider, ...)``. The token is
+    refreshed with its refresh token once it is within ``refresh_margin`` of expiry;
+    refreshes are serialized so concurrent threads trigger a single refresh.
+
+    With ``cache_path``, the current token is shared through a file guarded by a
+    cross-process lock: a process first adopts a fresher token written by another
+    process and only calls ``/oauth2/token`` when the cached one is also expiring.
+
+    Example:
+        provider = TokenProvider(
+            client_id="...",
+            client_secret="...",
+            login=lambda: get_access_token(...),
+            cache_path="/tmp/accela-token.json",
+        )
+        client = AccelaClient(access_token=provider, agency="AGENCY", environment="PROD")
+    """
+
+    def __init__(
+        self,
+        *,
+        client_id: str,
+        client_secret: str,
+        token: Optional[AccelaAccessToken] = None,
+        login: Optional[Callable[[], AccelaAccessToken]] = None,
+        cache_path: Optional[Union[str, Path]] = None,
+        refresh_margin: timedelta = timedelta(minutes=5),
+    ):
+        """
+        Initialize the provider.
+
+        Args:
+            client_id: Accela app client ID, used for refreshing
+            client_secret: Accela app client secret, used for refreshing
+            token: Initial token, e.g. from get_access_token
+            login: Optional callable returning a brand new token, used when there is no
+                token yet or the refresh token has been rejected
+            cache_path: Optional file for sharing the token between processes
+            refresh_margin: Refresh this long before the token expires
+        """
+        if token is None and login is None and cache_path is None:
+            raise ValueError("TokenProvider needs a token, a login callable or a cache_path")
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.login = login
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.refresh_margin = refresh_margin
+        self._token = token
+        self._lock = threading.Lock()
+
+    @property
+    def token(self) -> Optional[AccelaAccessToken]:
+        """The current token, without refreshing it."""
+        return self._token
+
+    def get(self) -> str:
+        """Return a valid access token string, refreshing it first if needed."""
+        token = self._token
+        if token is not None and not token.expires_within(self.refresh_margin):
+            return token.access_token
+
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            if self._token is None or self._token.expires_within(self.refresh_margin):
+                self._token = self._renew()
+            return self._token.access_token
+
+    async def aget(self) -> str:
+        """Async variant of ``get``; any refresh runs in a worker thread."""
+        import asyncio
+
+        token = self._token
+        if token is not None and not token.expires_within(self.refresh_margin):
+            return token.access_token
+        return await asyncio.to_thread(self.get)
+
+    def invalidate(self, access_token: str) -> None:
+        """Mark ``access_token`` as rejected so the next ``get`` obtains a new one.
+
+        Has no effect if the provider has already moved on to a different token.
+        """
+        with self._lock:
+            if self._token is not None and self._token.access_token == access_token:
+                self._token.expires_at = datetime.now(tz=timezone.utc)
+
+    def _renew(self) -> AccelaAccessToken:
+        if self.cache_path is None:
+            return self._fetch(self._token)
+
+        lock_path = self.cache_path.with_name(self.cache_path.name + ".lock")
+        with _file_lock(lock_path):
+            cached = self._read_cache()
+            # A cached token equal to our own is one we were told is invalid
+            if (
+                cached is not None
+                and not cached.expires_within(self.refresh_margin)
+                and (self._token is None or cached.access_token != self._token.access_token)
+            ):
+                return cached
+            token = self._fetch(self._newest(cached, self._token))
+            self._write_cache(token)
+            return token
+
+    def _fetch(self, current: Optional[AccelaAccessToken]) -> AccelaAccessToken:
+        """Refresh ``current``, falling back to ``login`` if there is nothing to refresh."""
+        import requests
+
+        if current is not None:
+            try:
+                return refresh_access_token(
+                    client_id=self.client_id,
+                    client_secret=self.client_secret,
+                    refresh_token=current.refresh_token,
+                )
+            except requests.HTTPError:
+                if self.login is None:
+                    raise
+        if self.login is None:
+            raise RuntimeError("No token to refresh and no login callable configured")
+        return self.login()
+
+    @staticmethod
+    def _newest(*tokens: Optional[AccelaAccessToken]) -> Optional[AccelaAccessToken]:
+        candidates = [token for token in tokens if token is not None]
+        return max(candidates, key=lambda token: token.expires_at) if candidates else None
+
+    def _read_cache(self) -> Optional[AccelaAccessToken]:
+        try:
+            return AccelaAccessToken.from_dict(json.loads(self.cache_path.read_text()))
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+    def _write_cache(self, token: AccelaAccessToken) -> None:
+        tmp = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(token.to_dict(), f)
+        os.replace(tmp, self.cache_path)
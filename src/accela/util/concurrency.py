@@ -0,0 +1,30 @@
+from collections import deque
+from concurrent.futures import Executor
+from typing import Callable, Deque, Iterable, Iterator, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def bounded_map(
+        pool: Executor, fn: Callable[[T], R], items: Iterable[T], window: int
+) -> Iterator[Tuple[T, R]]:
+    """Like ``pool.map`` but consumes ``items`` lazily, keeping at most ``window`` calls in flight.
+
+    Args:
+        pool: Executor to run ``fn`` in
+        fn: Function applied to each item
+        items: Items, possibly an unbounded iterator
+        window: Maximum number of submitted but unconsumed calls
+
+    Yields:
+        (item, result) pairs in input order
+    """
+    queue: Deque[Tuple[T, object]] = deque()
+    for item in items:
+        queue.append((item, pool.submit(fn, item)))
+        if len(queue) >= window:
+            head, future = queue.popleft()
+            yield head, future.result()
+    for item, future in queue:
+        yield item, future.result()
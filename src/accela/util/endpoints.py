@@ -0,0 +1,43 @@
+from urllib.parse import urlsplit
+
+# Path segment -> placeholder for the segment that follows it
+_ID_SEGMENTS = {
+    "records": "{id}",
+    "documents": "{id}",
+    "agencies": "{name}",
+}
+
+# Segments that follow an ID collection but are fixed names, not IDs
+_FIXED_SEGMENTS = {"mine"}
+
+
+def endpoint_template(url: str) -> str:
+    """Reduce an Accela API URL to its endpoint template.
+
+    IDs are replaced by placeholders so that metrics and circuit breakers can
+    group requests by endpoint, e.g.
+    ``https://apis.accela.com/v4/records/REC-1/documents`` -> ``/records/{id}/documents``.
+
+    Args:
+        url: Full request URL
+
+    Returns:
+        The path with the version prefix removed and IDs replaced
+    """
+    segments = [segment for segment in urlsplit(url).path.split("/") if segment]
+    if segments and segments[0] in ("v4", "v3"):
+        segments = segments[1:]
+    # /settings/... and /search/... reuse collection names as fixed segments
+    if segments and segments[0] in ("settings", "search"):
+        return "/" + "/".join(segments)
+
+    template = []
+    previous = None
+    for segment in segments:
+        if previous in _ID_SEGMENTS and segment not in _FIXED_SEGMENTS:
+            template.append(_ID_SEGMENTS[previous])
+            previous = None
+            continue
+        template.append(segment)
+        previous = segment
+    return "/" + "/".join(template)
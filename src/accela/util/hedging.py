@@ -0,0 +1,133 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Iterable, Optional
+
+from .endpoints import endpoint_template
+
+
+class HedgingPolicy:
+    """Decides when to send a duplicate ("hedge") of a slow idempotent GET.
+
+    The policy tracks recent response times per endpoint template. When a GET has not
+    completed after the ``percentile`` of its endpoint's recent latencies, the client
+    sends the same request again and uses whichever response arrives first. Hedges
+    are limited to ``max_hedge_ratio`` of requests through a budget that every
+    request tops up, and each hedge must also get a token from the client's rate
+    limiter without waiting; otherwise the client just keeps waiting for the original.
+
+    Streamed requests, such as document downloads, are never hedged.
+
+    Example:
+        policy = HedgingPolicy(percentile=0.95, max_hedge_ratio=0.05)
+        client = AccelaClient(access_token=token, agency="AGENCY", environment="PROD", hedging=policy)
+    """
+
+    def __init__(
+            self,
+            percentile: float = 0.95,
+            max_hedge_ratio: float = 0.05,
+            min_delay: float = 0.05,
+            min_samples: int = 20,
+            window: int = 200,
+            endpoints: Optional[Iterable[str]] = None,
+            burst: int = 5,
+            max_workers: int = 32,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            percentile: Latency percentile after which a request is hedged, between 0 and 1
+            max_hedge_ratio: Maximum share of requests that may be hedged
+            min_delay: Never hedge sooner than this many seconds
+            min_samples: Latencies an endpoint needs before its requests are hedged
+            window: Number of recent latencies kept per endpoint
+            endpoints: Optional endpoint templates to hedge, e.g. {"/records"}; default all GETs
+            burst: Maximum number of hedges the budget can accumulate for a latency spike
+            max_workers: Threads used to run requests and their hedges; should exceed the
+                number of threads making requests concurrently
+        """
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.endpoints = set(endpoints) if endpoints is not None else None
+        self.burst = burst
+        self.max_workers = max_workers
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._latencies: Dict[str, Deque[float]] = {}
+        # Starts with room for one hedge; each request adds max_hedge_ratio, capped
+        self._budget = 1.0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def applies_to(self, method: str, url: str, stream: bool = False) -> bool:
+        """Whether requests like this one may be hedged."""
+        if method.upper() != "GET" or stream:
+            return False
+        return self.endpoints is None or endpoint_template(url) in self.endpoints
+
+    def delay(self, url: str) -> Optional[float]:
+        """Seconds to wait for a response before hedging, or None without enough samples."""
+        samples = self._latencies.get(endpoint_template(url))
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return max(ordered[min(int(self.percentile * len(ordered)), len(ordered) - 1)], self.min_delay)
+
+    def observe(self, url: str, elapsed: float) -> None:
+        """Record the latency of a completed request or hedge."""
+        endpoint = endpoint_template(url)
+        with self._lock:
+            samples = self._latencies.get(endpoint)
+            if samples is None:
+                samples = self._latencies[endpoint] = deque(maxlen=self.window)
+            samples.append(elapsed)
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self._budget = min(self._budget + self.max_hedge_ratio, float(self.burst))
+
+    def try_hedge(self, acquire: Optional[Callable[[], bool]] = None) -> bool:
+        """Take one hedge from the budget, if there is one left.
+
+        Args:
+            acquire: Optional non-blocking check that must also pass, e.g. taking a
+                rate-limiter token; only called when the budget allows a hedge
+        """
+        with self._lock:
+            if self._budget < 1.0 or (acquire is not None and not acquire()):
+                return False
+            self._budget -= 1.0
+            self.hedges += 1
+            return True
+
+    def record_win(self) -> None:
+        with self._lock:
+            self.hedge_wins += 1
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="accela-hedge")
+            return self._executor
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of hedgeable requests, hedges sent and hedges that answered first."""
+        with self._lock:
+            return {"requests": self.requests, "hedges": self.hedges, "hedge_wins": self.hedge_wins}
+
+    def shutdown(self) -> None:
+        """Stop the request threads."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
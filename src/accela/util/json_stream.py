@@ -0,0 +1,149 @@
+import codecs
+import json
+import time
+from typing import Any, Dict, Iterable, Iterator
+
+_WHITESPACE = " \t\n\r"
+_DECODER = json.JSONDecoder()
+
+
+class StreamingPage:
+    """Incrementally parses a list page body such as ``{"result": [...], "page": {...}}``.
+
+    ``items()`` yields the elements of the ``result_key`` array one at a time while the
+    body is still being read, so only the current element and one chunk of the body
+    are held at once. The other top-level members (``page``, ``total``, ``status``, ...)
+    are collected into ``metadata``; members after the array are only available once
+    ``items()`` is exhausted.
+
+    Example:
+        response = session.get(url, stream=True)
+        page = StreamingPage(response.iter_content(64 * 1024))
+        for item in page.items():
+            ...
+        total = page.metadata["page"]["total"]
+    """
+
+    def __init__(self, chunks: Iterable[bytes], result_key: str = "result", compact_at: int = 1024 * 1024):
+        """
+        Initialize the parser.
+
+        Args:
+            chunks: Body chunks, e.g. ``response.iter_content(chunk_size)``
+            result_key: Top-level member holding the array to stream
+            compact_at: Drop consumed text from the buffer once this many characters are consumed
+        """
+        self.result_key = result_key
+        self.metadata: Dict[str, Any] = {}
+        self.bytes_read = 0
+        self.elapsed = 0.0  # seconds spent reading and decoding, excluding time spent by the consumer
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._exhausted = False
+        self._compact_at = compact_at
+
+    def items(self) -> Iterator[Any]:
+        """Yield the elements of the result array as they are parsed.
+
+        Raises:
+            ValueError: If the body is not a JSON object or is truncated
+        """
+        start = time.perf_counter()
+        try:
+            self._expect("{")
+            if self._peek() == "}":
+                self._pos += 1
+                return
+            while True:
+                key = self._value()
+                if not isinstance(key, str):
+                    raise ValueError("Expected an object member name")
+                self._expect(":")
+                if key == self.result_key and self._peek() == "[":
+                    self._pos += 1
+                    if self._peek() == "]":
+                        self._pos += 1
+                    else:
+                        while True:
+                            item = self._value()
+                            self.elapsed += time.perf_counter() - start
+                            yield item
+                            start = time.perf_counter()
+                            if self._separator("]"):
+                                break
+                else:
+                    self.metadata[key] = self._value()
+                if self._separator("}"):
+                    return
+        finally:
+            self.elapsed += time.perf_counter() - start
+
+    def _read(self) -> bool:
+        """Append the next chunk to the buffer; False once the body is exhausted."""
+        if self._exhausted:
+            return False
+        if self._pos >= self._compact_at:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        for chunk in self._chunks:
+            if chunk:
+                self.bytes_read += len(chunk)
+                self._buffer += self._decoder.decode(chunk)
+                return True
+        self._exhausted = True
+        self._buffer += self._decoder.decode(b"", final=True)
+        return False
+
+    def _read_more(self) -> bool:
+        """Read until the unconsumed text has doubled, so large values are re-scanned O(log n) times."""
+        pending = len(self._buffer) - self._pos
+        if not self._read():
+            return False
+        while len(self._buffer) - self._pos < 2 * pending and self._read():
+            pass
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read():
+                raise ValueError("Unexpected end of JSON body")
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self._pos}, found {self._buffer[self._pos]!r}")
+        self._pos += 1
+
+    def _separator(self, closing: str) -> bool:
+        """Consume ',' (returns False) or ``closing`` (returns True)."""
+        char = self._peek()
+        self._pos += 1
+        if char == closing:
+            return True
+        if char != ",":
+            raise ValueError(f"Expected ',' or {closing!r} at offset {self._pos - 1}, found {char!r}")
+        return False
+
+    def _value(self) -> Any:
+        """Decode the next complete JSON value, reading more of the body as needed."""
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._read_more():
+                    continue
+                raise ValueError(f"Truncated or invalid JSON at offset {self._pos}") from None
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and not self._exhausted:
+                self._read()
+                continue
+            self._pos = end
+            return value
+
@@ -0,0 +1,95 @@
+import threading
+from typing import Dict, Optional
+
+from .endpoints import endpoint_template
+
+
+class PageSizeTuner:
+    """Adjusts list page sizes per endpoint toward a target response time.
+
+    After every page the tuner scales that endpoint's page size by
+    ``target_latency / elapsed``, so it converges on the size whose pages take about
+    ``target_latency`` seconds: large pages for small models such as parcels, smaller
+    ones for records with custom forms. A step changes the size by at most a factor
+    of two, and the result stays within ``min_limit`` and ``max_limit``. With
+    ``max_page_bytes`` the size is also capped by the observed bytes per item.
+
+    Pass ``adaptive_page_size=True`` (or a tuner) to AccelaClient to enable it;
+    ``auto_paging_iter`` then requests tuned page sizes after the first page.
+    """
+
+    def __init__(
+            self,
+            target_latency: float = 1.0,
+            min_limit: int = 10,
+            max_limit: int = 1000,
+            max_page_bytes: Optional[int] = None,
+            smoothing: float = 0.5,
+    ):
+        """
+        Initialize the tuner.
+
+        Args:
+            target_latency: Desired seconds per page, including reading the body
+            min_limit: Smallest page size to request
+            max_limit: Largest page size to request; Accela accepts up to 1000
+            max_page_bytes: Optional cap on the expected size of a page body in bytes
+            smoothing: Weight of each new measurement, between 0 (ignore) and 1 (only the latest)
+        """
+        if target_latency <= 0:
+            raise ValueError("target_latency must be positive")
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("expected 1 <= min_limit <= max_limit")
+        self.target_latency = target_latency
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_page_bytes = max_page_bytes
+        self.smoothing = smoothing
+        self._limits: Dict[str, float] = {}
+        self._bytes_per_item: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def suggest(self, url: str, default: int) -> int:
+        """Page size to request next from ``url``'s endpoint.
+
+        Args:
+            url: Request URL
+            default: Page size to use for an endpoint without measurements
+
+        Returns:
+            The tuned page size, or ``default``
+        """
+        limit = self._limits.get(endpoint_template(url))
+        return default if limit is None else int(limit)
+
+    def observe(self, url: str, limit: int, count: int, elapsed: float, size: Optional[int] = None) -> None:
+        """Record a fetched page.
+
+        Args:
+            url: Request URL
+            limit: Page size that was requested
+            count: Number of items received
+            elapsed: Seconds taken to fetch the page
+            size: Body size in bytes, if known
+        """
+        # A short page (the last one) says nothing about how a full page would perform
+        if count < limit or elapsed <= 0:
+            return
+
+        endpoint = endpoint_template(url)
+        with self._lock:
+            proposed = limit * min(max(self.target_latency / elapsed, 0.5), 2.0)
+            if size and self.max_page_bytes:
+                per_item = size / count
+                previous = self._bytes_per_item.get(endpoint, per_item)
+                per_item = self._bytes_per_item[endpoint] = previous + self.smoothing * (per_item - previous)
+                proposed = min(proposed, self.max_page_bytes / per_item)
+
+            current = self._limits.get(endpoint, limit)
+            tuned = current + self.smoothing * (proposed - current)
+            self._limits[endpoint] = min(max(tuned, self.min_limit), self.max_limit)
+
+    def limits(self) -> Dict[str, int]:
+        """Current page size per endpoint template."""
+        with self._lock:
+            return {endpoint: int(limit) for endpoint, limit in self._limits.items()}
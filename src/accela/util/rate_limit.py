@@ -0,0 +1,69 @@
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket for capping a rate shared between workers.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``. A caller
+    may acquire more than is currently available; the bucket goes into debt and the
+    caller sleeps until the debt is repaid, so callers are served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second, e.g. bytes/second or requests/second
+            capacity: Maximum burst size, defaults to one second's worth of tokens
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Take ``amount`` tokens, blocking until they are available.
+
+        Args:
+            amount: Number of tokens to take
+
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            deficit = -self._tokens
+
+        if deficit <= 0:
+            return 0.0
+        delay = deficit / self.rate
+        time.sleep(delay)
+        return delay
+
+    def try_acquire(self, amount: float = 1.0) -> bool:
+        """Take ``amount`` tokens only if they are available right now.
+
+        Args:
+            amount: Number of tokens to take
+
+        Returns:
+            True if the tokens were taken, False otherwise
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens < amount:
+                return False
+            self._tokens -= amount
+            return True
@@ -0,0 +1,162 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Iterator, Optional
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+TRAFFIC_CLASSES = (INTERACTIVE, BATCH)
+
+_current_traffic_class: ContextVar[Optional[str]] = ContextVar("accela_traffic_class", default=None)
+
+
+def _check_traffic_class(name: str) -> str:
+    if name not in TRAFFIC_CLASSES:
+        raise ValueError(f"Unknown traffic class {name!r}, expected one of {', '.join(TRAFFIC_CLASSES)}")
+    return name
+
+
+@contextmanager
+def traffic_class(name: str) -> Iterator[None]:
+    """Send the requests made inside the block with the given traffic class.
+
+    The class applies to the current thread (and asyncio task) only; requests made by
+    worker threads, e.g. of ShardedScan or BulkDownloader, use their client's default.
+
+    Example:
+        with traffic_class("batch"):
+            for record in client.records.list(module="Building").auto_paging_iter():
+                ...
+    """
+    token = _current_traffic_class.set(_check_traffic_class(name))
+    try:
+        yield
+    finally:
+        _current_traffic_class.reset(token)
+
+
+def current_traffic_class() -> Optional[str]:
+    """The traffic class set by the innermost ``traffic_class`` block, if any."""
+    return _current_traffic_class.get()
+
+
+class PriorityScheduler:
+    """Rate limiter that serves interactive requests before batch requests.
+
+    Requests wait in one queue per traffic class and are released at ``rate`` per
+    second. Whenever both classes are waiting, the next request is interactive, except
+    that every ``1 / batch_share``-th release goes to batch work, so crawls keep at
+    least ``batch_share`` of the rate however busy the interactive side is. With only
+    one class waiting, it gets the whole rate. Requests within a class are served in
+    arrival order. Requests already sent are never interrupted.
+
+    Pass one scheduler to every client that shares the quota, instead of ``rate_limit``.
+
+    Example:
+        scheduler = PriorityScheduler(rate=20, batch_share=0.2)
+        web = AccelaClient(access_token=token, agency="AGENCY", environment="PROD", scheduler=scheduler)
+        crawler = AccelaClient(access_token=token, agency="AGENCY", environment="PROD",
+                               scheduler=scheduler, traffic_class="batch")
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, batch_share: float = 0.2):
+        """
+        Initialize the scheduler.
+
+        Args:
+            rate: Requests released per second
+            capacity: Maximum burst size, defaults to one second's worth of requests
+            batch_share: Minimum share of releases given to batch requests while both
+                classes are waiting, between 0 and 1
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if not 0 <= batch_share <= 1:
+            raise ValueError("batch_share must be between 0 and 1")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.batch_share = batch_share
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        # Accumulates batch_share per contended release; batch is due once it reaches 1
+        self._batch_credit = 0.0
+        self._queues: Dict[str, Deque[object]] = {name: deque() for name in TRAFFIC_CLASSES}
+        self._released = {name: 0 for name in TRAFFIC_CLASSES}
+        self._condition = threading.Condition()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _batch_due(self) -> bool:
+        return self._batch_credit + self.batch_share >= 1 - 1e-9
+
+    def _next(self) -> Optional[object]:
+        """The waiting request to release next."""
+        interactive, batch = self._queues[INTERACTIVE], self._queues[BATCH]
+        if not batch:
+            return interactive[0] if interactive else None
+        if not interactive or self._batch_due():
+            return batch[0]
+        return interactive[0]
+
+    def _release(self, name: str) -> None:
+        if self._queues[INTERACTIVE] and self._queues[BATCH]:
+            self._batch_credit = min(self._batch_credit + self.batch_share, 1.0)
+            if name == BATCH:
+                self._batch_credit = max(self._batch_credit - 1.0, 0.0)
+        self._tokens -= 1
+        self._released[name] += 1
+
+    def acquire(self, traffic_class: str = INTERACTIVE) -> float:
+        """Wait for this request's turn and take one request from the rate.
+
+        Args:
+            traffic_class: 'interactive' or 'batch'
+
+        Returns:
+            Seconds spent waiting
+        """
+        queue = self._queues[_check_traffic_class(traffic_class)]
+        ticket = object()
+        start = time.monotonic()
+        with self._condition:
+            queue.append(ticket)
+            try:
+                while True:
+                    self._refill()
+                    if self._next() is ticket:
+                        if self._tokens >= 1:
+                            self._release(traffic_class)
+                            queue.popleft()
+                            self._condition.notify_all()
+                            return time.monotonic() - start
+                        self._condition.wait((1 - self._tokens) / self.rate)
+                    else:
+                        # Woken when the request ahead is released
+                        self._condition.wait()
+            except BaseException:
+                queue.remove(ticket)
+                self._condition.notify_all()
+                raise
+
+    def try_acquire(self, traffic_class: str = INTERACTIVE) -> bool:
+        """Take one request from the rate only if nothing is waiting and it is available now."""
+        _check_traffic_class(traffic_class)
+        with self._condition:
+            self._refill()
+            if self._tokens < 1 or any(self._queues.values()):
+                return False
+            self._release(traffic_class)
+            return True
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Requests released so far and currently waiting, per traffic class."""
+        with self._condition:
+            return {
+                "released": dict(self._released),
+                "waiting": {name: len(queue) for name, queue in self._queues.items()},
+            }
@@ -0,0 +1,32 @@
+import hashlib
+from typing import Hashable, Set
+
+
+class SeenIds:
+    """Compact set of the IDs already returned by a scan.
+
+    IDs are stored as 64-bit hashes rather than as strings, which keeps a scan of a
+    few million records to tens of megabytes. Two different IDs are only confused
+    if their hashes collide, with a probability of about n² / 2⁶⁵ for n IDs.
+    """
+
+    def __init__(self):
+        self._hashes: Set[int] = set()
+
+    @staticmethod
+    def _hash(item_id: Hashable) -> int:
+        return int.from_bytes(hashlib.blake2b(str(item_id).encode(), digest_size=8).digest(), "little")
+
+    def add(self, item_id: Hashable) -> bool:
+        """Add an ID; returns True if it had not been seen before."""
+        digest = self._hash(item_id)
+        if digest in self._hashes:
+            return False
+        self._hashes.add(digest)
+        return True
+
+    def __contains__(self, item_id: Hashable) -> bool:
+        return self._hash(item_id) in self._hashes
+
+    def __len__(self) -> int:
+        return len(self._hashes)